@@ -1,10 +1,9 @@
-from typing import Any, Dict, Optional, Self
+from typing import Optional, Self
 from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.paginator import Page, Paginator
 from django.contrib.auth import logout
 from django.contrib.auth.models import Permission
-from django.db.models import Q
 from django.db.models.query import QuerySet, RawQuerySet
 from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import render
@@ -17,15 +16,17 @@ from datetime import datetime, timedelta, timezone
 
 from .models import Django, Cuentas, Solicitudes
 
-from cuentas.models import Comitente, ResponsableTecnico, Secretario
-
-from gesservorconv.mixins import MixinAccesoRequerido
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinContextoRoles
+)
 from gesservorconv.views import HtmxHttpRequest
 
 
 class VistaAuditoria(
     MixinAccesoRequerido,
     UserPassesTestMixin,
+    MixinContextoRoles,
     ListView
 ):
     model: type[Django] = Django
@@ -226,47 +227,6 @@ class VistaAuditoria(
             Django.objects.raw(consulta)
         return auditoria
 
-    def get_context_data(
-        self: Self,
-        **kwargs: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
-        return contexto
-
     def get(self: Self, request: HtmxHttpRequest) -> HttpResponse:
         if request.htmx:
             busqueda_tabla: Optional[str] = request.GET.get(
@@ -90,3 +90,31 @@ class ConsumidorNotificaciones(WebsocketConsumer):
             }
         )
         self.send(text_data=html)
+
+    def verificacion_orden(self, evento: dict[str, Any]) -> None:
+        html: str = get_template(
+            'parciales/_progreso_verificacion.html'
+        ).render(evento['verificacion'])
+        self.send(text_data=html)
+
+    def verificacion_orden_finalizada(self, evento: dict[str, Any]) -> None:
+        html: str = get_template('parciales/_mensaje.html').render(
+            {
+                'id': evento['id'],
+                'titulo': 'Verificación de orden',
+                'mensaje': evento['mensaje'],
+                'enlace': evento['text']
+            }
+        )
+        self.send(text_data=html)
+
+    def reporte_generado(self, evento: dict[str, Any]) -> None:
+        html: str = get_template('parciales/_mensaje.html').render(
+            {
+                'id': evento['id'],
+                'titulo': 'Reporte generado',
+                'mensaje': evento['mensaje'],
+                'enlace': evento['text']
+            }
+        )
+        self.send(text_data=html)
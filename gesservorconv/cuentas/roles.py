@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+from django.http import HttpRequest
+
+from typing import Any, Optional
+
+from .models import Comitente, ResponsableTecnico, Secretario
+
+
+def clave_roles(id_usuario: int) -> str:
+    return f'roles_usuario_{id_usuario}'
+
+
+def consultar_roles(usuario: User) -> dict[str, Optional[bool]]:
+    fila: Optional[dict[str, Any]] = User.objects.filter(
+        pk=usuario.pk
+    ).annotate(
+        es_comitente=Exists(
+            Comitente.objects.filter(
+                usuario_comitente=OuterRef("pk")
+            )
+        ),
+        comitente_habilitado=Exists(
+            Comitente.objects.filter(
+                Q(usuario_comitente=OuterRef("pk")) &
+                (
+                    Q(habilitado_comitente=True) |
+                    Q(habilitado_organizaciones_comitente__contains=[
+                        True
+                    ])
+                )
+            )
+        ),
+        es_responsable=Exists(
+            ResponsableTecnico.objects.filter(
+                usuario_responsable=OuterRef("pk")
+            )
+        ),
+        responsable_habilitado=Exists(
+            ResponsableTecnico.objects.filter(
+                Q(usuario_responsable=OuterRef("pk")) &
+                (
+                    Q(habilitado_responsable=True) |
+                    Q(habilitado_organizaciones_responsable__contains=[
+                        True
+                    ])
+                )
+            )
+        ),
+        es_secretario=Exists(
+            Secretario.objects.filter(
+                usuario_secretario=OuterRef("pk")
+            )
+        ),
+        secretario_habilitado=Exists(
+            Secretario.objects.filter(
+                Q(usuario_secretario=OuterRef("pk")) &
+                Q(habilitado_secretario=True)
+            )
+        )
+    ).values(
+        "is_active",
+        "es_comitente",
+        "comitente_habilitado",
+        "es_responsable",
+        "responsable_habilitado",
+        "es_secretario",
+        "secretario_habilitado"
+    ).first()
+    if fila is None:
+        return roles_anonimos()
+    return {
+        "es_comitente": fila["es_comitente"],
+        "es_responsable": fila["es_responsable"],
+        "es_secretario": fila["es_secretario"],
+        "comitente": fila["comitente_habilitado"] if (
+            fila["es_comitente"] and fila["is_active"]
+        ) else None,
+        "responsable": fila["responsable_habilitado"] if (
+            fila["es_responsable"] and fila["is_active"]
+        ) else None,
+        "secretario": fila["secretario_habilitado"] if (
+            fila["es_secretario"] and fila["is_active"]
+        ) else None
+    }
+
+
+def roles_anonimos() -> dict[str, Optional[bool]]:
+    return {
+        "es_comitente": False,
+        "es_responsable": False,
+        "es_secretario": False,
+        "comitente": None,
+        "responsable": None,
+        "secretario": None
+    }
+
+
+def obtener_roles(request: HttpRequest) -> dict[str, Optional[bool]]:
+    '''
+    Se memoriza en la petición y en caché hasta que se modifique
+    el usuario o alguno de sus roles (ver cuentas.signals)
+    '''
+    roles: Optional[dict[str, Optional[bool]]] = getattr(
+        request, "_roles_usuario", None
+    )
+    if roles is not None:
+        return roles
+    if not request.user.is_authenticated:
+        roles = roles_anonimos()
+    else:
+        clave: str = clave_roles(request.user.pk)
+        roles = cache.get(clave)
+        if roles is None:
+            roles = consultar_roles(request.user)
+            cache.set(clave, roles, settings.SESSION_COOKIE_AGE)
+    request._roles_usuario = roles
+    return roles
+
+
+def invalidar_roles(id_usuario: int) -> None:
+    cache.delete(clave_roles(id_usuario))
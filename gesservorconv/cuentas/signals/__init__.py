@@ -3,11 +3,17 @@ from .correo_comitente_a_admin import correo_comitente_a_admin
 from .correo_responsable_a_admin import correo_responsable_a_admin
 from .correo_notificacion import correo_notificacion
 from .habilitacion_a_comitente import habilitacion_a_comitente
+from .invalidacion_roles import invalidacion_roles
 
 from django.contrib.auth.models import User
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 
-from ..models import Notificacion, Comitente, ResponsableTecnico
+from ..models import (
+    Notificacion,
+    Comitente,
+    ResponsableTecnico,
+    Secretario
+)
 
 
 post_save.connect(correo_activacion_a_usuario, User)
@@ -15,3 +21,11 @@ post_save.connect(correo_comitente_a_admin, Comitente)
 post_save.connect(correo_responsable_a_admin, ResponsableTecnico)
 post_save.connect(correo_notificacion, Notificacion)
 pre_save.connect(habilitacion_a_comitente, Comitente)
+post_save.connect(invalidacion_roles, User)
+post_save.connect(invalidacion_roles, Comitente)
+post_save.connect(invalidacion_roles, ResponsableTecnico)
+post_save.connect(invalidacion_roles, Secretario)
+post_delete.connect(invalidacion_roles, User)
+post_delete.connect(invalidacion_roles, Comitente)
+post_delete.connect(invalidacion_roles, ResponsableTecnico)
+post_delete.connect(invalidacion_roles, Secretario)
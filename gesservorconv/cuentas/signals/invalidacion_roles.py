@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Model
+
+from ..models import Comitente, ResponsableTecnico, Secretario
+from ..roles import invalidar_roles
+
+
+def invalidacion_roles(
+    sender: type[Model],
+    instance: Model,
+    **kwargs
+) -> None:
+    id_usuario: int
+    if sender is User:
+        id_usuario = instance.pk
+    elif sender is Comitente:
+        id_usuario = instance.usuario_comitente_id
+    elif sender is ResponsableTecnico:
+        id_usuario = instance.usuario_responsable_id
+    elif sender is Secretario:
+        id_usuario = instance.usuario_secretario_id
+    else:
+        return
+    invalidar_roles(id_usuario)
+    transaction.on_commit(lambda: invalidar_roles(id_usuario))
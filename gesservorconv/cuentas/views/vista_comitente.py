@@ -1,8 +1,6 @@
-
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Q
 from django.http import (
     HttpResponse,
     HttpResponseRedirect
@@ -10,24 +8,26 @@ from django.http import (
 from django.urls import reverse_lazy
 from django.views.generic import TemplateView
 
-from typing import Any, Dict, Self
+from typing import Self
 
-from ..models import Comitente, ResponsableTecnico, Secretario
-from gesservorconv.mixins import MixinAccesoRequerido
+from ..roles import obtener_roles
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinContextoRoles
+)
 
 
 class VistaComitente(
     MixinAccesoRequerido,
     UserPassesTestMixin,
+    MixinContextoRoles,
     TemplateView
 ):
     template_name: str = 'cuentas/comitente.html'
     login_url: str = reverse_lazy('cuentas:iniciar_sesion')
 
     def test_func(self: Self) -> bool:
-        return Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user)
-        ).exists()
+        return obtener_roles(self.request)["es_comitente"]
 
     def handle_no_permission(self: Self) -> HttpResponse:
         if self.request.user.is_anonymous:
@@ -62,44 +62,3 @@ class VistaComitente(
         return HttpResponseRedirect(
             reverse_lazy('cuentas:perfil')
         )
-
-    def get_context_data(
-        self: Self,
-        **kwargs: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
-        return contexto
@@ -1,12 +1,217 @@
+from django.db import close_old_connections, connection
+
 from datetime import datetime
-from logging import Logger
-from typing import Any, Dict, Optional, Self
+from logging import getLogger, Handler, INFO, Logger, LogRecord
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+import time
+from typing import Any, Dict, Iterator, List, Optional, Self, Tuple
+from uuid import uuid4
+
+
+logger: Logger = getLogger("daphne.access")
+
+Entrada = Tuple[
+    str, datetime, str, Optional[str], Optional[str],
+    Optional[str], Optional[str]
+]
+
+
+class EscritorLogAcceso:
+    politicas: Tuple[str, ...] = ("descartar", "antiguo", "bloquear")
+    formato: str = '%s { %s } (%s) [%s] "%s" %s %s'
+
+    def __init__(
+        self: Self,
+        logger: Logger,
+        tamanio_lote: int = 256,
+        intervalo: float = 1.0,
+        capacidad: int = 10000,
+        politica: str = "descartar",
+        base_datos: bool = False
+    ) -> None:
+        if politica not in self.politicas:
+            raise ValueError(
+                "Política de desborde desconocida: %s" % politica
+            )
+        self.logger: Logger = logger
+        self.tamanio_lote: int = tamanio_lote
+        self.intervalo: float = intervalo
+        self.politica: str = politica
+        self.base_datos: bool = base_datos
+        self.cola: Queue[Optional[Entrada]] = Queue(maxsize=capacidad)
+        self.descartadas: int = 0
+        self.cerrojo: Lock = Lock()
+        self.hilo: Optional[Thread] = None
+
+    def iniciar(self: Self) -> None:
+        if self.hilo is not None:
+            return
+        self.hilo = Thread(
+            target=self._ejecutar,
+            name="dafne-log-acceso",
+            daemon=True
+        )
+        self.hilo.start()
+
+    def detener(self: Self, espera: float = 5.0) -> None:
+        if self.hilo is None:
+            return
+        self.cola.put(None)
+        self.hilo.join(espera)
+        self.hilo = None
+
+    def encolar(self: Self, entrada: Entrada) -> bool:
+        if self.politica == "bloquear":
+            self.cola.put(entrada)
+            return True
+        try:
+            self.cola.put_nowait(entrada)
+            return True
+        except Full:
+            pass
+        if self.politica == "antiguo":
+            try:
+                self.cola.get_nowait()
+            except Empty:
+                pass
+            try:
+                self.cola.put_nowait(entrada)
+                self._descartar()
+                return True
+            except Full:
+                pass
+        self._descartar()
+        return False
+
+    def _descartar(self: Self) -> None:
+        with self.cerrojo:
+            self.descartadas += 1
+
+    def _ejecutar(self: Self) -> None:
+        activo: bool = True
+        while activo:
+            lote: List[Entrada] = []
+            limite: float = time.monotonic() + self.intervalo
+            while len(lote) < self.tamanio_lote:
+                restante: float = limite - time.monotonic()
+                try:
+                    entrada: Optional[Entrada] = (
+                        self.cola.get(timeout=restante)
+                        if restante > 0
+                        else self.cola.get_nowait()
+                    )
+                except Empty:
+                    break
+                if entrada is None:
+                    activo = False
+                    break
+                lote.append(entrada)
+            if lote:
+                self._volcar(lote)
+
+    def _volcar(self: Self, lote: List[Entrada]) -> None:
+        with self.cerrojo:
+            descartadas: int = self.descartadas
+            self.descartadas = 0
+        if descartadas:
+            logger.warning(
+                "Se descartaron %d entradas del log de acceso", descartadas
+            )
+        try:
+            self._escribir_archivo(lote)
+        except Exception:
+            logger.exception("No se pudo escribir el log de acceso")
+        if self.base_datos:
+            self._copiar(lote)
+
+    def _manejadores(self: Self) -> Iterator[Handler]:
+        actual: Optional[Logger] = self.logger
+        while actual is not None:
+            yield from actual.handlers
+            if not actual.propagate:
+                break
+            actual = actual.parent
+
+    def _escribir_archivo(self: Self, lote: List[Entrada]) -> None:
+        if not self.logger.isEnabledFor(INFO):
+            return
+        registros: List[LogRecord] = [
+            self.logger.makeRecord(
+                self.logger.name,
+                INFO,
+                __file__,
+                0,
+                self.formato,
+                (
+                    host,
+                    ident or "-",
+                    user or "-",
+                    date.strftime("%d/%m/%Y %H:%M:%S"),
+                    request,
+                    status or "-",
+                    length or "-"
+                ),
+                None
+            )
+            for host, date, request, status, length, ident, user in lote
+        ]
+        registros = [
+            registro for registro in registros
+            if self.logger.filter(registro)
+        ]
+        for manejador in self._manejadores():
+            if hasattr(manejador, "emitir_lote"):
+                manejador.emitir_lote(registros)
+                continue
+            for registro in registros:
+                if registro.levelno >= manejador.level:
+                    manejador.handle(registro)
+
+    def _copiar(self: Self, lote: List[Entrada]) -> None:
+        try:
+            with connection.cursor() as cursor:
+                with cursor.cursor.copy(
+                    "COPY logs (uuid_log, cliente_log, tiempo_log,"
+                    " navegador_log, usuario_log, mensaje_log)"
+                    " FROM STDIN"
+                ) as copia:
+                    for (
+                        host, date, request, status, length, ident, user
+                    ) in lote:
+                        copia.write_row(
+                            (
+                                uuid4(),
+                                host or "-",
+                                date,
+                                ident or "-",
+                                (
+                                    int(user.removeprefix("user "))
+                                    if user and user.startswith("user ")
+                                    else None
+                                ),
+                                '"%s" %s %s' % (
+                                    request,
+                                    status or "-",
+                                    length or "-"
+                                )
+                            )
+                        )
+        except Exception:
+            logger.exception("No se pudo copiar el log de acceso a la base")
+        finally:
+            close_old_connections()
 
 
 # daphne.access.AccessLogGenerator
 class GeneradorLogAcceso:
-    def __init__(self: Self, logger: Logger) -> None:
+    def __init__(
+        self: Self,
+        logger: Logger,
+        escritor: Optional[EscritorLogAcceso] = None
+    ) -> None:
         self.logger: Logger = logger
+        self.escritor: Optional[EscritorLogAcceso] = escritor
 
     def __call__(
         self: Self,
@@ -17,7 +222,7 @@ class GeneradorLogAcceso:
         if protocol == "http" and action == "complete":
             self.write_entry(
                 host=details["client"],
-                date=datetime.now(),
+                date=datetime.now().astimezone(),
                 request="%(method)s %(path)s" % details,
                 status=details["status"],
                 length=details["size"],
@@ -27,7 +232,7 @@ class GeneradorLogAcceso:
         elif protocol == "websocket" and action == "connecting":
             self.write_entry(
                 host=details["client"],
-                date=datetime.now(),
+                date=datetime.now().astimezone(),
                 request="WSCONNECTING %(path)s" % details,
                 status=details["status"],
                 ident=details["browser"],
@@ -36,7 +241,7 @@ class GeneradorLogAcceso:
         elif protocol == "websocket" and action == "rejected":
             self.write_entry(
                 host=details["client"],
-                date=datetime.now(),
+                date=datetime.now().astimezone(),
                 request="WSREJECT %(path)s" % details,
                 status="3003",
                 ident=details["browser"],
@@ -45,7 +250,7 @@ class GeneradorLogAcceso:
         elif protocol == "websocket" and action == "connected":
             self.write_entry(
                 host=details["client"],
-                date=datetime.now(),
+                date=datetime.now().astimezone(),
                 request="WSCONNECT %(path)s" % details,
                 status=details["status"],
                 ident=details["browser"],
@@ -54,7 +259,7 @@ class GeneradorLogAcceso:
         elif protocol == "websocket" and action == "disconnected":
             self.write_entry(
                 host=details["client"],
-                date=datetime.now(),
+                date=datetime.now().astimezone(),
                 request="WSDISCONNECT %(path)s" % details,
                 status=details["status"],
                 ident=details["browser"],
@@ -64,15 +269,20 @@ class GeneradorLogAcceso:
     def write_entry(
         self: Self,
         host: str,
-        date: str,
+        date: datetime,
         request: str,
         status: Optional[str] = None,
         length: Optional[str] = None,
         ident: Optional[str] = None,
         user: Optional[str] = None
     ):
+        if self.escritor is not None:
+            self.escritor.encolar(
+                (host, date, request, status, length, ident, user)
+            )
+            return
         self.logger.info(
-            '%s { %s } (%s) [%s] "%s" %s %s',
+            EscritorLogAcceso.formato,
             host,
             ident or "-",
             user or "-",
@@ -0,0 +1,115 @@
+from io import BufferedReader
+import logging
+import os
+from typing import Optional, Self
+
+from twisted.internet import defer, tcp
+from twisted.internet.interfaces import IPullProducer
+from twisted.web import http
+from zope.interface import implementer
+
+
+logger: logging.Logger = logging.getLogger("daphne.archivos")
+
+
+@implementer(IPullProducer)
+class ProductorArchivo:
+    # Mayor que FileDescriptor.bufferSize: si un bloque pasa por el búfer
+    # de Twisted, el transporte pausa al productor hasta vaciarlo.
+    tamanio_bloque: int = 2**17
+
+    def __init__(
+        self: Self,
+        peticion: http.Request,
+        archivo: BufferedReader,
+        posicion: int,
+        restante: int
+    ) -> None:
+        self.peticion: Optional[http.Request] = peticion
+        self.archivo: BufferedReader = archivo
+        self.posicion: int = posicion
+        self.restante: int = restante
+        self.transporte: Optional[tcp.Connection] = None
+        self.destino: Optional[int] = None
+        self.completado: defer.Deferred = defer.Deferred()
+
+    def iniciar(self: Self) -> defer.Deferred:
+        http.Request.write(self.peticion, b"")
+        transporte = self.peticion.channel.transport
+        if (
+            isinstance(self.peticion.channel, http.HTTPChannel) and
+            isinstance(transporte, tcp.Connection) and
+            not self.peticion.chunked
+        ):
+            try:
+                self.destino = transporte.getHandle().fileno()
+                self.transporte = transporte
+            except (AttributeError, OSError):
+                self.destino = None
+        self.peticion.registerProducer(self, False)
+        return self.completado
+
+    def pendiente(self: Self) -> bool:
+        return (
+            len(self.transporte.dataBuffer) > self.transporte.offset or
+            self.transporte._tempDataLen > 0
+        )
+
+    def enviar_directo(self: Self, cantidad: int) -> int:
+        if self.destino is None or self.pendiente():
+            return 0
+        try:
+            enviados: int = os.sendfile(
+                self.destino,
+                self.archivo.fileno(),
+                self.posicion,
+                cantidad
+            )
+        except BlockingIOError:
+            return 0
+        except OSError as error:
+            logger.debug("sendfile no disponible: %s", error)
+            self.destino = None
+            return 0
+        self.peticion.sentLength += enviados
+        return enviados
+
+    def resumeProducing(self: Self) -> None:
+        if self.peticion is None:
+            return
+        if self.restante <= 0:
+            self.terminar()
+            return
+        cantidad: int = min(self.tamanio_bloque, self.restante)
+        enviados: int = self.enviar_directo(cantidad)
+        if not enviados:
+            datos: bytes = os.pread(
+                self.archivo.fileno(),
+                cantidad,
+                self.posicion
+            )
+            if not datos:
+                logger.warning(
+                    "File %s ended %d bytes early",
+                    self.archivo.name,
+                    self.restante
+                )
+                self.terminar()
+                return
+            http.Request.write(self.peticion, datos)
+            enviados = len(datos)
+        self.posicion += enviados
+        self.restante -= enviados
+        if self.restante <= 0:
+            self.terminar()
+
+    def stopProducing(self: Self) -> None:
+        self.peticion = None
+        self.archivo.close()
+
+    def terminar(self: Self) -> None:
+        peticion: http.Request = self.peticion
+        self.peticion = None
+        peticion.unregisterProducer()
+        self.archivo.close()
+        self.completado.callback(peticion)
@@ -4,19 +4,104 @@ from daphne.utils import import_by_path
 
 from asgiref.compatibility import guarantee_single_callable
 from channels.routing import ProtocolTypeRouter
+import argparse
+import json
 import logging
+import os
+import socket
 import sys
 from typing import ParamSpec, Self
 
-from .access import GeneradorLogAcceso
+from twisted.internet import reactor
+from twisted.internet.endpoints import AdoptedStreamServerEndpoint
+from twisted.internet.task import LoopingCall
+
+from .access import EscritorLogAcceso, GeneradorLogAcceso
 from .server import Servidor
+from .supervisor import (
+    abrir_socket_tcp,
+    abrir_socket_unix,
+    redirigir_archivos,
+    Supervisor
+)
 
 
 class InterfazLineaComando(CommandLineInterface):
     server_class: type[Servidor] = Servidor
 
+    def __init__(self: Self) -> None:
+        super().__init__()
+        self.parser.add_argument(
+            "--workers",
+            type=int,
+            help=(
+                "Number of server processes sharing the listening sockets"
+                " (default: 1)"
+            ),
+            default=1,
+        )
+        self.parser.add_argument(
+            "--worker-index",
+            type=int,
+            help=argparse.SUPPRESS,
+            default=None,
+        )
+        self.parser.add_argument(
+            "--worker-stats-fd",
+            type=int,
+            help=argparse.SUPPRESS,
+            default=None,
+        )
+        self.parser.add_argument(
+            "--worker-log-fd",
+            type=int,
+            help=argparse.SUPPRESS,
+            default=None,
+        )
+        self.parser.add_argument(
+            "--inherited-socket",
+            dest="inherited_sockets",
+            action="append",
+            help=argparse.SUPPRESS,
+            default=[],
+        )
+        self.parser.add_argument(
+            "--access-log-batch",
+            type=int,
+            help="Maximum access log entries written per batch",
+            default=256,
+        )
+        self.parser.add_argument(
+            "--access-log-interval",
+            type=float,
+            help="Seconds between access log flushes",
+            default=1.0,
+        )
+        self.parser.add_argument(
+            "--access-log-queue",
+            type=int,
+            help="Maximum access log entries waiting to be written",
+            default=10000,
+        )
+        self.parser.add_argument(
+            "--access-log-overflow",
+            choices=EscritorLogAcceso.politicas,
+            help=(
+                "What to do when the access log queue is full: drop the"
+                " new entry, drop the oldest one or block the server"
+            ),
+            default="descartar",
+        )
+        self.parser.add_argument(
+            "--access-log-db",
+            action="store_true",
+            help="Also copy access log entries into the logs table",
+            default=False,
+        )
+
     def run(self: Self, args: ParamSpec) -> None:
         logger: logging.Logger = logging.getLogger("daphne")
+        argumentos: list[str] = list(args)
         args: ParamSpec = self.parser.parse_args(args)
         logging.basicConfig(
             level={
@@ -30,6 +115,9 @@ class InterfazLineaComando(CommandLineInterface):
         sys.path.insert(0, ".")
         application: ProtocolTypeRouter = import_by_path(args.application)
         application = guarantee_single_callable(application)
+        if args.worker_index is not None:
+            self.run_worker(args, application)
+            return
         if not any(
             [
                 args.host,
@@ -45,6 +133,9 @@ class InterfazLineaComando(CommandLineInterface):
             args.port = DEFAULT_PORT
         elif args.port is not None and not args.host:
             args.host = DEFAULT_HOST
+        if args.workers > 1:
+            self.run_workers(args, argumentos)
+            return
         endpoints: tuple[str] = build_endpoint_description_strings(
             host=args.host,
             port=args.port,
@@ -53,6 +144,101 @@ class InterfazLineaComando(CommandLineInterface):
         )
         endpoints = sorted(args.socket_strings + endpoints)
         logger.info("Starting server at {}".format(", ".join(endpoints)))
+        self.serve(args, application, endpoints)
+
+    def run_workers(
+        self: Self,
+        args: ParamSpec,
+        argumentos: list[str]
+    ) -> None:
+        logger: logging.Logger = logging.getLogger("daphne")
+        if args.socket_strings:
+            self.parser.error(
+                "--workers cannot be combined with -e/--endpoint;"
+                " use --bind/--port, --unix-socket or --fd"
+            )
+        conectores: list[socket.socket] = []
+        descripciones: list[str] = []
+        if args.host:
+            conectores.append(abrir_socket_tcp(args.host, args.port))
+            descripciones.append(f"tcp:{args.host}:{args.port}")
+        if args.unix_socket:
+            conectores.append(abrir_socket_unix(args.unix_socket))
+            descripciones.append(f"unix:{args.unix_socket}")
+        if args.file_descriptor is not None:
+            conectores.append(socket.socket(fileno=args.file_descriptor))
+            descripciones.append(f"fd:{args.file_descriptor}")
+        logger.info(
+            "Starting %d workers at %s",
+            args.workers,
+            ", ".join(descripciones)
+        )
+        try:
+            Supervisor(
+                args.workers,
+                argumentos,
+                conectores,
+                tiempo_gracia=args.application_close_timeout + 5,
+            ).run()
+        finally:
+            for conector in conectores:
+                conector.close()
+
+    def run_worker(
+        self: Self,
+        args: ParamSpec,
+        application: ProtocolTypeRouter
+    ) -> None:
+        if args.worker_log_fd is not None:
+            redirigir_archivos(args.worker_log_fd)
+        endpoints: list[AdoptedStreamServerEndpoint] = []
+        for heredado in args.inherited_sockets:
+            descriptor, familia = heredado.split(":", 1)
+            endpoints.append(
+                AdoptedStreamServerEndpoint(
+                    reactor,
+                    int(descriptor),
+                    getattr(socket, familia)
+                )
+            )
+        if args.worker_stats_fd is not None:
+            os.set_blocking(args.worker_stats_fd, False)
+            publicacion: LoopingCall = LoopingCall(
+                self.publicar_estadisticas,
+                args.worker_stats_fd
+            )
+            reactor.callWhenRunning(publicacion.start, 1.0)
+        self.serve(args, application, endpoints)
+
+    def publicar_estadisticas(self: Self, descriptor: int) -> None:
+        try:
+            os.write(
+                descriptor,
+                json.dumps(self.server.estadisticas()).encode() + b"\n"
+            )
+        except BlockingIOError:
+            pass
+        except BrokenPipeError:
+            logging.getLogger("daphne").error(
+                "Supervisor went away, stopping worker"
+            )
+            self.server.stop()
+
+    def serve(
+        self: Self,
+        args: ParamSpec,
+        application: ProtocolTypeRouter,
+        endpoints: list[str | AdoptedStreamServerEndpoint]
+    ) -> None:
+        logger: logging.Logger = logging.getLogger("daphne")
+        escritor: EscritorLogAcceso = EscritorLogAcceso(
+            logger,
+            tamanio_lote=args.access_log_batch,
+            intervalo=args.access_log_interval,
+            capacidad=args.access_log_queue,
+            politica=args.access_log_overflow,
+            base_datos=args.access_log_db,
+        )
         self.server: Servidor = self.server_class(
             application=application,
             endpoints=endpoints,
@@ -63,7 +249,7 @@ class InterfazLineaComando(CommandLineInterface):
             websocket_connect_timeout=args.websocket_connect_timeout,
             websocket_handshake_timeout=args.websocket_connect_timeout,
             application_close_timeout=args.application_close_timeout,
-            action_logger=GeneradorLogAcceso(logger),
+            action_logger=GeneradorLogAcceso(logger, escritor),
             root_path=args.root_path,
             verbosity=args.verbosity,
             proxy_forwarded_address_header=self._get_forwarded_host(args=args),
@@ -73,4 +259,8 @@ class InterfazLineaComando(CommandLineInterface):
             ),
             server_name=args.server_name,
         )
-        self.server.run()
+        escritor.iniciar()
+        try:
+            self.server.run()
+        finally:
+            escritor.detener()
@@ -1,7 +1,8 @@
 from django.conf import settings
 
-from importlib import import_module
+from io import BufferedReader
 import logging
+import os
 import traceback
 from typing import Any, Optional, Self
 
@@ -12,10 +13,14 @@ from zope.interface import implementer
 
 from daphne.http_protocol import HTTPFactory, WebRequest
 
+from .archivos import ProductorArchivo
+
 logger = logging.getLogger("daphne.http_protocol")
 
 
 class PeticionWeb(WebRequest):
+    productor: Optional[ProductorArchivo] = None
+
     def handle_reply(
         self: Self,
         message: dict[str, Any]
@@ -57,70 +62,100 @@ class PeticionWeb(WebRequest):
             # End if there's no more content
             if not message.get("more_body", False):
                 self.finish()
-                logger.debug("HTTP response complete for %s", self.client_addr)
-                try:
-                    uri = self.uri.decode("ascii")
-                except UnicodeDecodeError:
-                    uri = repr(self.uri)
-                try:
-
-                    SessionStore = import_module(
-                        settings.SESSION_ENGINE
-                    ).SessionStore
-                    clave_sesion: Optional[bytes] = self.getCookie(
-                        settings.SESSION_COOKIE_NAME.encode(
-                            "utf-8"
-                        )
-                    )
-                    usuario: str
-                    if not clave_sesion:
-                        usuario = "anonymous user"
-                    else:
-                        sesion = SessionStore(
-                            session_key=clave_sesion.decode()
-                        )
-                        # sesion.load() conflicto async
-                        id_usuario: int = sesion.load().get(
-                            "_auth_user_id", 0
-                        )
-                        if id_usuario == 0:
-                            usuario = "anonymous user"
-                        else:
-                            usuario = f'user {id_usuario}'
-                except Exception:
-                    usuario = "anonymous user"
-                try:
-                    self.server.log_action(
-                        "http",
-                        "complete",
-                        {
-                            "path": (
-                                f'{self.client_scheme}://'
-                                f'{self.getHeader("Host")}'
-                                f'{uri}'
-                            ),
-                            "status": self.code,
-                            "method": self.method.decode("ascii", "replace"),
-                            "client": (
-                                "%s:%s" % tuple(self.client_addr)
-                                if self.client_addr
-                                else None
-                            ),
-                            "user": usuario,
-                            "browser": self.getHeader("User-Agent"),
-                            "time_taken": self.duration(),
-                            "size": self.sentLength,
-                        },
-                    )
-                except Exception:
-                    logger.error(traceback.format_exc())
+                self.registrar_respuesta()
             else:
                 logger.debug("HTTP response chunk for %s", self.client_addr)
+        elif message["type"] == "http.response.pathsend":
+            if not self._response_started:
+                raise ValueError(
+                    "HTTP response has not yet been started but got %s"
+                    % message["type"]
+                )
+            self.enviar_archivo(message)
         else:
             raise ValueError(
                 "Cannot handle message type %s!" % message["type"]
             )
 
+    def enviar_archivo(self: Self, message: dict[str, Any]) -> None:
+        try:
+            archivo: BufferedReader = open(message["path"], "rb")
+            posicion: int = message.get("offset", 0)
+            restante: int = message.get(
+                "count",
+                os.fstat(archivo.fileno()).st_size - posicion
+            )
+        except (KeyError, OSError):
+            logger.error(traceback.format_exc())
+            self.setResponseCode(500)
+            self.responseHeaders.removeHeader(b"content-length")
+            self.finish()
+            self.registrar_respuesta()
+            return
+        if self.method == b"HEAD" or self.code in http.NO_BODY_CODES:
+            archivo.close()
+            self.finish()
+            self.registrar_respuesta()
+            return
+        self.productor = ProductorArchivo(self, archivo, posicion, restante)
+        self.productor.iniciar().addCallback(self.completar_archivo)
+
+    def completar_archivo(self: Self, peticion: http.Request) -> None:
+        self.productor = None
+        if not self.finished and not self._disconnected:
+            self.finish()
+            self.registrar_respuesta()
+
+    def check_timeouts(self: Self) -> None:
+        if self.productor is None:
+            super().check_timeouts()
+
+    def connectionLost(self: Self, reason) -> None:
+        self.productor = None
+        super().connectionLost(reason)
+
+    def registrar_respuesta(self: Self) -> None:
+        logger.debug("HTTP response complete for %s", self.client_addr)
+        try:
+            uri = self.uri.decode("ascii")
+        except UnicodeDecodeError:
+            uri = repr(self.uri)
+        clave_sesion: Optional[bytes] = self.getCookie(
+            settings.SESSION_COOKIE_NAME.encode("utf-8")
+        )
+        detalles: dict[str, Any] = {
+            "path": (
+                f'{self.client_scheme}://'
+                f'{self.getHeader("Host")}'
+                f'{uri}'
+            ),
+            "status": self.code,
+            "method": self.method.decode("ascii", "replace"),
+            "client": (
+                "%s:%s" % tuple(self.client_addr)
+                if self.client_addr
+                else None
+            ),
+            "browser": self.getHeader("User-Agent"),
+            "time_taken": self.duration(),
+            "size": self.sentLength,
+        }
+        self.server.sesiones.resolver(clave_sesion).addCallback(
+            self.registrar_completado,
+            detalles
+        )
+
+    def registrar_completado(
+        self: Self,
+        usuario: str,
+        detalles: dict[str, Any]
+    ) -> None:
+        detalles["user"] = usuario
+        try:
+            self.server.log_action("http", "complete", detalles)
+        except Exception:
+            logger.error(traceback.format_exc())
+
 
 @implementer(IProtocolNegotiationFactory)
 class FabricaHTTP(HTTPFactory):
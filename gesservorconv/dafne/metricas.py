@@ -0,0 +1,18 @@
+from prometheus_client import Counter, Gauge
+
+
+CONEXIONES_HTTP: Gauge = Gauge(
+    "dafne_http_connections",
+    "Peticiones HTTP en curso",
+    multiprocess_mode="livesum"
+)
+CONEXIONES_WEBSOCKET: Gauge = Gauge(
+    "dafne_websocket_connections",
+    "Conexiones WebSocket abiertas",
+    multiprocess_mode="livesum"
+)
+CONEXIONES_TOTALES: Counter = Counter(
+    "dafne_connections",
+    "Conexiones aceptadas",
+    ["protocol"]
+)
@@ -30,10 +30,10 @@ else:
 
 import logging
 import time
-from concurrent.futures import CancelledError
 from functools import partial
 
 from twisted.internet import defer, reactor
+from twisted.internet.interfaces import IDelayedCall
 from twisted.internet.endpoints import serverFromString
 from twisted.logger import STDLibLogObserver, globalLogBeginner
 from twisted.web import http
@@ -41,13 +41,45 @@ from twisted.web import http
 from typing import Any, Optional, Self
 
 from .http_protocol import FabricaHTTP
-from .ws_protocol import FabricaWebSocket
+from .metricas import (
+    CONEXIONES_HTTP,
+    CONEXIONES_TOTALES,
+    CONEXIONES_WEBSOCKET
+)
+from .sesiones import ResolvedorSesiones
+from .ws_protocol import FabricaWebSocket, ProtocoloWebSocket
 
 
 logger: logging.Logger = logging.getLogger("daphne.server")
 
 
+class Conexion:
+    __slots__ = (
+        "connected",
+        "disconnected",
+        "application_instance",
+        "revision",
+        "cierre",
+    )
+
+    def __init__(self: Self, connected: float) -> None:
+        self.connected: float = connected
+        self.disconnected: Optional[float] = None
+        self.application_instance: Optional[asyncio.Future] = None
+        self.revision: Optional[IDelayedCall] = None
+        self.cierre: Optional[IDelayedCall] = None
+
+    def cancelar_temporizadores(self: Self) -> None:
+        for temporizador in (self.revision, self.cierre):
+            if temporizador is not None and temporizador.active():
+                temporizador.cancel()
+        self.revision = None
+        self.cierre = None
+
+
 class Servidor:
+    holgura_revision: float = 1.0
+
     def __init__(
         self: Self,
         application,
@@ -92,6 +124,10 @@ class Servidor:
         self.abort_start: bool = False
         self.ready_callable = ready_callable
         self.server_name: str = server_name
+        self.sesiones: ResolvedorSesiones = ResolvedorSesiones()
+        self.conexiones_http: int = 0
+        self.conexiones_websocket: int = 0
+        self.peticiones: int = 0
         if not self.endpoints:
             logger.error(
                 "No endpoints. This server will not listen on anything."
@@ -99,7 +135,7 @@ class Servidor:
             sys.exit(1)
 
     def run(self: Self) -> None:
-        self.connections: dict[str, Any] = {}
+        self.connections: dict[Any, Conexion] = {}
         self.http_factory: FabricaHTTP = FabricaHTTP(self)
         self.ws_factory: FabricaWebSocket = FabricaWebSocket(
             self, server=self.server_name
@@ -122,11 +158,13 @@ class Servidor:
                 "HTTP/2 support not enabled"
                 " (install the http2 and tls Twisted extras)"
             )
-        reactor.callLater(1, self.application_checker)
-        reactor.callLater(2, self.timeout_checker)
         for socket_description in self.endpoints:
             logger.info("Configuring endpoint %s", socket_description)
-            ep = serverFromString(reactor, str(socket_description))
+            ep = (
+                serverFromString(reactor, socket_description)
+                if isinstance(socket_description, str)
+                else socket_description
+            )
             listener = ep.listen(self.http_factory)
             listener.addCallback(self.listen_success)
             listener.addErrback(self.listen_error)
@@ -170,35 +208,83 @@ class Servidor:
             raise RuntimeError(
                 "Protocol %r was added to main list twice!" % protocol
             )
-        self.connections[protocol] = {"connected": time.time()}
+        self.connections[protocol] = Conexion(time.time())
+        self.peticiones += 1
+        if isinstance(protocol, ProtocoloWebSocket):
+            self.conexiones_websocket += 1
+            CONEXIONES_WEBSOCKET.inc()
+            CONEXIONES_TOTALES.labels("websocket").inc()
+        else:
+            self.conexiones_http += 1
+            CONEXIONES_HTTP.inc()
+            CONEXIONES_TOTALES.labels("http").inc()
+        self.programar_revision(protocol)
 
     def protocol_disconnected(self, protocol):
-        if "disconnected" not in self.connections[protocol]:
-            self.connections[protocol]["disconnected"] = time.time()
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if conexion is None or conexion.disconnected is not None:
+            return
+        conexion.disconnected = time.time()
+        if conexion.revision is not None and conexion.revision.active():
+            conexion.revision.cancel()
+        conexion.revision = None
+        application_instance = conexion.application_instance
+        if application_instance is None or application_instance.done():
+            self.eliminar_conexion(protocol)
+        else:
+            conexion.cierre = reactor.callLater(
+                self.application_close_timeout,
+                self.cerrar_aplicacion,
+                protocol
+            )
+
+    def eliminar_conexion(self, protocol):
+        conexion: Optional[Conexion] = self.connections.pop(protocol, None)
+        if conexion is None:
+            return
+        conexion.cancelar_temporizadores()
+        if isinstance(protocol, ProtocoloWebSocket):
+            self.conexiones_websocket -= 1
+            CONEXIONES_WEBSOCKET.dec()
+        else:
+            self.conexiones_http -= 1
+            CONEXIONES_HTTP.dec()
+
+    def estadisticas(self) -> dict[str, int]:
+        return {
+            "conexiones_http": self.conexiones_http,
+            "conexiones_websocket": self.conexiones_websocket,
+            "peticiones": self.peticiones,
+        }
 
     def create_application(self, protocol, scope):
-        assert "application_instance" not in self.connections[protocol]
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if conexion is None:
+            return None
+        assert conexion.application_instance is None
         input_queue = asyncio.Queue()
         scope.setdefault("asgi", {"version": "3.0"})
+        if scope["type"] == "http":
+            scope.setdefault("extensions", {})["http.response.pathsend"] = {
+                "ranges": True
+            }
         application_instance = self.application(
             scope=scope,
             receive=input_queue.get,
             send=partial(self.handle_reply, protocol),
         )
-        if protocol not in self.connections:
-            return None
-        self.connections[protocol][
-            "application_instance"
-        ] = asyncio.ensure_future(
+        conexion.application_instance = asyncio.ensure_future(
             application_instance,
             loop=asyncio.get_event_loop(),
         )
+        conexion.application_instance.add_done_callback(
+            partial(self.application_done, protocol)
+        )
         return input_queue
 
     async def handle_reply(self, protocol, message):
-        if protocol not in self.connections or self.connections[protocol].get(
-            "disconnected", None
-        ):
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if conexion is None or conexion.disconnected is not None:
             return
         try:
             self.check_headers_type(message)
@@ -225,50 +311,49 @@ class Servidor:
                     )
                 )
 
-    def application_checker(self):
-        for protocol, details in list(self.connections.items()):
-            disconnected = details.get("disconnected", None)
-            application_instance = details.get("application_instance", None)
-            if (
-                disconnected
-                and time.time() - disconnected > self.application_close_timeout
-            ):
-                if application_instance and not application_instance.done():
-                    logger.warning(
-                        "Application instance %r for connection %s took too long to shut down and was killed.",
-                        application_instance,
-                        repr(protocol),
-                    )
-                    application_instance.cancel()
-            if application_instance and application_instance.done():
-                try:
-                    exception = application_instance.exception()
-                except (CancelledError, asyncio.CancelledError):
-                    # Future cancellation. We can ignore this.
-                    pass
+    def application_done(self, protocol, application_instance):
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if (
+            conexion is None or
+            conexion.application_instance is not application_instance
+        ):
+            return
+        if not application_instance.cancelled():
+            exception = application_instance.exception()
+            if exception:
+                if isinstance(exception, KeyboardInterrupt):
+                    self.stop()
                 else:
-                    if exception:
-                        if isinstance(exception, KeyboardInterrupt):
-                            self.stop()
-                        else:
-                            logger.error(
-                                "Exception inside application: %s",
-                                exception,
-                                exc_info=exception,
-                            )
-                            if not disconnected:
-                                protocol.handle_exception(exception)
-                del self.connections[protocol]["application_instance"]
-                application_instance = None
-            if not application_instance and disconnected:
-                del self.connections[protocol]
-        reactor.callLater(1, self.application_checker)
+                    logger.error(
+                        "Exception inside application: %s",
+                        exception,
+                        exc_info=exception,
+                    )
+                    if conexion.disconnected is None:
+                        protocol.handle_exception(exception)
+        conexion.application_instance = None
+        if conexion.disconnected is not None:
+            self.eliminar_conexion(protocol)
+
+    def cerrar_aplicacion(self, protocol):
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if conexion is None:
+            return
+        conexion.cierre = None
+        application_instance = conexion.application_instance
+        if application_instance is not None and not application_instance.done():
+            logger.warning(
+                "Application instance %r for connection %s took too long to shut down and was killed.",
+                application_instance,
+                repr(protocol),
+            )
+            application_instance.cancel()
 
     def kill_all_applications(self):
         wait_for = []
-        for details in self.connections.values():
-            application_instance = details["application_instance"]
-            if not application_instance.done():
+        for conexion in self.connections.values():
+            application_instance = conexion.application_instance
+            if application_instance is not None and not application_instance.done():
                 application_instance.cancel()
                 wait_for.append(application_instance)
         logger.info("Killed %i pending application instances", len(wait_for))
@@ -276,10 +361,43 @@ class Servidor:
         wait_deferred.addErrback(lambda x: None)
         return wait_deferred
 
-    def timeout_checker(self):
-        for protocol in list(self.connections.keys()):
-            protocol.check_timeouts()
-        reactor.callLater(2, self.timeout_checker)
+    def intervalo_revision(self, protocol) -> Optional[float]:
+        if isinstance(protocol, ProtocoloWebSocket):
+            if protocol.state == protocol.STATE_CONNECTING:
+                return self.holgura_revision + min(
+                    self.ping_interval,
+                    self.websocket_connect_timeout
+                )
+            return self.holgura_revision + self.ping_interval
+        if self.http_timeout:
+            return self.holgura_revision + max(
+                self.http_timeout - protocol.duration(), 0
+            )
+        return None
+
+    def programar_revision(self, protocol, intervalo=None):
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if intervalo is None:
+            intervalo = self.intervalo_revision(protocol)
+        if conexion is None or intervalo is None:
+            return
+        conexion.revision = reactor.callLater(
+            intervalo,
+            self.revisar_tiempos,
+            protocol
+        )
+
+    def revisar_tiempos(self, protocol):
+        conexion: Optional[Conexion] = self.connections.get(protocol)
+        if conexion is None or conexion.disconnected is not None:
+            return
+        conexion.revision = None
+        protocol.check_timeouts()
+        if (
+            protocol in self.connections and
+            self.connections[protocol].disconnected is None
+        ):
+            self.programar_revision(protocol)
 
     def log_action(self, protocol, action, details):
         if self.action_logger:
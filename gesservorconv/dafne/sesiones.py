@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.db import close_old_connections
+
+from collections import OrderedDict
+from importlib import import_module
+import logging
+from threading import Lock
+import time
+from typing import Optional, Self
+
+from twisted.internet import defer, threads
+
+
+logger: logging.Logger = logging.getLogger("daphne.sesiones")
+
+USUARIO_ANONIMO: str = "anonymous user"
+
+
+class ResolvedorSesiones:
+    def __init__(
+        self: Self,
+        maximo: int = 4096,
+        duracion: float = 300.0
+    ) -> None:
+        self.maximo: int = maximo
+        self.duracion: float = duracion
+        self._entradas: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._pendientes: dict[str, list[defer.Deferred]] = {}
+        self._candado: Lock = Lock()
+
+    @staticmethod
+    def etiqueta(id_usuario: Optional[int | str]) -> str:
+        if not id_usuario or str(id_usuario) == "0":
+            return USUARIO_ANONIMO
+        return f'user {id_usuario}'
+
+    def obtener(self: Self, clave_sesion: str) -> Optional[str]:
+        with self._candado:
+            entrada: Optional[tuple[float, str]] = self._entradas.get(
+                clave_sesion
+            )
+            if entrada is None:
+                return None
+            vencimiento, usuario = entrada
+            if vencimiento < time.monotonic():
+                del self._entradas[clave_sesion]
+                return None
+            self._entradas.move_to_end(clave_sesion)
+            return usuario
+
+    def guardar(self: Self, clave_sesion: str, usuario: str) -> None:
+        with self._candado:
+            self._entradas[clave_sesion] = (
+                time.monotonic() + self.duracion,
+                usuario
+            )
+            self._entradas.move_to_end(clave_sesion)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self: Self, clave_sesion: str) -> None:
+        with self._candado:
+            self._entradas.pop(clave_sesion, None)
+
+    def resolver(
+        self: Self,
+        clave_sesion: Optional[str | bytes]
+    ) -> defer.Deferred:
+        if not clave_sesion:
+            return defer.succeed(USUARIO_ANONIMO)
+        if isinstance(clave_sesion, bytes):
+            clave_sesion = clave_sesion.decode("latin1")
+        usuario: Optional[str] = self.obtener(clave_sesion)
+        if usuario is not None:
+            return defer.succeed(usuario)
+        resultado: defer.Deferred = defer.Deferred()
+        if clave_sesion in self._pendientes:
+            self._pendientes[clave_sesion].append(resultado)
+            return resultado
+        self._pendientes[clave_sesion] = [resultado]
+        carga: defer.Deferred = threads.deferToThread(
+            self._cargar,
+            clave_sesion
+        )
+        carga.addCallbacks(
+            self._completar,
+            self._error_carga,
+            callbackArgs=(clave_sesion,),
+            errbackArgs=(clave_sesion,)
+        )
+        return resultado
+
+    def _cargar(self: Self, clave_sesion: str) -> str:
+        try:
+            SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+            sesion = SessionStore(session_key=clave_sesion)
+            return self.etiqueta(sesion.load().get("_auth_user_id"))
+        finally:
+            close_old_connections()
+
+    def _error_carga(self: Self, falla, clave_sesion: str) -> None:
+        # Un error pasajero de la base de datos o de Redis no se guarda:
+        # la próxima petición vuelve a intentar la carga
+        logger.debug(
+            "No se pudo cargar la sesión: %s",
+            falla.getErrorMessage()
+        )
+        self._responder(clave_sesion, USUARIO_ANONIMO)
+
+    def _completar(self: Self, usuario: str, clave_sesion: str) -> None:
+        self.guardar(clave_sesion, usuario)
+        self._responder(clave_sesion, usuario)
+
+    def _responder(self: Self, clave_sesion: str, usuario: str) -> None:
+        for pendiente in self._pendientes.pop(clave_sesion, []):
+            pendiente.callback(usuario)
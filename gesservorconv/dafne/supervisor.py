@@ -0,0 +1,449 @@
+import json
+import logging
+from logging import Handler, LogRecord
+import os
+from pathlib import Path
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+from types import FrameType
+from typing import Any, Optional, Self
+
+from prometheus_client import multiprocess
+
+from gesservorconv.logging import ManejadorArchivosTiempoRotativo
+
+
+logger: logging.Logger = logging.getLogger("daphne.supervisor")
+
+
+def abrir_socket_tcp(host: str, puerto: int) -> socket.socket:
+    familia: socket.AddressFamily = (
+        socket.AF_INET6 if ":" in host else socket.AF_INET
+    )
+    conector: socket.socket = socket.socket(familia, socket.SOCK_STREAM)
+    conector.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    conector.bind((host.strip("[]"), puerto))
+    conector.listen(socket.SOMAXCONN)
+    conector.set_inheritable(True)
+    return conector
+
+
+def abrir_socket_unix(ruta: str) -> socket.socket:
+    if os.path.exists(ruta):
+        os.unlink(ruta)
+    conector: socket.socket = socket.socket(
+        socket.AF_UNIX,
+        socket.SOCK_STREAM
+    )
+    conector.bind(ruta)
+    conector.listen(socket.SOMAXCONN)
+    conector.set_inheritable(True)
+    return conector
+
+
+def registradores() -> list[logging.Logger]:
+    return [
+        logging.getLogger(),
+        *(
+            registrador
+            for registrador in logging.Logger.manager.loggerDict.values()
+            if isinstance(registrador, logging.Logger)
+        )
+    ]
+
+
+def manejadores_archivo() -> dict[str, ManejadorArchivosTiempoRotativo]:
+    return {
+        manejador.name: manejador
+        for registrador in registradores()
+        for manejador in registrador.handlers
+        if isinstance(manejador, ManejadorArchivosTiempoRotativo)
+    }
+
+
+class ManejadorSupervisor(Handler):
+    '''
+    Reemplaza en cada trabajador a un manejador de archivo rotativo:
+    formatea los registros y se los envía al supervisor, que es el único
+    proceso que escribe y rota los archivos
+    '''
+    def __init__(
+        self: Self,
+        descriptor: int,
+        manejador: ManejadorArchivosTiempoRotativo
+    ) -> None:
+        super().__init__(manejador.level)
+        self.descriptor: int = descriptor
+        self.manejador: str = manejador.name
+        self.setFormatter(manejador.formatter)
+        for filtro in manejador.filters:
+            self.addFilter(filtro)
+
+    def emit(self: Self, registro: LogRecord) -> None:
+        self.emitir_lote([registro])
+
+    def emitir_lote(self: Self, registros: list[LogRecord]) -> None:
+        lineas: list[str] = []
+        for registro in registros:
+            if registro.levelno < self.level or not self.filter(registro):
+                continue
+            try:
+                lineas.append(
+                    json.dumps(
+                        {
+                            "manejador": self.manejador,
+                            "nombre": registro.name,
+                            "nivel": registro.levelno,
+                            "texto": self.format(registro),
+                        }
+                    )
+                )
+            except Exception:
+                self.handleError(registro)
+        if not lineas:
+            return
+        datos: memoryview = memoryview(("\n".join(lineas) + "\n").encode())
+        self.acquire()
+        try:
+            while datos:
+                datos = datos[os.write(self.descriptor, datos):]
+        except OSError:
+            self.handleError(registros[0])
+        finally:
+            self.release()
+
+
+def redirigir_archivos(descriptor: int) -> None:
+    '''
+    Hace que el trabajador envíe al supervisor los registros de los
+    archivos rotativos en lugar de escribirlos: si cada proceso rotara el
+    mismo archivo a medianoche, se perdería el del día anterior
+    '''
+    reemplazos: dict[int, ManejadorSupervisor] = {}
+    for registrador in registradores():
+        for manejador in list(registrador.handlers):
+            if not isinstance(manejador, ManejadorArchivosTiempoRotativo):
+                continue
+            if id(manejador) not in reemplazos:
+                reemplazos[id(manejador)] = ManejadorSupervisor(
+                    descriptor,
+                    manejador
+                )
+                manejador.close()
+            registrador.removeHandler(manejador)
+            registrador.addHandler(reemplazos[id(manejador)])
+
+
+class Trabajador:
+    __slots__ = (
+        "indice",
+        "proceso",
+        "lectura",
+        "pendiente",
+        "registro",
+        "pendiente_registro",
+        "inicio",
+        "reinicios",
+        "espera",
+        "estadisticas",
+    )
+
+    def __init__(self: Self, indice: int, espera: float) -> None:
+        self.indice: int = indice
+        self.proceso: Optional[subprocess.Popen] = None
+        self.lectura: Optional[int] = None
+        self.pendiente: bytes = b""
+        self.registro: Optional[int] = None
+        self.pendiente_registro: bytes = b""
+        self.inicio: float = 0.0
+        self.reinicios: int = 0
+        self.espera: float = espera
+        self.estadisticas: dict[str, Any] = {}
+
+
+class Supervisor:
+    intervalo: float = 0.5
+
+    def __init__(
+        self: Self,
+        cantidad: int,
+        argumentos: list[str],
+        conectores: list[socket.socket],
+        tiempo_gracia: float = 30.0,
+        espera_reinicio: float = 1.0,
+        espera_maxima: float = 30.0
+    ) -> None:
+        self.argumentos: list[str] = argumentos
+        self.conectores: list[socket.socket] = conectores
+        self.tiempo_gracia: float = tiempo_gracia
+        self.espera_reinicio: float = espera_reinicio
+        self.espera_maxima: float = espera_maxima
+        self.trabajadores: list[Trabajador] = [
+            Trabajador(indice, espera_reinicio)
+            for indice in range(cantidad)
+        ]
+        self.deteniendo: Optional[float] = None
+        self.manejadores: dict[str, ManejadorArchivosTiempoRotativo] = (
+            manejadores_archivo()
+        )
+
+    def run(self: Self) -> None:
+        signal.signal(signal.SIGTERM, self.detener)
+        signal.signal(signal.SIGINT, self.detener)
+        signal.signal(signal.SIGUSR1, self.informar)
+        for trabajador in self.trabajadores:
+            self.lanzar(trabajador)
+        while any(
+            trabajador.proceso is not None
+            for trabajador in self.trabajadores
+        ):
+            self.leer_estadisticas()
+            self.recoger()
+            if (
+                self.deteniendo is not None and
+                time.time() - self.deteniendo > self.tiempo_gracia
+            ):
+                self.forzar()
+        logger.info("All workers stopped")
+
+    def comando(
+        self: Self,
+        trabajador: Trabajador,
+        escritura: int,
+        escritura_registro: int
+    ) -> list[str]:
+        comando: list[str] = [
+            sys.executable, "-m", "dafne",
+            *self.argumentos,
+            "--worker-index", str(trabajador.indice),
+            "--worker-stats-fd", str(escritura),
+            "--worker-log-fd", str(escritura_registro),
+        ]
+        for conector in self.conectores:
+            comando.extend(
+                [
+                    "--inherited-socket",
+                    f"{conector.fileno()}:{conector.family.name}"
+                ]
+            )
+        return comando
+
+    def lanzar(self: Self, trabajador: Trabajador) -> None:
+        lectura, escritura = os.pipe()
+        os.set_blocking(lectura, False)
+        registro, escritura_registro = os.pipe()
+        os.set_blocking(registro, False)
+        entorno: dict[str, str] = dict(os.environ)
+        entorno["PYTHONPATH"] = os.pathsep.join(
+            ruta for ruta in (
+                str(Path(__file__).resolve().parent.parent),
+                entorno.get("PYTHONPATH")
+            ) if ruta
+        )
+        try:
+            trabajador.proceso = subprocess.Popen(
+                self.comando(trabajador, escritura, escritura_registro),
+                pass_fds=[
+                    escritura,
+                    escritura_registro,
+                    *(conector.fileno() for conector in self.conectores)
+                ],
+                env=entorno,
+            )
+        finally:
+            os.close(escritura)
+            os.close(escritura_registro)
+        trabajador.lectura = lectura
+        trabajador.pendiente = b""
+        trabajador.registro = registro
+        trabajador.pendiente_registro = b""
+        trabajador.inicio = time.time()
+        trabajador.estadisticas = {}
+        logger.info(
+            "Started worker %d (pid %d)",
+            trabajador.indice,
+            trabajador.proceso.pid
+        )
+
+    def leer_estadisticas(self: Self) -> None:
+        lecturas: dict[int, Trabajador] = {
+            trabajador.lectura: trabajador
+            for trabajador in self.trabajadores
+            if trabajador.lectura is not None
+        }
+        registros: dict[int, Trabajador] = {
+            trabajador.registro: trabajador
+            for trabajador in self.trabajadores
+            if trabajador.registro is not None
+        }
+        try:
+            listos, _, _ = select.select(
+                [*lecturas, *registros], [], [], self.intervalo
+            )
+        except InterruptedError:
+            return
+        for lectura in listos:
+            if lectura in registros:
+                self.leer_registros(registros[lectura])
+                continue
+            trabajador: Trabajador = lecturas[lectura]
+            try:
+                datos: bytes = os.read(lectura, 65536)
+            except BlockingIOError:
+                continue
+            if not datos:
+                os.close(lectura)
+                trabajador.lectura = None
+                continue
+            *lineas, trabajador.pendiente = (
+                trabajador.pendiente + datos
+            ).split(b"\n")
+            if lineas:
+                try:
+                    trabajador.estadisticas = json.loads(lineas[-1])
+                except ValueError:
+                    pass
+        if not lecturas and not registros:
+            time.sleep(self.intervalo)
+
+    def leer_registros(self: Self, trabajador: Trabajador) -> bool:
+        '''
+        Escribe en los archivos los registros que envió el trabajador.
+        Devuelve si queda algo por leer
+        '''
+        try:
+            datos: bytes = os.read(trabajador.registro, 65536)
+        except BlockingIOError:
+            return False
+        if not datos:
+            os.close(trabajador.registro)
+            trabajador.registro = None
+            return False
+        *lineas, trabajador.pendiente_registro = (
+            trabajador.pendiente_registro + datos
+        ).split(b"\n")
+        lotes: dict[str, list[LogRecord]] = {}
+        for linea in lineas:
+            try:
+                campos: dict[str, Any] = json.loads(linea)
+            except ValueError:
+                continue
+            if campos["manejador"] not in self.manejadores:
+                continue
+            lotes.setdefault(campos["manejador"], []).append(
+                logging.makeLogRecord(
+                    {
+                        "name": campos["nombre"],
+                        "levelno": campos["nivel"],
+                        "levelname": logging.getLevelName(campos["nivel"]),
+                        "msg": campos["texto"],
+                        "formateado": campos["texto"],
+                    }
+                )
+            )
+        for nombre, lote in lotes.items():
+            self.manejadores[nombre].emitir_lote(lote)
+        return True
+
+    def recoger(self: Self) -> None:
+        ahora: float = time.time()
+        for trabajador in self.trabajadores:
+            if trabajador.proceso is None:
+                if self.deteniendo is None and trabajador.inicio <= ahora:
+                    trabajador.reinicios += 1
+                    self.lanzar(trabajador)
+                continue
+            codigo: Optional[int] = trabajador.proceso.poll()
+            if codigo is None:
+                continue
+            if trabajador.lectura is not None:
+                os.close(trabajador.lectura)
+                trabajador.lectura = None
+            # lo que el trabajador haya escrito antes de salir
+            while (
+                trabajador.registro is not None and
+                self.leer_registros(trabajador)
+            ):
+                pass
+            if trabajador.registro is not None:
+                os.close(trabajador.registro)
+                trabajador.registro = None
+            pid: int = trabajador.proceso.pid
+            trabajador.proceso = None
+            if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+                multiprocess.mark_process_dead(pid)
+            if self.deteniendo is not None:
+                continue
+            logger.warning(
+                "Worker %d (pid %d) exited with status %d, restarting",
+                trabajador.indice,
+                pid,
+                codigo
+            )
+            if ahora - trabajador.inicio < self.espera_maxima:
+                trabajador.inicio = ahora + trabajador.espera
+                trabajador.espera = min(
+                    trabajador.espera * 2,
+                    self.espera_maxima
+                )
+            else:
+                trabajador.inicio = ahora
+                trabajador.espera = self.espera_reinicio
+
+    def detener(
+        self: Self,
+        senial: int,
+        marco: Optional[FrameType]
+    ) -> None:
+        if self.deteniendo is not None:
+            return
+        self.deteniendo = time.time()
+        logger.info("Stopping workers")
+        for trabajador in self.trabajadores:
+            if trabajador.proceso is not None:
+                trabajador.proceso.send_signal(signal.SIGTERM)
+
+    def forzar(self: Self) -> None:
+        for trabajador in self.trabajadores:
+            if trabajador.proceso is not None:
+                logger.warning(
+                    "Worker %d (pid %d) did not stop in time, killing",
+                    trabajador.indice,
+                    trabajador.proceso.pid
+                )
+                trabajador.proceso.kill()
+
+    def informar(
+        self: Self,
+        senial: int,
+        marco: Optional[FrameType]
+    ) -> None:
+        for fila in self.estadisticas():
+            logger.info(
+                "Worker %(indice)d pid=%(pid)s restarts=%(reinicios)d"
+                " http=%(conexiones_http)s websocket=%(conexiones_websocket)s"
+                " requests=%(peticiones)s",
+                fila
+            )
+
+    def estadisticas(self: Self) -> list[dict[str, Any]]:
+        return [
+            {
+                "conexiones_http": None,
+                "conexiones_websocket": None,
+                "peticiones": None,
+                **trabajador.estadisticas,
+                "indice": trabajador.indice,
+                "pid": (
+                    trabajador.proceso.pid
+                    if trabajador.proceso is not None
+                    else None
+                ),
+                "reinicios": trabajador.reinicios,
+            }
+            for trabajador in self.trabajadores
+        ]
@@ -4,10 +4,9 @@ import logging
 import traceback
 
 from autobahn.twisted.websocket import ConnectionDeny
-from importlib import import_module
 from twisted.internet.address import UNIXAddress
 from twisted.internet.protocol import Protocol
-from typing import Self
+from typing import Any, Optional, Self
 
 from daphne.ws_protocol import WebSocketFactory, WebSocketProtocol
 
@@ -19,33 +18,7 @@ class ProtocoloWebSocket(WebSocketProtocol):
     def applicationCreateWorked(self: Self, application_queue) -> None:
         self.application_queue = application_queue
         self.application_queue.put_nowait({"type": "websocket.connect"})
-        usuario: str
-        for clave, igual, valor in (
-            [
-                cookie.partition("=") for cookie
-                in self.request.headers["cookie"].split("; ")
-            ]
-        ):
-            if clave == settings.SESSION_COOKIE_NAME:
-                SessionStore = import_module(
-                    settings.SESSION_ENGINE
-                ).SessionStore
-                sesion = SessionStore(
-                    session_key=valor
-                )
-                id_usuario: int = sesion.load().get(
-                    "_auth_user_id", "0"
-                )
-                if id_usuario == "0":
-                    usuario = "anonymous user"
-                    break
-                else:
-                    usuario = f'user {id_usuario}'
-                    break
-        else:
-            usuario = "anonymous user"
-        self.server.log_action(
-            "websocket",
+        self.registrar_accion(
             "connecting",
             {
                 "path": (
@@ -56,7 +29,6 @@ class ProtocoloWebSocket(WebSocketProtocol):
                     "%s:%s" % tuple(self.client_addr)
                     if self.client_addr else None
                 ),
-                "user": usuario,
                 "status": self.state,
                 "browser": self.request.headers["user-agent"],
             },
@@ -64,33 +36,7 @@ class ProtocoloWebSocket(WebSocketProtocol):
 
     def onOpen(self: Self) -> None:
         logger.debug("WebSocket %s open and established", self.client_addr)
-        usuario: str
-        for clave, igual, valor in (
-            [
-                cookie.partition("=") for cookie
-                in self.request.headers["cookie"].split("; ")
-            ]
-        ):
-            if clave == settings.SESSION_COOKIE_NAME:
-                SessionStore = import_module(
-                    settings.SESSION_ENGINE
-                ).SessionStore
-                sesion = SessionStore(
-                    session_key=valor
-                )
-                id_usuario: int = sesion.load().get(
-                    "_auth_user_id", "0"
-                )
-                if id_usuario == "0":
-                    usuario = "anonymous user"
-                    break
-                else:
-                    usuario = f'user {id_usuario}'
-                    break
-        else:
-            usuario = "anonymous user"
-        self.server.log_action(
-            "websocket",
+        self.registrar_accion(
             "connected",
             {
                 "path": (
@@ -103,44 +49,17 @@ class ProtocoloWebSocket(WebSocketProtocol):
                 ),
                 "status": self.state,
                 "browser": self.request.headers["user-agent"],
-                "user": usuario,
             },
         )
 
     def onClose(self: Self, wasClean: bool, code: int, reason: str) -> None:
         self.server.protocol_disconnected(self)
         logger.debug("WebSocket closed for %s", self.client_addr)
-        usuario: str
-        for clave, igual, valor in (
-            [
-                cookie.partition("=") for cookie
-                in self.request.headers["cookie"].split("; ")
-            ]
-        ):
-            if clave == settings.SESSION_COOKIE_NAME:
-                SessionStore = import_module(
-                    settings.SESSION_ENGINE
-                ).SessionStore
-                sesion = SessionStore(
-                    session_key=valor
-                )
-                id_usuario: int = sesion.load().get(
-                    "_auth_user_id", "0"
-                )
-                if id_usuario == "0":
-                    usuario = "anonymous user"
-                    break
-                else:
-                    usuario = f'user {id_usuario}'
-                    break
-        else:
-            usuario = "anonymous user"
         if not self.muted and hasattr(self, "application_queue"):
             self.application_queue.put_nowait(
                 {"type": "websocket.disconnect", "code": code}
             )
-        self.server.log_action(
-            "websocket",
+        self.registrar_accion(
             "disconnected",
             {
                 "path": (
@@ -153,7 +72,6 @@ class ProtocoloWebSocket(WebSocketProtocol):
                 ),
                 "status": code,
                 "browser": self.request.headers["user-agent"],
-                "user": usuario,
             },
         )
 
@@ -164,33 +82,7 @@ class ProtocoloWebSocket(WebSocketProtocol):
         del self.handshake_deferred
         self.server.protocol_disconnected(self)
         logger.debug("WebSocket %s rejected by application", self.client_addr)
-        usuario: str
-        for clave, igual, valor in (
-            [
-                cookie.partition("=") for cookie
-                in self.request.headers["cookie"].split("; ")
-            ]
-        ):
-            if clave == settings.SESSION_COOKIE_NAME:
-                SessionStore = import_module(
-                    settings.SESSION_ENGINE
-                ).SessionStore
-                sesion = SessionStore(
-                    session_key=valor
-                )
-                id_usuario: int = sesion.load().get(
-                    "_auth_user_id", "0"
-                )
-                if id_usuario == "0":
-                    usuario = "anonymous user"
-                    break
-                else:
-                    usuario = f'user {id_usuario}'
-                    break
-        else:
-            usuario = "anonymous user"
-        self.server.log_action(
-            "websocket",
+        self.registrar_accion(
             "rejected",
             {
                 "path": (
@@ -202,10 +94,40 @@ class ProtocoloWebSocket(WebSocketProtocol):
                     if self.client_addr else None
                 ),
                 "browser": self.request.headers["user-agent"],
-                "user": usuario,
             },
         )
 
+    def clave_sesion(self: Self) -> Optional[str]:
+        for clave, igual, valor in (
+            [
+                cookie.partition("=") for cookie
+                in self.request.headers.get("cookie", "").split("; ")
+            ]
+        ):
+            if clave == settings.SESSION_COOKIE_NAME:
+                return valor
+        return None
+
+    def registrar_accion(
+        self: Self,
+        accion: str,
+        detalles: dict[str, Any]
+    ) -> None:
+        self.server.sesiones.resolver(self.clave_sesion()).addCallback(
+            self.registrar_usuario,
+            accion,
+            detalles
+        )
+
+    def registrar_usuario(
+        self: Self,
+        usuario: str,
+        accion: str,
+        detalles: dict[str, Any]
+    ) -> None:
+        detalles["user"] = usuario
+        self.server.log_action("websocket", accion, detalles)
+
 
 class FabricaWebSocket(WebSocketFactory):
     protocol: type[ProtocoloWebSocket] = ProtocoloWebSocket
@@ -0,0 +1,135 @@
+from reportlab.lib.pagesizes import A4
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Resolución de archivo: las páginas de texto se guardan en blanco y
+# negro (CCITT G4) y las que tienen firmas, en color (JPEG)
+DPI_TEXTO: int = 300
+DPI_FIRMAS: int = 150
+CALIDAD_JPEG: int = 60
+# Inclinación máxima que se corrige, en grados
+INCLINACION_MAXIMA: float = 5.0
+
+
+def puntaje_inclinacion(tinta: np.ndarray, angulo: float) -> float:
+    altura, base = tinta.shape
+    girada: np.ndarray = cv2.warpAffine(
+        tinta,
+        cv2.getRotationMatrix2D((base/2, altura/2), angulo, 1.0),
+        (base, altura)
+    )
+    # las líneas de texto horizontales concentran la tinta en filas
+    return float(np.var(girada.sum(axis=1)))
+
+
+def inclinacion(gris: np.ndarray) -> float:
+    '''
+    Ángulo, en grados, que endereza las líneas de texto de la página
+    '''
+    escala: float = 800 / gris.shape[1]
+    tinta: np.ndarray = cv2.threshold(
+        cv2.resize(gris, None, fx=escala, fy=escala,
+                   interpolation=cv2.INTER_AREA),
+        0,
+        1,
+        cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU
+    )[1].astype(np.float32)
+    mejor: float = max(
+        np.arange(-INCLINACION_MAXIMA, INCLINACION_MAXIMA + 0.25, 0.5),
+        key=lambda angulo: puntaje_inclinacion(tinta, angulo)
+    )
+    return float(
+        max(
+            np.arange(mejor - 0.5, mejor + 0.55, 0.1),
+            key=lambda angulo: puntaje_inclinacion(tinta, angulo)
+        )
+    )
+
+
+def enderezar(imagen: np.ndarray, angulo: float) -> np.ndarray:
+    if abs(angulo) < 0.05:
+        return imagen
+    altura, base = imagen.shape[:2]
+    return cv2.warpAffine(
+        imagen,
+        cv2.getRotationMatrix2D((base/2, altura/2), angulo, 1.0),
+        (base, altura),
+        flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_CONSTANT,
+        borderValue=(255, 255, 255)
+    )
+
+
+def escalar(
+    imagen: np.ndarray,
+    resolucion: float,
+    destino: int
+) -> tuple[np.ndarray, float]:
+    if resolucion <= destino:
+        return imagen, resolucion
+    factor: float = destino / resolucion
+    return cv2.resize(
+        imagen,
+        None,
+        fx=factor,
+        fy=factor,
+        interpolation=cv2.INTER_AREA
+    ), destino
+
+
+def pagina_archivo(
+    imagen: np.ndarray,
+    con_firmas: bool
+) -> tuple[Image.Image, float]:
+    '''
+    Página enderezada y reducida para archivar, con su resolución.
+    imagen es el escaneo RGB; se supone de ancho A4
+    '''
+    resolucion: float = imagen.shape[1] / (A4[0] / 72)
+    gris: np.ndarray = cv2.cvtColor(imagen, cv2.COLOR_RGB2GRAY)
+    angulo: float = inclinacion(gris)
+    if con_firmas:
+        color, resolucion = escalar(
+            enderezar(imagen, angulo), resolucion, DPI_FIRMAS
+        )
+        return Image.fromarray(color), resolucion
+    gris, resolucion = escalar(enderezar(gris, angulo), resolucion, DPI_TEXTO)
+    binaria: np.ndarray = cv2.adaptiveThreshold(
+        gris,
+        255,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY,
+        31,
+        15
+    )
+    return Image.fromarray(binaria).convert('1', dither=Image.Dither.NONE), \
+        resolucion
+
+
+def archivar(
+    rutas: list[str],
+    paginas_firmas: set[int],
+    destino: str
+) -> None:
+    '''
+    Escribe en destino el PDF de los escaneos, agregando las páginas de
+    a una para no tener más de un escaneo decodificado en memoria
+    '''
+    for indice, ruta in enumerate(rutas):
+        with Image.open(ruta) as escaneo:
+            imagen: np.ndarray = np.asarray(escaneo.convert('RGB'))
+        pagina, resolucion = pagina_archivo(
+            imagen, indice + 1 in paginas_firmas
+        )
+        opciones: dict[str, int] = (
+            {} if pagina.mode == '1' else {'quality': CALIDAD_JPEG}
+        )
+        pagina.save(
+            destino,
+            format='pdf',
+            resolution=resolucion,
+            append=indice > 0,
+            **opciones
+        )
@@ -0,0 +1,303 @@
+from django.contrib.auth.models import User
+
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus.paragraph import Paragraph
+
+import cv2
+import json
+import numpy as np
+import os
+import random
+from typing import Any
+
+from .models import FirmaOrden
+from .rasterizacion import Rasterizador
+from .verificacion import rectangulo
+
+from gesservorconv.report_lab import Documento, bloque_firma
+
+# Variantes de escaneo y si la verificación debe aprobarlas
+VARIANTES: dict[str, bool] = {
+    'correcta': True,
+    'rotada': True,
+    'ruido': True,
+    'sin_firma': False,
+    'pagina_incorrecta': False
+}
+
+PALABRAS: tuple[str, ...] = (
+    'servicio', 'técnico', 'facultad', 'comitente', 'responsable',
+    'análisis', 'muestra', 'ensayo', 'laboratorio', 'informe', 'plazo',
+    'condiciones', 'entrega', 'resultado', 'convenio', 'arancel',
+    'química', 'física', 'material', 'equipo', 'calibración', 'medición',
+    'procedimiento', 'norma', 'vigente', 'cliente', 'pago', 'factura',
+    'documentación', 'firma', 'orden', 'secretaría', 'extensión',
+    'vinculación', 'tecnológica', 'universidad', 'nacional', 'misiones',
+    'posadas', 'provincia', 'expediente', 'presupuesto', 'compromiso',
+    'obligaciones', 'partes', 'acuerdo', 'cláusula', 'anexo', 'días',
+    'hábiles', 'recepción', 'el', 'la', 'los', 'las', 'de', 'del', 'en',
+    'con', 'por', 'para', 'que', 'se', 'una', 'un', 'al', 'y', 'o'
+)
+NOMBRES: tuple[str, ...] = (
+    'Ana', 'Carlos', 'Lucía', 'Martín', 'Sofía', 'Diego', 'Valeria',
+    'Javier', 'Paula', 'Hernán'
+)
+APELLIDOS: tuple[str, ...] = (
+    'Gómez', 'Fernández', 'López', 'Martínez', 'Benítez', 'Acosta',
+    'Romero', 'Sosa', 'Duarte', 'Giménez'
+)
+# Posición (x, y) de los bloques de firma de la última página, como
+# los ubica VistaOrdenServicio: comitente, responsable y secretario
+BLOQUES: tuple[tuple[float, float], ...] = (
+    (45*mm, 130*mm),
+    (125*mm, 130*mm),
+    (85*mm, 70*mm)
+)
+
+
+def parrafo(azar: random.Random) -> str:
+    palabras: list[str] = azar.choices(PALABRAS, k=azar.randint(40, 90))
+    palabras[0] = palabras[0].capitalize()
+    return " ".join(palabras) + "."
+
+
+def generar_orden(
+    ruta: str,
+    azar: random.Random,
+    paginas: int,
+    numero: int
+) -> list[dict[str, Any]]:
+    '''
+    Escribe en ruta una orden de servicio sintética con el mismo
+    generador que las reales y devuelve sus firmas, en la forma
+    guardada en corpus.json
+    '''
+    canvas: Documento = Documento(
+        ruta,
+        pagesize=A4,
+        bottomup=1,
+        pageCompression=1,
+        initialFontName='Nimbus Sans L Regular',
+        initialFontSize=11
+    )
+    estilo_parrafo: ParagraphStyle = ParagraphStyle(
+        name='cuerpo',
+        fontName='Nimbus Sans L Regular',
+        fontSize=11,
+        leading=14,
+        leftIndent=30*mm,
+        rightIndent=20*mm,
+        alignment=TA_JUSTIFY
+    )
+    firmas: list[dict[str, Any]] = []
+    for pagina in range(1, paginas+1):
+        canvas.setFont('Nimbus Sans L Regular', 14)
+        canvas.drawCentredString(110*mm, 277*mm, 'ORDEN DE SERVICIOS')
+        canvas.setFont('Nimbus Sans L Regular', 12)
+        canvas.drawString(30*mm, 270*mm, f'ORDEN DE SERVICIO N° {numero}')
+        y: float = 262*mm
+        # la última página deja lugar para los bloques de firma
+        limite: float = 150*mm if pagina == paginas else 20*mm
+        while True:
+            texto: Paragraph = Paragraph(parrafo(azar), estilo_parrafo)
+            (_, alto) = texto.wrapOn(canvas, A4[0], y)
+            if y - alto < limite:
+                break
+            texto.drawOn(canvas, 0, y - alto)
+            y -= alto + 4*mm
+        if pagina == paginas:
+            for coord_x, coord_y in BLOQUES:
+                bloque_firma().drawOn(canvas, coord_x, coord_y - 50*mm)
+                firmas.append(
+                    {
+                        'id_firma_orden': len(firmas) + 1,
+                        'pagina_firma': pagina,
+                        'coord_x_firma': coord_x,
+                        'coord_y_firma': coord_y,
+                        'first_name': azar.choice(NOMBRES),
+                        'last_name': azar.choice(APELLIDOS)
+                    }
+                )
+        canvas.showPage()
+    canvas.save()
+    return firmas
+
+
+def firmas_orden(entrada: dict[str, Any]) -> list[FirmaOrden]:
+    '''
+    Firmas sin guardar de una orden del corpus, con sus firmantes
+    '''
+    return [
+        FirmaOrden(
+            id_firma_orden=firma['id_firma_orden'],
+            pagina_firma=firma['pagina_firma'],
+            coord_x_firma=firma['coord_x_firma'],
+            coord_y_firma=firma['coord_y_firma'],
+            usuario_firmante=User(
+                first_name=firma['first_name'],
+                last_name=firma['last_name']
+            )
+        )
+        for firma in entrada['firmas']
+    ]
+
+
+def firmar(
+    imagen: np.ndarray,
+    firma: FirmaOrden,
+    azar: random.Random,
+    dpi: int
+) -> None:
+    # trazos de tinta dentro del recuadro "Firma" del bloque
+    y0, y1, x0, x1 = rectangulo(imagen.shape, firma, 6, 30, 6, 44)
+    for _ in range(azar.randint(2, 4)):
+        cantidad: int = azar.randint(8, 16)
+        base: np.ndarray = np.linspace(
+            x0 + azar.uniform(0, 0.3)*(x1 - x0),
+            x1 - azar.uniform(0, 0.3)*(x1 - x0),
+            cantidad
+        )
+        angulos: np.ndarray = azar.uniform(0, 2*np.pi) + np.linspace(
+            0, azar.uniform(2, 6)*np.pi, cantidad
+        )
+        altura: np.ndarray = y0 + (y1 - y0)*(0.5 + 0.35*np.sin(angulos))
+        puntos: np.ndarray = np.column_stack((base, altura)).astype(np.int32)
+        cv2.polylines(
+            imagen,
+            [puntos],
+            False,
+            (120, 40, 20),
+            max(2, dpi // 100),
+            cv2.LINE_AA
+        )
+
+
+def rotar(imagen: np.ndarray, grados: float) -> np.ndarray:
+    altura, base = imagen.shape[:2]
+    return cv2.warpAffine(
+        imagen,
+        cv2.getRotationMatrix2D((base/2, altura/2), grados, 1.0),
+        (base, altura),
+        flags=cv2.INTER_LINEAR,
+        borderValue=(255, 255, 255)
+    )
+
+
+def ensuciar(imagen: np.ndarray, generador: np.random.Generator) -> np.ndarray:
+    ruidosa: np.ndarray = cv2.GaussianBlur(
+        np.clip(
+            imagen.astype(np.int16)
+            + generador.normal(0, 12, imagen.shape).astype(np.int16),
+            0,
+            255
+        ).astype(np.uint8),
+        (3, 3),
+        0
+    )
+    # compresión JPEG como la de un escáner de oficina
+    _, codificada = cv2.imencode(
+        '.jpg', ruidosa, [cv2.IMWRITE_JPEG_QUALITY, 40]
+    )
+    return cv2.imdecode(codificada, cv2.IMREAD_COLOR)
+
+
+def escanear(
+    original: Rasterizador,
+    ajena: Rasterizador,
+    firmas: list[FirmaOrden],
+    variante: str,
+    carpeta: str,
+    azar: random.Random,
+    generador: np.random.Generator
+) -> None:
+    '''
+    Guarda en carpeta los escaneos de la variante, con los nombres que
+    usa VistaSubidaOrden
+    '''
+    os.makedirs(carpeta, exist_ok=True)
+    erronea: int = azar.randrange(len(original))
+    omitida: FirmaOrden = azar.choice(firmas)
+    for indice in range(len(original)):
+        fuente: Rasterizador = (
+            ajena
+            if variante == 'pagina_incorrecta' and indice == erronea
+            else original
+        )
+        imagen: np.ndarray = cv2.cvtColor(
+            fuente.pagina(indice), cv2.COLOR_RGB2BGR
+        )
+        for firma in firmas:
+            if firma.pagina_firma != indice + 1:
+                continue
+            if variante == 'sin_firma' and firma is omitida:
+                continue
+            firmar(imagen, firma, azar, original.dpi)
+        grados: float = (
+            azar.choice((-1, 1))*azar.uniform(3, 5)
+            if variante == 'rotada'
+            else azar.uniform(-0.5, 0.5)
+        )
+        imagen = rotar(imagen, grados)
+        if variante == 'ruido':
+            imagen = ensuciar(imagen, generador)
+        cv2.imwrite(os.path.join(carpeta, f"escaneo{indice+1}.png"), imagen)
+
+
+def generar_corpus(
+    carpeta: str,
+    ordenes: int,
+    paginas: int,
+    semilla: int,
+    dpi: int
+) -> list[dict[str, Any]]:
+    '''
+    Genera las órdenes sintéticas y todas sus variantes de escaneo.
+    El índice queda en corpus.json, para reutilizar el corpus
+    '''
+    azar: random.Random = random.Random(semilla)
+    generador: np.random.Generator = np.random.default_rng(semilla)
+    indice: list[dict[str, Any]] = []
+    for numero in range(1, ordenes+1):
+        directorio: str = os.path.join(carpeta, f"orden{numero}")
+        os.makedirs(directorio, exist_ok=True)
+        entrada: dict[str, Any] = {
+            'orden': os.path.join(directorio, 'orden.pdf'),
+            'paginas': paginas,
+            'variantes': {}
+        }
+        entrada['firmas'] = generar_orden(
+            entrada['orden'], azar, paginas, numero
+        )
+        # misma plantilla y otro texto, para la página equivocada
+        generar_orden(
+            os.path.join(directorio, 'ajena.pdf'), azar, paginas, numero
+        )
+        original: Rasterizador = Rasterizador(entrada['orden'], dpi)
+        ajena: Rasterizador = Rasterizador(
+            os.path.join(directorio, 'ajena.pdf'), dpi
+        )
+        for variante in VARIANTES:
+            entrada['variantes'][variante] = os.path.join(
+                directorio, variante
+            )
+            escanear(
+                original,
+                ajena,
+                firmas_orden(entrada),
+                variante,
+                entrada['variantes'][variante],
+                azar,
+                generador
+            )
+        indice.append(entrada)
+    with open(os.path.join(carpeta, 'corpus.json'), 'w') as f:
+        json.dump(indice, f, indent=2)
+    return indice
+
+
+def cargar_corpus(carpeta: str) -> list[dict[str, Any]]:
+    with open(os.path.join(carpeta, 'corpus.json')) as f:
+        return json.load(f)
@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+from typing import Optional
+
+NITIDEZ: np.ndarray = np.array(
+    [[0, -1, 0], [-1, 5, -1], [0, -1, 0]]
+)
+
+# Parámetros constantes para firma
+CONSTANTE_1: int = 125
+CONSTANTE_2: int = 100
+CONSTANTE_3: int = 150
+CONSTANTE_4: int = 85
+# 0.09 es constante de si hay una firma
+UMBRAL_FIRMA: float = 0.09
+
+
+def error_normalizado(verdadera: np.ndarray, prueba: np.ndarray) -> float:
+    # igual a normalized_root_mse de scikit-image (normalización euclídea)
+    verdadera = verdadera.astype(np.float64)
+    norma: float = float(np.linalg.norm(verdadera))
+    if norma == 0:
+        return float('inf')
+    return float(
+        np.linalg.norm(verdadera - prueba.astype(np.float64)) / norma
+    )
+
+
+def trazos(escaneo: np.ndarray) -> np.ndarray:
+    '''
+    Máscara de los componentes conexos del recorte con tamaño de trazo,
+    descartando puntos sueltos y manchas o líneas grandes
+    '''
+    binaria: np.ndarray = cv2.adaptiveThreshold(
+        cv2.medianBlur(
+            cv2.filter2D(
+                cv2.cvtColor(escaneo, cv2.COLOR_BGR2GRAY),
+                -1,
+                NITIDEZ
+            ),
+            7
+        ),
+        255,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY,
+        17,
+        2
+    )
+    cantidad, etiquetas, estadisticas, centroides = \
+        cv2.connectedComponentsWithStats(
+            (binaria <= binaria.mean()).astype(np.uint8),
+            connectivity=8
+        )
+    areas: np.ndarray = estadisticas[:, cv2.CC_STAT_AREA].copy()
+    areas[0] = 0
+    medibles: np.ndarray = areas[areas > 10]
+    if not len(medibles):
+        return np.zeros(binaria.shape, dtype=bool)
+    minimo: float = (
+        (medibles.mean()/CONSTANTE_1)*CONSTANTE_2
+    )+CONSTANTE_3
+    maximo: float = minimo*CONSTANTE_4
+    conservar: np.ndarray = (areas >= minimo) & (areas <= maximo)
+    conservar[0] = False
+    return conservar[etiquetas]
+
+
+def hay_firma(
+    original: np.ndarray,
+    escaneo: np.ndarray,
+    depuracion: Optional[str] = None
+) -> bool:
+    '''
+    original es el recorte en grises de la orden sin firmar, ya
+    redimensionado; escaneo es el mismo recorte en el escaneo alineado.
+    Si se indica depuracion, se guardan las imágenes intermedias
+    con ese prefijo
+    '''
+    mascara: np.ndarray = trazos(escaneo)
+    version: np.ndarray = np.where(mascara, 0, 255).astype(np.uint8)
+    comparada: np.ndarray = cv2.resize(
+        cv2.threshold(
+            cv2.medianBlur(version, 7),
+            175,
+            255,
+            cv2.THRESH_BINARY
+        )[1],
+        (1200, 900)
+    )
+    if depuracion is not None:
+        cv2.imwrite(f"{depuracion}-pre_version.png", 255 - version)
+        cv2.imwrite(f"{depuracion}-version.png", version)
+        cv2.imwrite(f"{depuracion}-comparada.png", comparada)
+    return error_normalizado(comparada, original) >= UMBRAL_FIRMA
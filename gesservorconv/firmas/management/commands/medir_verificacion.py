@@ -0,0 +1,257 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+import cv2
+import json
+import numpy as np
+import os
+from PIL import Image
+from prometheus_client import REGISTRY
+import resource
+import tempfile
+from time import perf_counter
+from typing import Any, Optional
+
+from ...corpus import VARIANTES, cargar_corpus, firmas_orden, generar_corpus
+from ...models import FirmaOrden
+from ...rasterizacion import Rasterizador
+from ...referencias import construir_referencia
+from ...verificacion import (
+    error_reproyeccion,
+    homografia_completa,
+    homografia_piramidal,
+    PaginaReferencia,
+    rectangulo,
+    verificar_pagina
+)
+
+ETAPAS: tuple[str, ...] = (
+    'rasterizacion', 'referencia', 'alineacion', 'ocr', 'deteccion'
+)
+
+
+def acumulado(etapa: str) -> float:
+    return REGISTRY.get_sample_value(
+        'gesservorconv_verification_stage_duration_seconds_sum',
+        {'etapa': etapa}
+    ) or 0.0
+
+
+def memoria_maxima() -> float:
+    # ru_maxrss está en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def paridad(
+    referencia: PaginaReferencia,
+    imagen: Image.Image,
+    firmas: list[FirmaOrden]
+) -> Optional[float]:
+    '''
+    Error de reproyección de los bloques de firma entre la homografía a
+    resolución completa y la piramidal, o None si alguna no se estima
+    '''
+    im2: np.ndarray = cv2.cvtColor(np.asarray(imagen), cv2.COLOR_BGR2RGB)
+    bloques: list[tuple[int, int, int, int]] = [
+        rectangulo(referencia.forma, firma, -2.5, 40, -2.5, 52.5)
+        for firma in firmas
+    ]
+    completa: Optional[np.ndarray] = homografia_completa(referencia, im2)
+    piramidal: Optional[np.ndarray] = homografia_piramidal(
+        referencia, im2, bloques
+    )
+    if completa is None or piramidal is None:
+        return None
+    return error_reproyeccion(referencia, completa, piramidal, bloques)
+
+
+def percentil(valores: list[float], fraccion: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados: list[float] = sorted(valores)
+    return ordenados[min(int(fraccion*len(ordenados)), len(ordenados) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un corpus sintético de órdenes escaneadas y mide la'
+        ' latencia por etapa, la memoria y la exactitud de la verificación'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--ordenes', type=int, default=5)
+        parser.add_argument('--paginas', type=int, default=2)
+        parser.add_argument('--semilla', type=int, default=0)
+        parser.add_argument(
+            '--dpi',
+            type=int,
+            default=300,
+            help='Resolución de los escaneos sintéticos'
+        )
+        parser.add_argument(
+            '--corpus',
+            help=(
+                'Carpeta del corpus; si ya tiene corpus.json se reutiliza'
+                ' en lugar de generarlo'
+            )
+        )
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        carpeta: str = options['corpus'] or tempfile.mkdtemp(
+            prefix='corpus_verificacion_'
+        )
+        inicio: float = perf_counter()
+        try:
+            corpus: list[dict[str, Any]] = cargar_corpus(carpeta)
+        except FileNotFoundError:
+            corpus = generar_corpus(
+                carpeta,
+                options['ordenes'],
+                options['paginas'],
+                options['semilla'],
+                options['dpi']
+            )
+        generacion: float = perf_counter() - inicio
+        memoria_corpus: float = memoria_maxima()
+        muestras: dict[str, list[float]] = {etapa: [] for etapa in ETAPAS}
+        aciertos: dict[str, list[int]] = {
+            variante: [0, 0] for variante in VARIANTES
+        }
+        falsos_aceptados: int = 0
+        falsos_rechazados: int = 0
+        # milímetros, sólo en los escaneos que deben aprobarse
+        reproyeccion: list[float] = []
+        sin_paridad: int = 0
+        for entrada in corpus:
+            firmas: list[FirmaOrden] = firmas_orden(entrada)
+            referencias: list[PaginaReferencia] = []
+            # rasterización de la orden original, como en producción
+            rasterizador: Rasterizador = Rasterizador(entrada['orden'])
+            for indice in range(len(rasterizador)):
+                antes: dict[str, float] = {
+                    etapa: acumulado(etapa) for etapa in ETAPAS
+                }
+                pagina: np.ndarray = rasterizador.pagina(indice)
+                referencias.append(
+                    construir_referencia(
+                        pagina,
+                        cv2.cvtColor(pagina, cv2.COLOR_RGB2BGR),
+                        [
+                            firma for firma in firmas
+                            if firma.pagina_firma == indice + 1
+                        ]
+                    )
+                )
+                for etapa in ('rasterizacion', 'referencia'):
+                    muestras[etapa].append(acumulado(etapa) - antes[etapa])
+            for variante, esperado in VARIANTES.items():
+                motivo: Optional[str] = None
+                for indice, referencia in enumerate(referencias):
+                    antes = {etapa: acumulado(etapa) for etapa in ETAPAS}
+                    with Image.open(
+                        os.path.join(
+                            entrada['variantes'][variante],
+                            f"escaneo{indice+1}.png"
+                        )
+                    ) as imagen:
+                        firmas_pagina: list[FirmaOrden] = [
+                            firma for firma in firmas
+                            if firma.pagina_firma == indice + 1
+                        ]
+                        motivo = verificar_pagina(
+                            referencia,
+                            imagen,
+                            firmas_pagina,
+                            entrada['variantes'][variante],
+                            indice
+                        )
+                        if esperado:
+                            error: Optional[float] = paridad(
+                                referencia, imagen, firmas_pagina
+                            )
+                            if error is None:
+                                sin_paridad += 1
+                            else:
+                                reproyeccion.append(error)
+                    for etapa in ('alineacion', 'ocr', 'deteccion'):
+                        if acumulado(etapa) > antes[etapa]:
+                            muestras[etapa].append(
+                                acumulado(etapa) - antes[etapa]
+                            )
+                    if motivo is not None:
+                        break
+                aprobada: bool = motivo is None
+                aciertos[variante][1] += 1
+                if aprobada == esperado:
+                    aciertos[variante][0] += 1
+                elif aprobada:
+                    falsos_aceptados += 1
+                else:
+                    falsos_rechazados += 1
+        resultado: dict[str, Any] = {
+            'corpus': carpeta,
+            'ordenes': len(corpus),
+            'generacion_segundos': generacion,
+            'etapas': {
+                etapa: {
+                    'muestras': len(valores),
+                    'total': sum(valores),
+                    'p50': percentil(valores, 0.5),
+                    'p95': percentil(valores, 0.95),
+                    'maximo': max(valores, default=0.0)
+                }
+                for etapa, valores in muestras.items()
+            },
+            'memoria_maxima_mib': {
+                'corpus': memoria_corpus,
+                'total': memoria_maxima()
+            },
+            'exactitud': {
+                variante: aciertos[variante][0] / aciertos[variante][1]
+                for variante in VARIANTES
+                if aciertos[variante][1]
+            },
+            'falsos_aceptados': falsos_aceptados,
+            'falsos_rechazados': falsos_rechazados,
+            'reproyeccion_mm': {
+                'muestras': len(reproyeccion),
+                'sin_homografia': sin_paridad,
+                'p50': percentil(reproyeccion, 0.5),
+                'p95': percentil(reproyeccion, 0.95),
+                'maximo': max(reproyeccion, default=0.0)
+            }
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(resultado, indent=2))
+            return
+        self.stdout.write(f"Corpus: {carpeta} ({len(corpus)} órdenes)")
+        self.stdout.write(
+            f"{'etapa':<14}{'n':>6}{'p50 (s)':>10}{'p95 (s)':>10}"
+            f"{'máx (s)':>10}{'total (s)':>11}"
+        )
+        for etapa, datos in resultado['etapas'].items():
+            self.stdout.write(
+                f"{etapa:<14}{datos['muestras']:>6}{datos['p50']:>10.3f}"
+                f"{datos['p95']:>10.3f}{datos['maximo']:>10.3f}"
+                f"{datos['total']:>11.2f}"
+            )
+        self.stdout.write(
+            'Memoria máxima: '
+            f"{resultado['memoria_maxima_mib']['total']:.0f} MiB"
+            f" (tras generar el corpus:"
+            f" {resultado['memoria_maxima_mib']['corpus']:.0f} MiB)"
+        )
+        for variante, exactitud in resultado['exactitud'].items():
+            self.stdout.write(f"{variante:<18}{exactitud:>8.1%}")
+        self.stdout.write(
+            f"Falsos aceptados: {falsos_aceptados},"
+            f" falsos rechazados: {falsos_rechazados}"
+        )
+        datos = resultado['reproyeccion_mm']
+        self.stdout.write(
+            'Reproyección completa/piramidal de los bloques de firma:'
+            f" p50 {datos['p50']:.2f} mm, p95 {datos['p95']:.2f} mm,"
+            f" máx {datos['maximo']:.2f} mm"
+            f" ({datos['muestras']} páginas,"
+            f" {datos['sin_homografia']} sin homografía)"
+        )
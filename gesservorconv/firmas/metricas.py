@@ -0,0 +1,15 @@
+from prometheus_client import Histogram
+
+
+DURACION_OCR: Histogram = Histogram(
+    'gesservorconv_ocr_duration_seconds',
+    'Duración del reconocimiento de texto de las verificaciones',
+    ['fase'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+DURACION_ETAPA: Histogram = Histogram(
+    'gesservorconv_verification_stage_duration_seconds',
+    'Duración de cada etapa de la verificación de órdenes, por página',
+    ['etapa'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('firmas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificacionOrden',
+            fields=[
+                ('id_verificacion', models.BigAutoField(primary_key=True, serialize=False, verbose_name='Identificador de Verificación de Orden')),
+                ('estado_verificacion', models.CharField(default='pendiente', max_length=16, verbose_name='Estado de Verificación')),
+                ('carpeta_verificacion', models.CharField(verbose_name='Carpeta de Escaneos')),
+                ('paginas_verificacion', models.PositiveSmallIntegerField(verbose_name='Cantidad de Páginas a verificar')),
+                ('paginas_verificadas', models.PositiveSmallIntegerField(default=0, verbose_name='Cantidad de Páginas verificadas')),
+                ('mensaje_verificacion', models.TextField(default=None, null=True, verbose_name='Resultado de Verificación')),
+                ('tarea_verificacion', models.CharField(default=None, max_length=255, null=True, verbose_name='Identificador de Tarea de Verificación')),
+                ('tiempo_creacion_verificacion', models.DateTimeField(auto_now_add=True, verbose_name='Tiempo de Creación de Verificación')),
+                ('tiempo_fin_verificacion', models.DateTimeField(default=None, null=True, verbose_name='Tiempo de Finalización de Verificación')),
+                ('orden_servicio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='verificaciones_orden', to='firmas.ordenservicio', verbose_name='Orden de Servicio verificada')),
+                ('usuario_verificacion', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL, verbose_name='Usuario que subió la Orden')),
+            ],
+            options={
+                'verbose_name': 'verificación de orden',
+                'verbose_name_plural': 'verificaciones de órdenes',
+                'db_table': 'verificaciones_ordenes',
+                'indexes': [models.Index(fields=['orden_servicio', 'estado_verificacion'], name='verificacion_orden_estado_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:00
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+import django.db.models.deletion
+
+
+def forwards_func(
+    apps: Apps,
+    schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    # Las firmas existentes guardan el documento completo
+    OrdenServicio = apps.get_model('firmas', 'OrdenServicio')
+    FirmaOrden = apps.get_model('firmas', 'FirmaOrden')
+    db_alias: str = schema_editor.connection.alias
+    for orden_servicio in OrdenServicio.objects.using(db_alias).all():
+        firmas = FirmaOrden.objects.using(db_alias).filter(
+            orden_firmada=orden_servicio,
+            tiempo_firma__isnull=False
+        ).order_by('tiempo_firma')
+        firma = None
+        for revision, firma in enumerate(firmas, start=1):
+            firma.revision_firma = revision
+            firma.save(update_fields=['revision_firma'])
+        if firma is not None:
+            orden_servicio.ultima_firma_orden = firma
+            orden_servicio.save(update_fields=['ultima_firma_orden'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firmas', '0002_verificacion_orden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='firmaorden',
+            name='revision_firma',
+            field=models.PositiveSmallIntegerField(default=None, null=True, verbose_name='Revisión de Orden creada por la Firma'),
+        ),
+        migrations.AddField(
+            model_name='firmaorden',
+            name='incremental_firma',
+            field=models.BooleanField(default=False, verbose_name='Si el Documento firmado guarda sólo lo agregado'),
+        ),
+        migrations.AddField(
+            model_name='ordenservicio',
+            name='ultima_firma_orden',
+            field=models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='firmas.firmaorden', verbose_name='Última Firma de Orden de Servicio'),
+        ),
+        migrations.RunPython(
+            forwards_func,
+            migrations.RunPython.noop
+        ),
+    ]
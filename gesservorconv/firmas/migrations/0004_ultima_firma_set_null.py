@@ -0,0 +1,19 @@
+# Generated by Django 4.2.11 on 2026-10-18 18:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firmas', '0003_revision_firma'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ordenservicio',
+            name='ultima_firma_orden',
+            field=models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='firmas.firmaorden', verbose_name='Última Firma de Orden de Servicio'),
+        ),
+    ]
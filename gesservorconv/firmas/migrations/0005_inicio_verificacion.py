@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firmas', '0004_ultima_firma_set_null'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificacionorden',
+            name='tiempo_inicio_verificacion',
+            field=models.DateTimeField(default=None, null=True, verbose_name='Tiempo de Inicio de Verificación'),
+        ),
+    ]
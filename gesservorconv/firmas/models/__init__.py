@@ -1,3 +1,4 @@
 from .convenio import Convenio
 from .orden_servicio import OrdenServicio
 from .firma_orden import FirmaOrden
+from .verificacion_orden import VerificacionOrden
@@ -44,6 +44,17 @@ class FirmaOrden(models.Model):
             upload_to='ordenes_parciales/',
             null=True
         )
+    revision_firma: models.PositiveSmallIntegerField = \
+        models.PositiveSmallIntegerField(
+            verbose_name='Revisión de Orden creada por la Firma',
+            null=True,
+            default=None
+        )
+    incremental_firma: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si el Documento firmado guarda sólo lo agregado',
+            default=False
+        )
 
     class Meta:
         db_table: str = 'firmas_ordenes'
@@ -35,6 +35,15 @@ class OrdenServicio(models.Model):
             upload_to='ordenes_firmadas/',
             null=True
         )
+    ultima_firma_orden: models.ForeignKey = \
+        models.ForeignKey(
+            verbose_name='Última Firma de Orden de Servicio',
+            to='FirmaOrden',
+            on_delete=models.SET_NULL,
+            related_name='+',
+            null=True,
+            default=None
+        )
     ultima_accion_orden: models.DateTimeField = \
         models.DateTimeField(
             verbose_name='Tiempo de Última Acción en Orden de Servicio',
@@ -0,0 +1,92 @@
+from django.db import models
+
+from django.conf import settings
+
+
+class VerificacionOrden(models.Model):
+    estados: dict[str, str] = {
+        'pendiente': 'Pendiente',
+        'proceso': 'En proceso',
+        'aprobada': 'Aprobada',
+        'rechazada': 'Rechazada',
+        'error': 'Error'
+    }
+
+    id_verificacion: models.BigIntegerField = \
+        models.BigAutoField(
+            verbose_name='Identificador de Verificación de Orden',
+            primary_key=True
+        )
+    orden_servicio: models.ForeignKey = \
+        models.ForeignKey(
+            verbose_name='Orden de Servicio verificada',
+            to='OrdenServicio',
+            on_delete=models.CASCADE,
+            related_name='verificaciones_orden'
+        )
+    usuario_verificacion: models.ForeignKey = \
+        models.ForeignKey(
+            verbose_name='Usuario que subió la Orden',
+            to=settings.AUTH_USER_MODEL,
+            on_delete=models.PROTECT
+        )
+    estado_verificacion: models.CharField = \
+        models.CharField(
+            verbose_name='Estado de Verificación',
+            max_length=16,
+            default='pendiente'
+        )
+    carpeta_verificacion: models.CharField = \
+        models.CharField(
+            verbose_name='Carpeta de Escaneos'
+        )
+    paginas_verificacion: models.PositiveSmallIntegerField = \
+        models.PositiveSmallIntegerField(
+            verbose_name='Cantidad de Páginas a verificar'
+        )
+    paginas_verificadas: models.PositiveSmallIntegerField = \
+        models.PositiveSmallIntegerField(
+            verbose_name='Cantidad de Páginas verificadas',
+            default=0
+        )
+    mensaje_verificacion: models.TextField = \
+        models.TextField(
+            verbose_name='Resultado de Verificación',
+            null=True,
+            default=None
+        )
+    tarea_verificacion: models.CharField = \
+        models.CharField(
+            verbose_name='Identificador de Tarea de Verificación',
+            max_length=255,
+            null=True,
+            default=None
+        )
+    tiempo_creacion_verificacion: models.DateTimeField = \
+        models.DateTimeField(
+            verbose_name='Tiempo de Creación de Verificación',
+            auto_now_add=True
+        )
+    tiempo_inicio_verificacion: models.DateTimeField = \
+        models.DateTimeField(
+            verbose_name='Tiempo de Inicio de Verificación',
+            null=True,
+            default=None
+        )
+    tiempo_fin_verificacion: models.DateTimeField = \
+        models.DateTimeField(
+            verbose_name='Tiempo de Finalización de Verificación',
+            null=True,
+            default=None
+        )
+
+    class Meta:
+        db_table: str = 'verificaciones_ordenes'
+        verbose_name: str = 'verificación de orden'
+        verbose_name_plural: str = 'verificaciones de órdenes'
+        indexes: list[models.Index] = [
+            models.Index(
+                fields=['orden_servicio', 'estado_verificacion'],
+                name='verificacion_orden_estado_idx'
+            )
+        ]
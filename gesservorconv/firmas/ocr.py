@@ -0,0 +1,75 @@
+from django.conf import settings
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import os
+from PIL import Image
+from tesserocr import OEM, PSM, PyTessBaseAPI
+import threading
+from time import perf_counter
+from typing import Optional
+
+from .metricas import DURACION_OCR
+
+local: threading.local = threading.local()
+candado: threading.Lock = threading.Lock()
+grupo: Optional[ThreadPoolExecutor] = None
+
+
+def reiniciar() -> None:
+    # los hilos no sobreviven a fork (workers prefork de Celery)
+    global local, candado, grupo
+    local = threading.local()
+    candado = threading.Lock()
+    grupo = None
+
+
+os.register_at_fork(after_in_child=reiniciar)
+
+
+def motor() -> PyTessBaseAPI:
+    '''
+    Cada hilo conserva su instancia con el modelo spa ya cargado
+    '''
+    api: Optional[PyTessBaseAPI] = getattr(local, 'api', None)
+    if api is None:
+        api = PyTessBaseAPI(
+            lang='spa',
+            psm=PSM.SPARSE_TEXT_OSD,
+            oem=OEM.LSTM_ONLY
+        )
+        local.api = api
+    return api
+
+
+def hilos() -> ThreadPoolExecutor:
+    global grupo
+    with candado:
+        if grupo is None:
+            grupo = ThreadPoolExecutor(
+                max_workers=settings.OCR_HILOS,
+                thread_name_prefix='ocr'
+            )
+        return grupo
+
+
+def reconocer(imagen: np.ndarray, encolado: float) -> str:
+    inicio: float = perf_counter()
+    DURACION_OCR.labels('espera').observe(inicio - encolado)
+    api: PyTessBaseAPI = motor()
+    api.SetImage(Image.fromarray(imagen))
+    texto: str = api.GetUTF8Text()
+    api.Clear()
+    DURACION_OCR.labels('reconocimiento').observe(perf_counter() - inicio)
+    return texto
+
+
+def reconocer_lote(imagenes: list[np.ndarray]) -> list[str]:
+    encolado: float = perf_counter()
+    with DURACION_OCR.labels('lote').time():
+        return list(
+            hilos().map(
+                lambda imagen: reconocer(imagen, encolado),
+                imagenes
+            )
+        )
@@ -0,0 +1,90 @@
+from django.conf import settings
+
+from collections.abc import Iterator
+import numpy as np
+from pdf2image import pdfinfo_from_path
+import subprocess
+from typing import IO, Optional, Self
+
+from .metricas import DURACION_ETAPA
+
+
+class Rasterizador:
+    '''
+    Renderiza un PDF página por página con pdftoppm, leyendo el PPM de
+    la salida estándar directamente sobre un buffer que se reutiliza.
+    La página devuelta deja de ser válida al pedir la siguiente
+    '''
+    def __init__(
+        self: Self,
+        ruta: str,
+        dpi: Optional[int] = None
+    ) -> None:
+        self.ruta: str = ruta
+        self.dpi: int = dpi if dpi else settings.VERIFICACION_DPI
+        self.paginas: int = int(pdfinfo_from_path(ruta)['Pages'])
+        self.buffer: Optional[np.ndarray] = None
+
+    def __len__(self: Self) -> int:
+        return self.paginas
+
+    def __iter__(self: Self) -> Iterator[np.ndarray]:
+        for numero in range(self.paginas):
+            yield self.pagina(numero)
+
+    @staticmethod
+    def encabezado(salida: IO[bytes]) -> tuple[int, int]:
+        # P6 <base> <altura> <máximo>, separados por espacios
+        campos: list[bytes] = []
+        while len(campos) < 4:
+            campo: bytes = b''
+            while True:
+                caracter: bytes = salida.read(1)
+                if not caracter:
+                    raise ValueError('Salida de pdftoppm incompleta')
+                if caracter.isspace():
+                    if campo:
+                        break
+                    continue
+                campo += caracter
+            campos.append(campo)
+        if campos[0] != b'P6' or campos[3] != b'255':
+            raise ValueError('Formato de pdftoppm inesperado')
+        return int(campos[2]), int(campos[1])
+
+    def pagina(self: Self, numero: int) -> np.ndarray:
+        '''
+        Página numero (desde 0) como arreglo RGB de altura x base x 3
+        '''
+        with DURACION_ETAPA.labels('rasterizacion').time():
+            return self.leer(numero)
+
+    def leer(self: Self, numero: int) -> np.ndarray:
+        with subprocess.Popen(
+            [
+                'pdftoppm',
+                '-r', str(self.dpi),
+                '-f', str(numero + 1),
+                '-l', str(numero + 1),
+                self.ruta
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        ) as proceso:
+            forma: tuple[int, int, int] = (
+                *self.encabezado(proceso.stdout), 3
+            )
+            if self.buffer is None or self.buffer.shape != forma:
+                self.buffer = np.empty(forma, dtype=np.uint8)
+            vista: memoryview = memoryview(self.buffer).cast('B')
+            leido: int = 0
+            while leido < len(vista):
+                cantidad: int = proceso.stdout.readinto(vista[leido:])
+                if not cantidad:
+                    raise ValueError('Salida de pdftoppm incompleta')
+                leido += cantidad
+        if proceso.returncode:
+            raise subprocess.CalledProcessError(
+                proceso.returncode, 'pdftoppm'
+            )
+        return self.buffer
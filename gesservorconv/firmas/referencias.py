@@ -0,0 +1,187 @@
+from django.conf import settings
+from django.db.models import QuerySet
+
+import cv2
+import hashlib
+import json
+import numpy as np
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from .metricas import DURACION_ETAPA
+from .models import FirmaOrden, OrdenServicio
+from .rasterizacion import Rasterizador
+from .verificacion import (
+    PaginaReferencia,
+    bandas_texto,
+    caracteristicas,
+    recorte_firma,
+    reducir,
+    texto_bandas
+)
+
+# Cambiar al modificar cualquier parámetro de los artefactos guardados
+VERSION_REFERENCIAS: int = 4
+
+
+def huella_orden(orden_servicio: OrdenServicio) -> str:
+    huella = hashlib.sha256()
+    with orden_servicio.archivo_orden_original.open('rb') as documento:
+        for fragmento in documento.chunks():
+            huella.update(fragmento)
+    return huella.hexdigest()
+
+
+def carpeta_referencias(huella: str) -> str:
+    return os.path.join(
+        settings.MEDIA_ROOT,
+        'referencias_ordenes',
+        f'v{VERSION_REFERENCIAS}',
+        str(settings.VERIFICACION_DPI),
+        huella
+    )
+
+
+def construir_referencia(
+    pagina: np.ndarray,
+    imagen: np.ndarray,
+    firmas_pagina: QuerySet[FirmaOrden]
+) -> PaginaReferencia:
+    '''
+    Artefactos de una página de la orden sin firmar, en memoria.
+    pagina es la rasterización RGB e imagen su conversión a BGR
+    '''
+    with DURACION_ETAPA.labels('referencia').time():
+        puntos, descriptores = caracteristicas(imagen)
+        puntos_gruesos, descriptores_gruesos = caracteristicas(
+            reducir(imagen)
+        )
+        bandas: np.ndarray = bandas_texto(imagen)
+        return PaginaReferencia(
+            forma=imagen.shape[:2],
+            puntos=puntos,
+            descriptores=descriptores,
+            puntos_gruesos=puntos_gruesos,
+            descriptores_gruesos=descriptores_gruesos,
+            bandas=bandas,
+            texto=texto_bandas(pagina, bandas),
+            recortes={
+                firma.id_firma_orden: recorte_firma(imagen, firma)
+                for firma in firmas_pagina
+            }
+        )
+
+
+def generar_referencias(orden_servicio: OrdenServicio) -> str:
+    '''
+    Rasteriza la orden original y guarda, por página, la imagen,
+    los descriptores ORB de ambas escalas, las franjas de texto con su
+    texto reconocido y los recortes de firma.
+    Devuelve la carpeta, que se reutiliza mientras no cambie el archivo
+    '''
+    destino: str = carpeta_referencias(huella_orden(orden_servicio))
+    if os.path.isfile(os.path.join(destino, 'referencia.json')):
+        return destino
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal: str = tempfile.mkdtemp(dir=os.path.dirname(destino))
+    try:
+        firmas: QuerySet[FirmaOrden] = FirmaOrden.objects.filter(
+            orden_firmada=orden_servicio
+        )
+        rasterizador: Rasterizador = Rasterizador(
+            orden_servicio.archivo_orden_original.path
+        )
+        imagen: Optional[np.ndarray] = None
+        for indice, pagina in enumerate(rasterizador):
+            imagen = cv2.cvtColor(pagina, cv2.COLOR_RGB2BGR, dst=imagen)
+            cv2.imwrite(
+                os.path.join(temporal, f"pagina{indice+1}.png"),
+                imagen
+            )
+            referencia: PaginaReferencia = construir_referencia(
+                pagina,
+                imagen,
+                firmas.filter(pagina_firma=indice+1)
+            )
+            np.savez(
+                os.path.join(temporal, f"pagina{indice+1}-orb.npz"),
+                forma=np.array(referencia.forma),
+                puntos=referencia.puntos,
+                descriptores=referencia.descriptores,
+                puntos_gruesos=referencia.puntos_gruesos,
+                descriptores_gruesos=referencia.descriptores_gruesos,
+                bandas=referencia.bandas
+            )
+            with open(
+                os.path.join(temporal, f"pagina{indice+1}-texto.txt"),
+                "w"
+            ) as f:
+                f.write(referencia.texto)
+            for id_firma, recorte in referencia.recortes.items():
+                cv2.imwrite(
+                    os.path.join(
+                        temporal,
+                        f"pagina{indice+1}-firma{id_firma}.png"
+                    ),
+                    recorte
+                )
+        with open(os.path.join(temporal, 'referencia.json'), 'w') as f:
+            json.dump(
+                {
+                    'version': VERSION_REFERENCIAS,
+                    'dpi': rasterizador.dpi,
+                    'paginas': len(rasterizador)
+                },
+                f
+            )
+        try:
+            os.rename(temporal, destino)
+        except OSError:
+            # Otro proceso generó la misma referencia
+            shutil.rmtree(temporal, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return destino
+
+
+def cargar_referencia(
+    carpeta: str,
+    indice: int,
+    firmas_pagina: QuerySet[FirmaOrden]
+) -> PaginaReferencia:
+    with np.load(
+        os.path.join(carpeta, f"pagina{indice+1}-orb.npz")
+    ) as orb:
+        artefactos: dict[str, np.ndarray] = dict(orb)
+    with open(os.path.join(carpeta, f"pagina{indice+1}-texto.txt")) as f:
+        texto: str = f.read()
+    recortes: dict[int, np.ndarray] = {}
+    imagen: Optional[np.ndarray] = None
+    for firma in firmas_pagina:
+        ruta: str = os.path.join(
+            carpeta,
+            f"pagina{indice+1}-firma{firma.id_firma_orden}.png"
+        )
+        if os.path.isfile(ruta):
+            recortes[firma.id_firma_orden] = cv2.imread(ruta, 0)
+            continue
+        # la página completa sólo se lee si falta algún recorte
+        if imagen is None:
+            imagen = cv2.imread(
+                os.path.join(carpeta, f"pagina{indice+1}.png")
+            )
+        recortes[firma.id_firma_orden] = recorte_firma(imagen, firma)
+        cv2.imwrite(ruta, recortes[firma.id_firma_orden])
+    return PaginaReferencia(
+        forma=tuple(int(lado) for lado in artefactos['forma']),
+        puntos=artefactos['puntos'],
+        descriptores=artefactos['descriptores'],
+        puntos_gruesos=artefactos['puntos_gruesos'],
+        descriptores_gruesos=artefactos['descriptores_gruesos'],
+        bandas=artefactos['bandas'],
+        texto=texto,
+        recortes=recortes
+    )
@@ -0,0 +1,169 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.postgres.functions import TransactionNow
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+
+from cryptography.x509 import Certificate
+from datetime import datetime
+from endesive.pdf import cms
+import os
+from pytz import timezone
+from reportlab.lib.units import mm
+import shutil
+import tempfile
+from typing import Any, Optional
+
+from .models import FirmaOrden, OrdenServicio
+
+
+def ruta_revision(orden_servicio: OrdenServicio, firma: FirmaOrden) -> str:
+    return os.path.join(
+        settings.MEDIA_ROOT,
+        'revisiones_ordenes',
+        str(orden_servicio.pk),
+        f"revision{firma.revision_firma}-{firma.id_firma_orden}.pdf"
+    )
+
+
+def guardar_revision(destino: str, partes: list[FieldFile | bytes]) -> None:
+    '''
+    Arma la revisión en destino y borra las anteriores de la orden:
+    documento_vigente puede rearmar cualquiera a partir de las partes
+    '''
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(destino))
+    try:
+        with os.fdopen(descriptor, 'wb') as salida:
+            for parte in partes:
+                if isinstance(parte, bytes):
+                    salida.write(parte)
+                    continue
+                with parte.open('rb') as entrada:
+                    shutil.copyfileobj(entrada, salida)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    for nombre in os.listdir(os.path.dirname(destino)):
+        if nombre.endswith('.pdf') and nombre != os.path.basename(destino):
+            try:
+                os.remove(os.path.join(os.path.dirname(destino), nombre))
+            except FileNotFoundError:
+                pass
+
+
+def documento_vigente(orden_servicio: OrdenServicio) -> str:
+    '''
+    Ruta del PDF completo de la última revisión de la orden. Cada firma
+    guarda sólo la actualización incremental que agrega, así que la
+    revisión se arma sobre el original y queda en caché
+    '''
+    firma: Optional[FirmaOrden] = orden_servicio.ultima_firma_orden
+    if firma is None:
+        return orden_servicio.archivo_orden_original.path
+    destino: str = ruta_revision(orden_servicio, firma)
+    if os.path.isfile(destino):
+        return destino
+    partes: list[FieldFile] = []
+    for anterior in FirmaOrden.objects.filter(
+        orden_firmada=orden_servicio,
+        revision_firma__lte=firma.revision_firma
+    ).order_by('-revision_firma'):
+        partes.append(anterior.documento_firmado)
+        # Las firmas anteriores a las revisiones guardan el documento entero
+        if not anterior.incremental_firma:
+            break
+    else:
+        partes.append(orden_servicio.archivo_orden_original)
+    guardar_revision(destino, partes[::-1])
+    return destino
+
+
+def firmar_orden(
+    orden: int,
+    usuario: User,
+    p12: tuple[Optional[Any], Optional[Certificate], list[Certificate]],
+    razon: str,
+    final: bool = False
+) -> OrdenServicio:
+    '''
+    Agrega la firma digital del usuario a la última revisión de la orden.
+    Si es la firma final, el documento completo pasa a ser la orden
+    firmada
+    '''
+    with transaction.atomic():
+        # Las firmas se serializan por orden: cada una parte de la anterior
+        orden_servicio: OrdenServicio = OrdenServicio.objects \
+            .select_for_update() \
+            .select_related('ultima_firma_orden') \
+            .get(solicitud_servicio__id_solicitud=orden)
+        firma: FirmaOrden = FirmaOrden.objects \
+            .select_related('usuario_firmante') \
+            .get(orden_firmada=orden_servicio, usuario_firmante=usuario)
+        numero_firma: int = (
+            orden_servicio.ultima_firma_orden.revision_firma + 1
+            if orden_servicio.ultima_firma_orden is not None
+            else 1
+        )
+        with open(documento_vigente(orden_servicio), 'rb') as documento:
+            datos: bytes = documento.read()
+        ahora: datetime = datetime.now(timezone(settings.TIME_ZONE))
+        offset: str = ahora.astimezone().strftime("%z")
+        firmado: bytes = cms.sign(
+            datos,
+            {
+                "aligned": 0,
+                "sigflags": 3,
+                "sigflagsft": 123,
+                "sigpage": firma.pagina_firma-1,
+                "sigfield": f"Firma {numero_firma}",
+                "auto_sigfield": True,
+                "signform": False,
+                "sigandcertify": True,
+                "signaturebox": (
+                    firma.coord_x_firma + 5*mm,
+                    firma.coord_y_firma - 5*mm,
+                    firma.coord_x_firma + 45*mm,
+                    firma.coord_y_firma - 32.5*mm,
+                ),
+                "signature": f"{firma.usuario_firmante.last_name},"
+                             f" {firma.usuario_firmante.first_name}",
+                "signature_img_distort": False,
+                "contact": firma.usuario_firmante.email,
+                "location": "Posadas, Misiones, Argentina",
+                "signingdate": ahora.strftime(
+                    "D:%Y%m%d%H%M%S"
+                ) + f"{offset[:3]}'{offset[3:]}'",
+                "reason": razon
+            },
+            p12[0],
+            p12[1],
+            p12[2],
+            "sha256"
+        )
+        firma.documento_firmado = ContentFile(
+            content=firmado,
+            name=f"{ahora.isoformat()}.inc"
+        )
+        firma.revision_firma = numero_firma
+        firma.incremental_firma = True
+        firma.tiempo_firma = TransactionNow()
+        firma.save()
+        orden_servicio.ultima_firma_orden = firma
+        orden_servicio.ultima_accion_orden = TransactionNow()
+        if final:
+            orden_servicio.archivo_orden_firmada = ContentFile(
+                content=datos + firmado,
+                name=f"{ahora.isoformat()}.pdf"
+            )
+        orden_servicio.save()
+        # La revisión nueva ya está en memoria; se guarda al confirmar
+        transaction.on_commit(
+            lambda: guardar_revision(
+                ruta_revision(orden_servicio, firma),
+                [datos, firmado]
+            )
+        )
+    return orden_servicio
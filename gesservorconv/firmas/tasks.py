@@ -0,0 +1,236 @@
+from django.conf import settings
+from django.contrib.postgres.functions import TransactionNow
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import QuerySet
+from django_hosts.resolvers import reverse
+
+from asgiref.sync import async_to_sync
+from channels import DEFAULT_CHANNEL_LAYER
+from channels.layers import (
+    InMemoryChannelLayer,
+    ChannelLayerManager
+)
+from datetime import datetime
+import os
+from PIL import Image
+from pytz import timezone
+import shutil
+from typing import Any, Optional, Self
+
+from .archivo import archivar
+from .generacion import generar_orden_servicio
+from .models import FirmaOrden, OrdenServicio, VerificacionOrden
+from .referencias import cargar_referencia, generar_referencias
+from .verificacion import verificar_pagina
+
+from cuentas.models import Notificacion
+from servicios.models import Servicio
+
+from gesservorconv.celery import app
+
+
+def contexto_verificacion(
+    verificacion: VerificacionOrden
+) -> dict[str, Any]:
+    return {
+        'id_verificacion': verificacion.id_verificacion,
+        'estado': verificacion.estado_verificacion,
+        'etiqueta': VerificacionOrden.estados[
+            verificacion.estado_verificacion
+        ],
+        'paginas_verificadas': verificacion.paginas_verificadas,
+        'paginas_verificacion': verificacion.paginas_verificacion,
+        'mensaje': verificacion.mensaje_verificacion,
+        'porcentaje': int(
+            100 * verificacion.paginas_verificadas
+            / verificacion.paginas_verificacion
+        )
+    }
+
+
+def notificar_progreso(verificacion: VerificacionOrden) -> None:
+    channel_layer: InMemoryChannelLayer = \
+        ChannelLayerManager()[DEFAULT_CHANNEL_LAYER]
+    evento: dict[str, Any] = {
+        'type': 'verificacion_orden',
+        'verificacion': contexto_verificacion(verificacion)
+    }
+    async_to_sync(channel_layer.group_send)(
+        verificacion.usuario_verificacion.username,
+        evento
+    )
+
+
+def notificar_resultado(verificacion: VerificacionOrden) -> None:
+    enlace: str = 'https:' if settings.SECURE_SSL_REDIRECT else 'http:'
+    enlace += reverse(
+        viewname='firmas:verificacion_orden',
+        host=settings.DEFAULT_HOST,
+        args=[
+            verificacion.orden_servicio_id,
+            verificacion.id_verificacion
+        ]
+    )
+    mensaje: str = (
+        'Se ha aprobado la orden de servicio '
+        f'{verificacion.orden_servicio_id}'
+        if verificacion.estado_verificacion == 'aprobada'
+        else verificacion.mensaje_verificacion
+    )
+    notificacion: Notificacion = Notificacion(
+        usuario_notificacion=verificacion.usuario_verificacion,
+        titulo_notificacion='Verificación de orden',
+        contenido_notificacion=mensaje,
+        enlace_notificacion=enlace
+    )
+    notificacion.save()
+    notificar_progreso(verificacion)
+    channel_layer: InMemoryChannelLayer = \
+        ChannelLayerManager()[DEFAULT_CHANNEL_LAYER]
+    evento: dict[str, Any] = {
+        'id': notificacion.id_notificacion,
+        'type': 'verificacion_orden_finalizada',
+        'mensaje': mensaje,
+        'text': enlace
+    }
+    async_to_sync(channel_layer.group_send)(
+        verificacion.usuario_verificacion.username,
+        evento
+    )
+
+
+def finalizar_verificacion(
+    verificacion: VerificacionOrden,
+    estado: str,
+    mensaje: Optional[str]
+) -> None:
+    verificacion.estado_verificacion = estado
+    verificacion.mensaje_verificacion = mensaje
+    verificacion.tiempo_fin_verificacion = TransactionNow()
+    verificacion.save(
+        update_fields=[
+            'estado_verificacion',
+            'mensaje_verificacion',
+            'tiempo_fin_verificacion'
+        ]
+    )
+
+
+def documento_firmado(
+    rutas: list[str],
+    paginas_firmas: set[int],
+    carpeta: str
+) -> ContentFile:
+    ruta: str = os.path.join(carpeta, 'orden_firmada.pdf')
+    archivar(rutas, paginas_firmas, ruta)
+    with open(ruta, 'rb') as documento:
+        return ContentFile(
+            content=documento.read(),
+            name=(
+                f"{datetime.now(timezone(settings.TIME_ZONE)).isoformat()}"
+                ".pdf"
+            )
+        )
+
+
+@app.task(bind=True, ignore_result=True)
+def generar_orden(self: Self, orden: int) -> None:
+    orden_servicio: OrdenServicio = generar_orden_servicio(orden)
+    # Sólo las órdenes impresas se verifican contra un escaneo
+    if not orden_servicio.firma_digital:
+        generar_referencias(orden_servicio)
+
+
+@app.task(bind=True, ignore_result=True)
+def verificar_orden(self: Self, id_verificacion: int) -> None:
+    verificacion: VerificacionOrden = VerificacionOrden.objects \
+        .select_related('orden_servicio', 'usuario_verificacion') \
+        .get(id_verificacion=id_verificacion)
+    if verificacion.estado_verificacion != 'pendiente':
+        return
+    verificacion.estado_verificacion = 'proceso'
+    verificacion.tarea_verificacion = self.request.id
+    verificacion.tiempo_inicio_verificacion = TransactionNow()
+    verificacion.save(
+        update_fields=[
+            'estado_verificacion',
+            'tarea_verificacion',
+            'tiempo_inicio_verificacion'
+        ]
+    )
+    notificar_progreso(verificacion)
+    carpeta: str = verificacion.carpeta_verificacion
+    firmas: QuerySet[FirmaOrden] = FirmaOrden.objects.filter(
+        orden_firmada=verificacion.orden_servicio
+    ).select_related('usuario_firmante')
+    rutas: list[str] = [
+        os.path.join(carpeta, f"escaneo{indice+1}.png")
+        for indice in range(verificacion.paginas_verificacion)
+    ]
+    motivo: Optional[str] = None
+    try:
+        referencias: str = generar_referencias(verificacion.orden_servicio)
+        for indice, ruta in enumerate(rutas):
+            firmas_pagina: QuerySet[FirmaOrden] = firmas.filter(
+                pagina_firma=indice+1
+            )
+            with Image.open(ruta) as imagen:
+                motivo = verificar_pagina(
+                    cargar_referencia(referencias, indice, firmas_pagina),
+                    imagen,
+                    firmas_pagina,
+                    carpeta,
+                    indice
+                )
+            if motivo is not None:
+                break
+            verificacion.paginas_verificadas = indice + 1
+            verificacion.save(update_fields=['paginas_verificadas'])
+            notificar_progreso(verificacion)
+        if motivo is None:
+            archivo: ContentFile = documento_firmado(
+                rutas,
+                set(firmas.values_list('pagina_firma', flat=True)),
+                carpeta
+            )
+    except Exception:
+        finalizar_verificacion(
+            verificacion,
+            'error',
+            'No se pudo verificar la orden de servicio.'
+            ' Inténtelo de nuevo'
+        )
+        raise
+    finally:
+        # Los escaneos se borran antes de notificar el resultado
+        if not settings.VERIFICACION_DEPURACION:
+            shutil.rmtree(carpeta, ignore_errors=True)
+        if verificacion.estado_verificacion == 'error':
+            notificar_resultado(verificacion)
+    if motivo is not None:
+        finalizar_verificacion(verificacion, 'rechazada', motivo)
+        notificar_resultado(verificacion)
+        return
+    with transaction.atomic():
+        orden_servicio: OrdenServicio = OrdenServicio.objects \
+            .select_for_update() \
+            .get(pk=verificacion.orden_servicio_id)
+        if orden_servicio.archivo_orden_firmada:
+            finalizar_verificacion(
+                verificacion,
+                'rechazada',
+                'La orden de servicio ya había sido subida'
+            )
+        else:
+            orden_servicio.archivo_orden_firmada = archivo
+            orden_servicio.ultima_accion_orden = TransactionNow()
+            orden_servicio.save()
+            Servicio(
+                orden_servicio=orden_servicio,
+                convenio=None,
+                pagado=False,
+                completado=False
+            ).save()
+            finalizar_verificacion(verificacion, 'aprobada', None)
+        transaction.on_commit(lambda: notificar_resultado(verificacion))
@@ -1,6 +1,18 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
 from django.db.migrations.recorder import MigrationRecorder
+import os
+from reportlab.lib.units import mm
+import shutil
+import tempfile
 from typing import Self
+from unittest.mock import patch
+
+from .models import FirmaOrden, OrdenServicio
+from .revisiones import documento_vigente, firmar_orden, ruta_revision
+
+from solicitudes.models import SolicitudServicio
 
 
 class TestMigraciones(TestCase):
@@ -19,3 +31,75 @@ class TestMigraciones(TestCase):
 
     def test_migracion_0001_applicada(self: Self) -> None:
         self.migracion_aplicada("0001_initial")
+
+    def test_migracion_0002_applicada(self: Self) -> None:
+        self.migracion_aplicada("0002_verificacion_orden")
+
+    def test_migracion_0003_applicada(self: Self) -> None:
+        self.migracion_aplicada("0003_revision_firma")
+
+    def test_migracion_0004_applicada(self: Self) -> None:
+        self.migracion_aplicada("0004_ultima_firma_set_null")
+
+    def test_migracion_0005_applicada(self: Self) -> None:
+        self.migracion_aplicada("0005_inicio_verificacion")
+
+
+class TestRevisiones(TestCase):
+    def setUp(self: Self) -> None:
+        self.media: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, True)
+        ajustes: override_settings = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        solicitud: SolicitudServicio = SolicitudServicio.objects.create(
+            nombre_solicitud="Solicitud",
+            descripcion_solicitud="Solicitud de prueba",
+            responsables_autoadjudicados=False
+        )
+        self.orden: OrdenServicio = OrdenServicio.objects.create(
+            solicitud_servicio=solicitud,
+            numero_orden_servicio=1,
+            firma_digital=True,
+            orden_suspendida=False,
+            archivo_orden_original=ContentFile(
+                b"%PDF-1.7 original", name="original.pdf"
+            )
+        )
+        self.usuarios: list[User] = [
+            User.objects.create_user(username=f"firmante{indice}")
+            for indice in range(2)
+        ]
+        for indice, usuario in enumerate(self.usuarios):
+            FirmaOrden.objects.create(
+                orden_firmada=self.orden,
+                usuario_firmante=usuario,
+                pagina_firma=1,
+                coord_x_firma=(30 + 50*indice)*mm,
+                coord_y_firma=60*mm
+            )
+
+    def test_queda_solo_la_ultima_revision(self: Self) -> None:
+        with patch(
+            "firmas.revisiones.cms.sign",
+            side_effect=[b" firma1", b" firma2"]
+        ):
+            for usuario in self.usuarios:
+                with self.captureOnCommitCallbacks(execute=True):
+                    orden_servicio: OrdenServicio = firmar_orden(
+                        self.orden.pk, usuario, (None, None, []), "Prueba"
+                    )
+        ultima: str = ruta_revision(
+            orden_servicio, orden_servicio.ultima_firma_orden
+        )
+        self.assertEqual(
+            os.listdir(os.path.dirname(ultima)),
+            [os.path.basename(ultima)]
+        )
+        # Sin la caché, la revisión se vuelve a armar desde las partes
+        os.remove(ultima)
+        with open(documento_vigente(orden_servicio), "rb") as documento:
+            self.assertEqual(
+                documento.read(),
+                b"%PDF-1.7 original firma1 firma2"
+            )
@@ -89,4 +89,9 @@ urlpatterns: list[URLPattern] = [
         views.VistaSubidaOrden.as_view(),
         name="subir_archivo"
     ),
+    path(
+        "ayudante/ordenes/<int:orden>/verificaciones/<int:verificacion>/",
+        views.VistaVerificacionOrden.as_view(),
+        name="verificacion_orden"
+    ),
 ]
@@ -0,0 +1,496 @@
+from django.conf import settings
+from django.db.models import QuerySet
+
+import cv2
+from difflib import SequenceMatcher
+import math
+import numpy as np
+import os
+from PIL import Image
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from typing import NamedTuple, Optional
+
+from .deteccion import NITIDEZ, hay_firma
+from .metricas import DURACION_ETAPA
+from .models import FirmaOrden
+from .ocr import reconocer_lote
+
+# La homografía se estima a esta escala y se refina a resolución completa
+ESCALA_GRUESA: float = 0.25
+MARGEN_REFINAMIENTO: float = 10*mm
+TOLERANCIA_REFINAMIENTO: float = 3*mm
+MINIMO_COINCIDENCIAS: int = 12
+
+Rectangulo = tuple[int, int, int, int]
+
+
+class PaginaReferencia(NamedTuple):
+    forma: tuple[int, int]
+    puntos: np.ndarray
+    descriptores: np.ndarray
+    puntos_gruesos: np.ndarray
+    descriptores_gruesos: np.ndarray
+    bandas: np.ndarray
+    texto: str
+    recortes: dict[int, np.ndarray]
+
+
+def rectangulo(
+    forma: tuple[int, int],
+    firma: FirmaOrden,
+    arriba: float,
+    abajo: float,
+    izquierda: float,
+    derecha: float
+) -> Rectangulo:
+    altura, base = forma[:2]
+    return (
+        max(int(
+            (A4[1] + arriba*mm - firma.coord_y_firma)*altura/A4[1]
+        ), 0),
+        min(int(
+            (A4[1] + abajo*mm - firma.coord_y_firma)*altura/A4[1]
+        ), altura),
+        max(int(
+            (firma.coord_x_firma + izquierda*mm)*base/A4[0]
+        ), 0),
+        min(int(
+            (firma.coord_x_firma + derecha*mm)*base/A4[0]
+        ), base)
+    )
+
+
+def recorte(
+    imagen: np.ndarray,
+    firma: FirmaOrden,
+    arriba: float,
+    abajo: float,
+    izquierda: float,
+    derecha: float
+) -> np.ndarray:
+    y0, y1, x0, x1 = rectangulo(
+        imagen.shape, firma, arriba, abajo, izquierda, derecha
+    )
+    return imagen[y0:y1, x0:x1]
+
+
+def recorte_firma(
+    imagen: np.ndarray,
+    firma: FirmaOrden
+) -> np.ndarray:
+    return cv2.resize(
+        cv2.cvtColor(
+            recorte(imagen, firma, 1.5, 31.5, 2.5, 47.5),
+            cv2.COLOR_RGB2GRAY
+        ),
+        (1200, 900)
+    )
+
+
+def caracteristicas(
+    imagen: np.ndarray,
+    cantidad: int = 3500
+) -> tuple[np.ndarray, np.ndarray]:
+    kp, d = cv2.ORB_create(cantidad).detectAndCompute(
+        imagen if imagen.ndim == 2
+        else cv2.cvtColor(imagen, cv2.COLOR_BGR2GRAY),
+        None
+    )
+    puntos: np.ndarray = np.array(
+        [k.pt for k in kp],
+        dtype=np.float32
+    ).reshape(-1, 2)
+    return puntos, d
+
+
+def reducir(imagen: np.ndarray) -> np.ndarray:
+    return cv2.resize(
+        imagen,
+        None,
+        fx=ESCALA_GRUESA,
+        fy=ESCALA_GRUESA,
+        interpolation=cv2.INTER_AREA
+    )
+
+
+def estimar_homografia(
+    puntos1: np.ndarray,
+    d1: np.ndarray,
+    puntos2: np.ndarray,
+    d2: np.ndarray
+) -> Optional[np.ndarray]:
+    # alineación de imagen de escaneado (documentación de OpenCV)
+    if d1 is None or d2 is None:
+        return None
+    matcher: cv2.DescriptorMatcher = cv2.DescriptorMatcher_create(
+        cv2.DESCRIPTOR_MATCHER_BRUTEFORCE_HAMMING
+    )
+    matches: list[cv2.DMatch] = sorted(
+        matcher.match(d1, d2, None),
+        key=lambda x: x.distance,
+        reverse=False
+    )
+    matches = matches[:int(len(matches) * 0.1)]
+    if len(matches) < 4:
+        return None
+    h, mascara = cv2.findHomography(
+        puntos2[[match.trainIdx for match in matches]],
+        puntos1[[match.queryIdx for match in matches]],
+        cv2.RANSAC
+    )
+    return h
+
+
+def homografia_completa(
+    referencia: PaginaReferencia,
+    im2: np.ndarray
+) -> Optional[np.ndarray]:
+    '''
+    Estimación sobre la página entera a resolución completa;
+    medir_verificacion la compara con homografia_piramidal
+    '''
+    puntos2, d2 = caracteristicas(im2)
+    return estimar_homografia(
+        referencia.puntos, referencia.descriptores, puntos2, d2
+    )
+
+
+def proyectar(h: np.ndarray, puntos: np.ndarray) -> np.ndarray:
+    return cv2.perspectiveTransform(
+        puntos.reshape(-1, 1, 2).astype(np.float32), h
+    ).reshape(-1, 2)
+
+
+def refinar_homografia(
+    referencia: PaginaReferencia,
+    byn: np.ndarray,
+    h: np.ndarray,
+    regiones: list[Rectangulo]
+) -> np.ndarray:
+    escala: float = referencia.forma[0] / A4[1]
+    margen: int = int(MARGEN_REFINAMIENTO * escala)
+    inversa: np.ndarray = np.linalg.inv(h)
+    puntos1: list[np.ndarray] = []
+    puntos2: list[np.ndarray] = []
+    for y0, y1, x0, x1 in regiones:
+        y0, x0 = max(y0 - margen, 0), max(x0 - margen, 0)
+        y1, x1 = y1 + margen, x1 + margen
+        en_region: np.ndarray = (
+            (referencia.puntos[:, 0] >= x0) &
+            (referencia.puntos[:, 0] < x1) &
+            (referencia.puntos[:, 1] >= y0) &
+            (referencia.puntos[:, 1] < y1)
+        )
+        if not en_region.any():
+            continue
+        esquinas: np.ndarray = proyectar(
+            inversa,
+            np.array(
+                [[x0, y0], [x1, y0], [x0, y1], [x1, y1]],
+                dtype=np.float32
+            )
+        )
+        ex0, ey0 = np.maximum(np.floor(esquinas.min(axis=0)), 0) \
+            .astype(int)
+        ex1, ey1 = np.ceil(esquinas.max(axis=0)).astype(int)
+        parche: np.ndarray = byn[ey0:ey1, ex0:ex1]
+        if parche.size == 0:
+            continue
+        puntos_parche, d2 = caracteristicas(parche, 1000)
+        if d2 is None:
+            continue
+        coincidencias: list[cv2.DMatch] = cv2.BFMatcher(
+            cv2.NORM_HAMMING, crossCheck=True
+        ).match(referencia.descriptores[en_region], d2)
+        if not coincidencias:
+            continue
+        p1: np.ndarray = referencia.puntos[en_region][
+            [c.queryIdx for c in coincidencias]
+        ]
+        p2: np.ndarray = puntos_parche[
+            [c.trainIdx for c in coincidencias]
+        ] + np.array([ex0, ey0], dtype=np.float32)
+        # sólo coincidencias coherentes con la estimación gruesa
+        cercanas: np.ndarray = np.linalg.norm(
+            proyectar(h, p2) - p1, axis=1
+        ) < TOLERANCIA_REFINAMIENTO * escala
+        puntos1.append(p1[cercanas])
+        puntos2.append(p2[cercanas])
+    if sum(len(p) for p in puntos1) < MINIMO_COINCIDENCIAS:
+        return h
+    refinada, mascara = cv2.findHomography(
+        np.concatenate(puntos2),
+        np.concatenate(puntos1),
+        cv2.RANSAC,
+        TOLERANCIA_REFINAMIENTO * escala
+    )
+    return h if refinada is None else refinada
+
+
+def homografia_piramidal(
+    referencia: PaginaReferencia,
+    im2: np.ndarray,
+    regiones: list[Rectangulo]
+) -> Optional[np.ndarray]:
+    byn: np.ndarray = cv2.cvtColor(im2, cv2.COLOR_BGR2GRAY)
+    puntos2, d2 = caracteristicas(reducir(byn))
+    gruesa: Optional[np.ndarray] = estimar_homografia(
+        referencia.puntos_gruesos,
+        referencia.descriptores_gruesos,
+        puntos2,
+        d2
+    )
+    if gruesa is None:
+        return None
+    # de coordenadas reducidas a coordenadas completas en ambas imágenes
+    reduccion: np.ndarray = np.diag([ESCALA_GRUESA, ESCALA_GRUESA, 1.0])
+    return refinar_homografia(
+        referencia,
+        byn,
+        np.linalg.inv(reduccion) @ gruesa @ reduccion,
+        regiones
+    )
+
+
+def error_reproyeccion(
+    referencia: PaginaReferencia,
+    h1: np.ndarray,
+    h2: np.ndarray,
+    regiones: list[Rectangulo]
+) -> float:
+    '''
+    Mayor distancia, en milímetros, entre las esquinas de las regiones y
+    su ida al escaneo con h1 y vuelta con h2
+    '''
+    if not regiones:
+        return 0.0
+    esquinas: np.ndarray = np.array(
+        [
+            esquina
+            for y0, y1, x0, x1 in regiones
+            for esquina in ((x0, y0), (x1, y0), (x0, y1), (x1, y1))
+        ],
+        dtype=np.float32
+    )
+    distancias: np.ndarray = np.linalg.norm(
+        proyectar(h2, proyectar(np.linalg.inv(h1), esquinas)) - esquinas,
+        axis=1
+    )
+    return float(distancias.max()) * A4[1] / referencia.forma[0] / mm
+
+
+def enderezar_region(
+    im2: np.ndarray,
+    h: np.ndarray,
+    region: Rectangulo
+) -> np.ndarray:
+    y0, y1, x0, x1 = region
+    traslacion: np.ndarray = np.array(
+        [[1, 0, -x0], [0, 1, -y0], [0, 0, 1]],
+        dtype=np.float64
+    )
+    return cv2.warpPerspective(im2, traslacion @ h, (x1 - x0, y1 - y0))
+
+
+def bandas_texto(imagen: np.ndarray) -> np.ndarray:
+    '''
+    Franjas horizontales con tinta de la página de referencia; sólo
+    esas franjas se enderezan y se reconocen en el escaneo
+    '''
+    escala: float = len(imagen) / A4[1]
+    tinta: np.ndarray = (
+        cv2.threshold(
+            cv2.cvtColor(imagen, cv2.COLOR_BGR2GRAY),
+            127,
+            255,
+            cv2.THRESH_BINARY_INV
+        )[1] > 0
+    ).sum(axis=1) > 0.001 * len(imagen[0])
+    filas: np.ndarray = np.flatnonzero(tinta)
+    if not len(filas):
+        return np.zeros((0, 2), dtype=int)
+    cortes: np.ndarray = np.flatnonzero(np.diff(filas) > 5*mm*escala)
+    relleno: int = int(2*mm*escala)
+    return np.array(
+        [
+            [max(inicio - relleno, 0), min(fin + relleno, len(imagen))]
+            for inicio, fin in zip(
+                filas[np.concatenate(([0], cortes + 1))],
+                filas[np.concatenate((cortes, [len(filas) - 1]))] + 1
+            )
+        ],
+        dtype=int
+    )
+
+
+def texto_bandas(
+    imagen: np.ndarray,
+    bandas: np.ndarray
+) -> str:
+    return "\n".join(
+        reconocer_lote(
+            [binarizar_texto(imagen[inicio:fin]) for inicio, fin in bandas]
+        )
+    )
+
+
+def binarizar_texto(imagen: np.ndarray) -> np.ndarray:
+    return cv2.threshold(
+        cv2.medianBlur(
+            cv2.filter2D(
+                cv2.cvtColor(imagen, cv2.COLOR_BGR2GRAY),
+                -1,
+                NITIDEZ
+            ),
+            7
+        ),
+        127,
+        255,
+        cv2.THRESH_BINARY
+    )[1]
+
+
+def textos_coinciden(texto1: str, texto2: str) -> bool:
+    # 0.001 es constante de textos iguales
+    return (
+        math.sqrt(
+            SequenceMatcher(None, texto1, texto2).ratio()
+        ) / len(texto1.split())
+    ) >= 0.001
+
+
+def hallar_bloque_firma(
+    bloque: np.ndarray,
+    altura: int,
+    carpeta: str,
+    indice: int,
+    numero: int
+) -> bool:
+    contornos = cv2.findContours(
+        cv2.adaptiveThreshold(
+            cv2.medianBlur(
+                cv2.filter2D(
+                    cv2.cvtColor(bloque, cv2.COLOR_BGR2GRAY),
+                    -1,
+                    NITIDEZ
+                ),
+                7
+            ),
+            255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            11,
+            2
+        ),
+        cv2.RETR_EXTERNAL,
+        cv2.CHAIN_APPROX_SIMPLE
+    )[0]
+    for cnt in contornos:
+        approx = cv2.approxPolyDP(
+            cnt,
+            0.02 * cv2.arcLength(cnt, True),
+            True
+        )
+        if len(approx) == 4:
+            x, y, w, h = cv2.boundingRect(approx)
+            if (
+                35*mm*altura/A4[1]
+                < h
+                < 40*mm*altura/A4[1] and
+                47.5*mm*altura/A4[1]
+                < w
+                < 52.5*mm*altura/A4[1]
+            ):
+                if settings.VERIFICACION_DEPURACION:
+                    cv2.imwrite(
+                        os.path.join(
+                            carpeta,
+                            f"pagina{indice+1}-bloqueFirma{numero+1}.png"
+                        ),
+                        cv2.drawContours(
+                            bloque.copy(), [approx], -1, (0, 255, 0), 50
+                        )
+                    )
+                return True
+    return False
+
+
+def verificar_pagina(
+    referencia: PaginaReferencia,
+    escaneo: Image.Image,
+    firmas_pagina: QuerySet[FirmaOrden],
+    carpeta: str,
+    indice: int
+) -> Optional[str]:
+    '''
+    Devuelve el motivo de rechazo de la página, o None si es correcta
+    '''
+    im2: np.ndarray = cv2.cvtColor(
+        np.asarray(escaneo),
+        cv2.COLOR_BGR2RGB
+    )
+    bloques: list[Rectangulo] = [
+        rectangulo(referencia.forma, firma, -2.5, 40, -2.5, 52.5)
+        for firma in firmas_pagina
+    ]
+    with DURACION_ETAPA.labels('alineacion').time():
+        h: Optional[np.ndarray] = homografia_piramidal(
+            referencia, im2, bloques
+        )
+    if h is None:
+        return f"La página {indice+1} no es el impreso correcto"
+    altura, base = referencia.forma
+    texto1: str = referencia.texto
+    with DURACION_ETAPA.labels('ocr').time():
+        texto2: str = "\n".join(
+            reconocer_lote(
+                [
+                    binarizar_texto(
+                        enderezar_region(im2, h, (inicio, fin, 0, base))
+                    )
+                    for inicio, fin in referencia.bandas
+                ]
+            )
+        )
+    if settings.VERIFICACION_DEPURACION:
+        for numero, texto in enumerate((texto1, texto2)):
+            with open(
+                os.path.join(carpeta, f"pagina{indice+1}-texto{numero+1}.txt"),
+                "w"
+            ) as f:
+                f.write(texto)
+    if not textos_coinciden(texto1, texto2):
+        return f"La página {indice+1} no es el impreso correcto"
+    with DURACION_ETAPA.labels('deteccion').time():
+        for numero, (firma, region) in enumerate(
+            zip(firmas_pagina, bloques)
+        ):
+            bloque: np.ndarray = enderezar_region(im2, h, region)
+            if not hallar_bloque_firma(
+                bloque, altura, carpeta, indice, numero
+            ):
+                return (
+                    f"En la página {indice+1}, no se halla"
+                    " el bloque de firma de"
+                    f" {firma.usuario_firmante.last_name},"
+                    f" {firma.usuario_firmante.first_name}"
+                )
+            y0, y1, x0, x1 = rectangulo(
+                referencia.forma, firma, 2.5, 32.5, 2.5, 47.5
+            )
+            if not hay_firma(
+                referencia.recortes[firma.id_firma_orden],
+                bloque[
+                    y0 - region[0]:y1 - region[0],
+                    x0 - region[2]:x1 - region[2]
+                ],
+                os.path.join(carpeta, f"pagina{indice+1}-firma{numero+1}")
+                if settings.VERIFICACION_DEPURACION else None
+            ):
+                return (
+                    f"En la página {indice+1}, falta la firma de"
+                    f" {firma.usuario_firmante.last_name},"
+                    f" {firma.usuario_firmante.first_name}"
+                )
+    return None
@@ -11,6 +11,7 @@ from .vista_lista_ordenes_ayudante import VistaListaOrdenesAyudante
 from .vista_subida_convenio import VistaSubidaConvenio
 from .vista_lista_ordenes_secretario import VistaListaOrdenesSecretario
 from .vista_subida_orden import VistaSubidaOrden
+from .vista_verificacion_orden import VistaVerificacionOrden
 from .vista_firma_orden_comitente import VistaFirmaOrdenComitente
 from .vista_firma_orden_responsable import VistaFirmaOrdenResponsable
 from .vista_firma_orden_secretario import VistaFirmaOrdenSecretario
@@ -1,12 +1,9 @@
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.fields import ArrayField
-from django.contrib.postgres.functions import TransactionNow
-from django.core.files.base import ContentFile
 from django.db import transaction
 from django.db.models import (
-    Case, CharField, DecimalField, F, Min, Model, Q, QuerySet, Value, When
+    Case, CharField, DecimalField, F, Min, Model, QuerySet, Value, When
 )
 from django.db.models.fields.files import FieldFile
 from django.db.models.functions import Cast, Concat
@@ -21,70 +18,31 @@ from babel.numbers import format_decimal
 from cryptography.hazmat import backends
 from cryptography.hazmat.primitives.serialization import pkcs12
 from cryptography.x509 import Certificate
-from datetime import datetime, timedelta
+from datetime import timedelta
 from decimal import Decimal
-from endesive.pdf import cms
-from pytz import timezone
-from reportlab.lib.units import mm
 from typing import Any, Dict, Optional, Self
 
 from ..forms import FormularioFirma
-from ..models import FirmaOrden, OrdenServicio
+from ..models import OrdenServicio
+from ..revisiones import firmar_orden
 
-from cuentas.models import Comitente, ResponsableTecnico, Secretario
 from solicitudes.models import (
     PropuestaCompromisos,
     ResponsableSolicitud
 )
 from servicios.models import Servicio
 
+from gesservorconv.mixins import MixinContextoRoles
 
-class VistaFirmaOrdenSecretario(FormView):
+
+class VistaFirmaOrdenSecretario(
+    MixinContextoRoles,
+    FormView
+):
     template_name: str = "firmas/firma_orden_secretario.html"
     form_class: type[FormularioFirma] = FormularioFirma
     success_url: str = reverse_lazy("firmas:lista_ordenes_secretario")
 
-    def get_context_data(
-        self: Self,
-        **kwargs: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
-        return contexto
-
     def get(
         self: Self,
         request: HttpRequest,
@@ -107,13 +65,6 @@ class VistaFirmaOrdenSecretario(FormView):
             request.POST, request.FILES
         )
         if formulario.is_valid():
-            orden_servicio: OrdenServicio = OrdenServicio.objects.get(
-                solicitud_servicio__id_solicitud=orden
-            )
-            firma: FirmaOrden = FirmaOrden.objects.get(
-                orden_firmada=orden_servicio,
-                usuario_firmante=request.user
-            )
             p12: tuple[
                 Optional[Any],
                 Optional[Certificate],
@@ -123,87 +74,20 @@ class VistaFirmaOrdenSecretario(FormView):
                 request.POST.get("contrasenia_firma").encode("ascii"),
                 backends.default_backend()
             )
-            documento_a_firmar: ContentFile = (
-                FirmaOrden.objects.filter(
-                    Q(orden_firmada__solicitud_servicio__id_solicitud=orden) &
-                    Q(tiempo_firma__isnull=False)
-                ).order_by(
-                    "-tiempo_firma"
-                ).first().documento_firmado.open()
-            )
-            numero_firma: int = FirmaOrden.objects.filter(
-                Q(orden_firmada__solicitud_servicio__id_solicitud=orden) &
-                Q(tiempo_firma__isnull=False)
-            ).count() + 1
-            offset: str = datetime.now(
-                timezone(settings.TIME_ZONE)
-            ).astimezone().strftime("%z")
-            firmado: bytes = cms.sign(
-                documento_a_firmar.read(),
-                {
-                    "aligned": 0,
-                    "sigflags": 3,
-                    "sigflagsft": 123,
-                    "sigpage": firma.pagina_firma-1,
-                    "sigfield": f"Firma {numero_firma}",
-                    "auto_sigfield": True,
-                    "signform": False,
-                    "sigandcertify": True,
-                    "signaturebox": (
-                        firma.coord_x_firma + 5*mm,
-                        firma.coord_y_firma - 5*mm,
-                        firma.coord_x_firma + 45*mm,
-                        firma.coord_y_firma - 32.5*mm,
-                    ),
-                    "signature": f"{firma.usuario_firmante.last_name},"
-                                 f" {firma.usuario_firmante.first_name}",
-                    "signature_img_distort": False,
-                    "contact": firma.usuario_firmante.email,
-                    "location": "Posadas, Misiones, Argentina",
-                    "signingdate": datetime.now(
-                        timezone(settings.TIME_ZONE)
-                    ).strftime(
-                        "D:%Y%m%d%H%M%S"
-                    ) + f"{offset[:3]}'{offset[3:]}'",
-                    "reason": "Secretaría de Extensión y Vinculación Tecnológica"
-                },
-                p12[0],
-                p12[1],
-                p12[2],
-                "sha256"
-            )
-            # Cerrar y volver a abrir el archivo resulta más seguro
-            documento_a_firmar.close()
-            documento_a_firmar: ContentFile = (
-                FirmaOrden.objects.filter(
-                    Q(orden_firmada__solicitud_servicio__id_solicitud=orden) &
-                    Q(tiempo_firma__isnull=False)
-                ).order_by(
-                    "-tiempo_firma"
-                ).first().documento_firmado.open()
-            )
-            # Agregando el contenido después es de la única forma que funciona
-            archivo: ContentFile = ContentFile(
-                content=b"",
-                name=f"{datetime.now(timezone(settings.TIME_ZONE)).isoformat()}.pdf"
-            )
-            archivo.write(documento_a_firmar.read())
-            archivo.write(firmado)
-            documento_a_firmar.close()
-            firma.documento_firmado = archivo
-            firma.tiempo_firma = TransactionNow()
-            orden_servicio.ultima_accion_orden = TransactionNow()
-            orden_servicio.archivo_orden_firmada = archivo
-            servicio: Servicio = Servicio(
-                orden_servicio=orden_servicio,
-                convenio=None,
-                pagado=False,
-                completado=False
-            )
             with transaction.atomic():
-                firma.save()
-                orden_servicio.save()
-                servicio.save()
+                orden_servicio: OrdenServicio = firmar_orden(
+                    orden,
+                    request.user,
+                    p12,
+                    "Secretaría de Extensión y Vinculación Tecnológica",
+                    final=True
+                )
+                Servicio(
+                    orden_servicio=orden_servicio,
+                    convenio=None,
+                    pagado=False,
+                    completado=False
+                ).save()
             messages.success(request, "Se ha firmado la orden correctamente")
             return HttpResponseRedirect(self.success_url)
         contexto: Dict[str, Any] = self.get_context_data()
@@ -26,14 +26,11 @@ from solicitudes.models import (
 
 from servicios.models import Servicio
 
-from cuentas.models import (
-    Comitente,
-    ResponsableTecnico,
-    Secretario
-)
+from cuentas.roles import obtener_roles
 
 from gesservorconv.mixins import (
-    MixinAccesoRequerido
+    MixinAccesoRequerido,
+    MixinContextoRoles
 )
 from gesservorconv.views import HtmxHttpRequest
 
@@ -41,16 +38,14 @@ from gesservorconv.views import HtmxHttpRequest
 class VistaListaConveniosSecretario(
     MixinAccesoRequerido,
     UserPassesTestMixin,
+    MixinContextoRoles,
     TemplateView
 ):
     paginate_by: int = 10
     template_name: str = "firmas/listar_convenios_secretario.html"
 
     def test_func(self: Self) -> bool:
-        return Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists()
+        return obtener_roles(self.request)["secretario"] is True
 
     def handle_no_permission(self: Self) -> HttpResponse:
         if self.request.user.is_anonymous:
@@ -265,40 +260,6 @@ class VistaListaConveniosSecretario(
         **kwargs: Dict[str, Any]
     ) -> Dict[str, Any]:
         contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
         convenios: QuerySet[Convenio] = self.get_queryset()
         paginador_curso: Paginator = Paginator(
             convenios.filter(
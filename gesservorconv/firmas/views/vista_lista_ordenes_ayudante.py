@@ -26,14 +26,10 @@ from solicitudes.models import (
 
 from servicios.models import Servicio
 
-from cuentas.models import (
-    Comitente,
-    ResponsableTecnico,
-    Secretario
-)
 
 from gesservorconv.mixins import (
-    MixinAccesoRequerido
+    MixinAccesoRequerido,
+    MixinContextoRoles
 )
 from gesservorconv.views import HtmxHttpRequest
 
@@ -41,6 +37,7 @@ from gesservorconv.views import HtmxHttpRequest
 class VistaListaOrdenesAyudante(
     MixinAccesoRequerido,
     UserPassesTestMixin,
+    MixinContextoRoles,
     TemplateView
 ):
     paginate_by: int = 10
@@ -263,40 +260,6 @@ class VistaListaOrdenesAyudante(
         **kwargs: Dict[str, Any]
     ) -> Dict[str, Any]:
         contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
         ordenes: QuerySet[OrdenServicio] = self.get_queryset()
         paginador_curso: Paginator = Paginator(
             ordenes.filter(
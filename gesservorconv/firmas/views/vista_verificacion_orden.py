@@ -0,0 +1,95 @@
+from django.contrib import messages
+from django.contrib.auth import logout
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse_lazy
+from django.views.generic import View
+
+from typing import Any, Dict, Self
+
+from ..models import VerificacionOrden
+from ..tasks import contexto_verificacion
+
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinContextoRoles
+)
+
+
+class VistaVerificacionOrden(
+    MixinAccesoRequerido,
+    UserPassesTestMixin,
+    MixinContextoRoles,
+    View
+):
+    template_name: str = "firmas/verificacion_orden.html"
+
+    def test_func(self: Self) -> bool:
+        return self.request.user.groups.filter(
+            name="ayudante"
+        )
+
+    def handle_no_permission(self: Self) -> HttpResponse:
+        if self.request.user.is_anonymous:
+            messages.warning(
+                self.request,
+                "La sesión ha caducado"
+            )
+            direccion: str = (
+                reverse_lazy("cuentas:iniciar_sesion") +
+                "?siguiente=" + self.request.path
+            )
+            if self.request.htmx:
+                return HttpResponse(
+                    self.request.get_full_path(),
+                    headers={
+                        "HX-Redirect": direccion
+                    }
+                )
+            return HttpResponseRedirect(direccion)
+        if self.request.user.is_staff or self.request.user.is_superuser:
+            logout(self.request)
+            messages.error(
+                self.request,
+                (
+                    "El usuario %(nombre)s no tiene permiso a"
+                    " esta página. Por ello, se ha cerrado"
+                    " la sesión."
+                ) % {
+                    "nombre": self.request.user.username
+                }
+            )
+            return HttpResponseRedirect(
+                reverse_lazy("cuentas:iniciar_sesion")
+            )
+        messages.error(
+            self.request,
+            "Usted no está a cargo de la Secretaría."
+        )
+        return HttpResponseRedirect(
+            reverse_lazy('cuentas:perfil')
+        )
+
+    def get(
+        self: Self,
+        request: HttpRequest,
+        orden: int,
+        verificacion: int
+    ) -> HttpResponse:
+        contexto: Dict[str, Any] = self.contexto_roles()
+        contexto.update(
+            contexto_verificacion(
+                get_object_or_404(
+                    VerificacionOrden,
+                    id_verificacion=verificacion,
+                    orden_servicio_id=orden
+                )
+            )
+        )
+        contexto["orden"] = orden
+        return render(
+            request,
+            self.template_name,
+            contexto
+        )
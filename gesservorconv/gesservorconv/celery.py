@@ -2,10 +2,12 @@ from logging import Formatter, Handler, Logger, root, StreamHandler
 import os
 from pathlib import Path
 from sys import stdout
-from typing import Any
+from time import perf_counter
+from typing import Any, Optional
 
-from celery import Celery
-from celery.signals import after_setup_logger
+from celery import Celery, Task
+from celery.signals import after_setup_logger, task_postrun, task_prerun
+from prometheus_client import Histogram
 
 from .logging import Filtro, Formateador, ManejadorArchivosTiempoRotativo
 
@@ -16,6 +18,15 @@ app: Celery = Celery('gesservorconv')
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
+DURACION_TAREA: Histogram = Histogram(
+    'gesservorconv_celery_task_duration_seconds',
+    'Duración de las tareas de Celery',
+    ['task', 'state'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+
+inicio_tareas: dict[str, float] = {}
+
 
 @after_setup_logger.connect
 def on_after_setup_logger(**kwargs: dict[str, Any]) -> None:
@@ -54,4 +65,24 @@ def on_after_setup_logger(**kwargs: dict[str, Any]) -> None:
         logger.propagate = False
 
 
+@task_prerun.connect
+def on_task_prerun(task_id: str, **kwargs: dict[str, Any]) -> None:
+    inicio_tareas[task_id] = perf_counter()
+
+
+@task_postrun.connect
+def on_task_postrun(
+    task_id: str,
+    task: Task,
+    state: Optional[str] = None,
+    **kwargs: dict[str, Any]
+) -> None:
+    inicio: Optional[float] = inicio_tareas.pop(task_id, None)
+    if inicio is not None:
+        DURACION_TAREA.labels(
+            task.name.rsplit('.', 1)[-1],
+            state or 'UNKNOWN'
+        ).observe(perf_counter() - inicio)
+
+
 app.autodiscover_tasks()
@@ -1,27 +1,30 @@
 from django.conf import settings
 
-from matplotlib.dates import (
+from babel.dates import format_skeleton
+from datetime import datetime, tzinfo
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import (
     YEARLY,
     MONTHLY,
     DAILY,
     HOURLY,
     MINUTELY,
-    DAYS_PER_YEAR,
-    DAYS_PER_MONTH,
-    HOURS_PER_DAY,
-    MINUTES_PER_DAY,
-    AutoDateFormatter,
-    AutoDateLocator,
-    num2date
+    rrule
 )
-
-from babel.dates import format_skeleton
-from datetime import datetime, tzinfo
 import pytz
 from typing import Optional, Self
 
+DAYS_PER_YEAR: float = 365.25
+DAYS_PER_MONTH: float = 30
+HOURS_PER_DAY: float = 24
+MINUTES_PER_DAY: float = 24 * 60
 
-class Ubicador(AutoDateLocator):
+
+class Ubicador:
+    '''
+    Misma elección de marcas que AutoDateLocator de matplotlib,
+    pero calculadas directamente sobre fechas
+    '''
     def __init__(
         self: Self,
         tz: Optional[tzinfo] = None,
@@ -29,10 +32,10 @@ class Ubicador(AutoDateLocator):
         maxticks: Optional[int | dict[int]] = None,
         interval_multiples: bool = True
     ):
-        super(AutoDateLocator, self).__init__(tz=tz)
+        self.tz = tz if tz else pytz.timezone(settings.TIME_ZONE)
+        self.minticks = minticks
         self._freq = YEARLY
         self._freqs = [YEARLY, MONTHLY, DAILY, HOURLY, MINUTELY]
-        self.minticks = minticks
         self.maxticks = {
             YEARLY: 11,
             MONTHLY: 12,
@@ -64,20 +67,90 @@ class Ubicador(AutoDateLocator):
             range(0, 60)
         ]
 
+    def unidad(self: Self) -> float:
+        return {
+            YEARLY: DAYS_PER_YEAR,
+            MONTHLY: DAYS_PER_MONTH,
+            DAILY: 1,
+            HOURLY: 1 / HOURS_PER_DAY,
+            MINUTELY: 1 / MINUTES_PER_DAY
+        }[self._freq]
 
-class Formateador(AutoDateFormatter):
+    def localizar(self: Self, tiempo: datetime) -> datetime:
+        if hasattr(self.tz, 'localize'):
+            return self.tz.localize(tiempo)
+        return tiempo.replace(tzinfo=self.tz)
+
+    def marcas(
+        self: Self,
+        inicio: datetime,
+        fin: datetime
+    ) -> list[datetime]:
+        dmin: datetime = inicio.astimezone(self.tz).replace(tzinfo=None)
+        dmax: datetime = fin.astimezone(self.tz).replace(tzinfo=None)
+        delta: relativedelta = relativedelta(dmax, dmin)
+        num_anios: float = float(delta.years)
+        num_meses: float = num_anios * 12 + delta.months
+        num_dias: float = (dmax - dmin).days
+        num_horas: float = num_dias * 24 + delta.hours
+        num_minutos: float = num_horas * 60 + delta.minutes
+        nums: list[float] = [
+            num_anios, num_meses, num_dias, num_horas, num_minutos
+        ]
+        byranges: list[Optional[int | range | list[int]]] = [
+            None, 1, 1, 0, 0
+        ]
+        interval: int = 1
+        for i, (freq, num) in enumerate(zip(self._freqs, nums)):
+            if num < self.minticks:
+                byranges[i] = None
+                continue
+            for interval in self.intervald[freq]:
+                if num <= interval * (self.maxticks[freq] - 1):
+                    break
+            self._freq = freq
+            if self._byranges[i] and self.interval_multiples:
+                byranges[i] = self._byranges[i][::interval]
+                if freq == DAILY:
+                    if interval == 14:
+                        byranges[i] = [1, 15]
+                    elif interval == 7:
+                        byranges[i] = [1, 8, 15, 22]
+                interval = 1
+            else:
+                byranges[i] = self._byranges[i]
+            break
+        else:
+            self._freq = MINUTELY
+            interval = 1
+        _, bymonth, bymonthday, byhour, byminute = byranges
+        regla: rrule = rrule(
+            self._freq,
+            dtstart=dmin - delta,
+            until=dmax + delta,
+            interval=interval,
+            bymonth=bymonth,
+            bymonthday=bymonthday,
+            byhour=byhour,
+            byminute=byminute,
+            bysecond=0
+        )
+        return [
+            self.localizar(tiempo)
+            for tiempo in regla.between(dmin, dmax, True)
+        ]
+
+
+class Formateador:
     def __init__(
         self: Self,
-        locator: AutoDateLocator,
+        locator: Ubicador,
         tz: Optional[tzinfo],
-        defaultfmt: str,
-        *,
-        usetex: Optional[bool] = None
+        defaultfmt: str
     ) -> None:
         self._locator = locator
         self._tz = tz if tz else pytz.timezone(settings.TIME_ZONE)
         self.defaultfmt = defaultfmt
-        self._usetex = False
         # https://unicode.org/reports/tr35/tr35-dates.html#table-date-field-symbol-table
         self.scaled = {
             DAYS_PER_YEAR: 'y',
@@ -89,14 +162,9 @@ class Formateador(AutoDateFormatter):
 
     def __call__(
         self: Self,
-        x: datetime,
-        pos: Optional[float] = None
+        x: datetime
     ) -> str:
-        locator_unit_scale: float | int
-        try:
-            locator_unit_scale = float(self._locator._get_unit())
-        except AttributeError:
-            locator_unit_scale = 1
+        locator_unit_scale: float = self._locator.unidad()
         fmt: str = next(
             (
                 fmt for scale, fmt in sorted(self.scaled.items())
@@ -107,13 +175,11 @@ class Formateador(AutoDateFormatter):
         result: str = ''
         if locator_unit_scale < 1:
             result += format_skeleton(
-                'yMd', num2date(x),
+                'yMd', x,
                 self._tz, True, self.defaultfmt
             ) + ' '
-        if isinstance(fmt, str):
-            result += format_skeleton(
-                fmt, num2date(x),
-                self._tz, True, self.defaultfmt
-            )
-            return result
-        raise TypeError(f'Unexpected type passed to {self!r}.')
+        result += format_skeleton(
+            fmt, x,
+            self._tz, True, self.defaultfmt
+        )
+        return result
@@ -0,0 +1,86 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+
+from collections.abc import AsyncIterator, Callable, Iterator
+import csv
+from typing import Any, Self
+
+# Filas por lectura del cursor del servidor y por fragmento de respuesta
+FILAS_FRAGMENTO: int = 2000
+
+
+class Eco:
+    '''
+    Archivo que devuelve lo escrito, para que csv.writer produzca cada
+    fila como texto en lugar de acumularla
+    '''
+    def write(self: Self, valor: str) -> str:
+        return valor
+
+
+def fragmentos_csv(
+    encabezado: list[str],
+    filas: Iterator[tuple[Any, ...]],
+    convertir: Callable[[tuple[Any, ...]], tuple[Any, ...]]
+) -> Iterator[str]:
+    # El servidor será Linux, el dialecto unix es adecuado
+    escritor = csv.writer(Eco(), dialect="unix")
+    yield escritor.writerow(encabezado)
+    fragmento: list[str] = []
+    for fila in filas:
+        fragmento.append(escritor.writerow(convertir(fila)))
+        if len(fragmento) == FILAS_FRAGMENTO:
+            yield "".join(fragmento)
+            fragmento = []
+    if fragmento:
+        yield "".join(fragmento)
+
+
+async def afragmentos_csv(
+    encabezado: list[str],
+    filas: AsyncIterator[tuple[Any, ...]],
+    convertir: Callable[[tuple[Any, ...]], tuple[Any, ...]]
+) -> AsyncIterator[str]:
+    escritor = csv.writer(Eco(), dialect="unix")
+    yield escritor.writerow(encabezado)
+    fragmento: list[str] = []
+    async for fila in filas:
+        fragmento.append(escritor.writerow(convertir(fila)))
+        if len(fragmento) == FILAS_FRAGMENTO:
+            yield "".join(fragmento)
+            fragmento = []
+    if fragmento:
+        yield "".join(fragmento)
+
+
+def respuesta_csv(
+    request: HttpRequest,
+    encabezado: list[str],
+    filas: QuerySet,
+    nombre: str,
+    convertir: Callable[[tuple[Any, ...]], tuple[Any, ...]] = tuple
+) -> StreamingHttpResponse:
+    '''
+    Envía el CSV a medida que se lee, con un cursor del servidor.
+    filas debe ser un values_list con las columnas de encabezado. Bajo
+    ASGI el iterador tiene que ser asíncrono y bajo WSGI, síncrono: si
+    no, Django junta todo el contenido antes de enviarlo
+    '''
+    return StreamingHttpResponse(
+        afragmentos_csv(
+            encabezado,
+            filas.aiterator(chunk_size=FILAS_FRAGMENTO),
+            convertir
+        )
+        if isinstance(request, ASGIRequest)
+        else fragmentos_csv(
+            encabezado,
+            filas.iterator(chunk_size=FILAS_FRAGMENTO),
+            convertir
+        ),
+        content_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{nombre}"'
+        }
+    )
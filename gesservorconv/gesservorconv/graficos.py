@@ -0,0 +1,349 @@
+from babel.dates import format_datetime
+from datetime import datetime, timezone, tzinfo
+from dateutil.rrule import YEARLY, MONTHLY, DAILY, HOURLY, MINUTELY
+from typing import Any, NamedTuple, Self
+import xml.etree.ElementTree as ET
+
+from .dates import Formateador, Ubicador
+
+
+class Serie(NamedTuple):
+    etiqueta: str
+    acronimo: str
+    clase: str
+    cuentas: list[int]
+
+
+def bordes_histograma(
+    tiempo_inicio: datetime,
+    tiempo_fin: datetime,
+    cantidad: int
+) -> list[datetime]:
+    inicio: datetime = tiempo_inicio.replace(tzinfo=timezone.utc)
+    fin: datetime = tiempo_fin.replace(tzinfo=timezone.utc)
+    paso = (fin - inicio) / cantidad
+    return [inicio + paso * i for i in range(cantidad)] + [fin]
+
+
+def paso_cantidad(maximo: int) -> int:
+    escala: int = 1
+    while True:
+        for factor in (1, 2, 5):
+            if maximo <= factor * escala * 8:
+                return factor * escala
+        escala *= 10
+
+
+class HistogramaSvg:
+    '''
+    Histograma horizontal en SVG, sin figuras ni estado global, con los
+    mismos identificadores que usan los botones y popovers del informe
+    '''
+    colores: list[str] = [
+        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
+    ]
+    tinta: str = '#343a40'
+    grilla: str = '#b0b0b0'
+    ancho: int = 640
+    alto_grafico: int = 320
+    alto_fila: int = 18
+    fuente: int = 10
+
+    def __init__(
+        self: Self,
+        series: list[Serie],
+        bordes: list[datetime],
+        tz: tzinfo,
+        lenguaje: str,
+        titulo: str
+    ) -> None:
+        self.series = series
+        self.bordes = bordes
+        self.tz = tz
+        self.lenguaje = lenguaje
+        self.titulo = titulo
+        minutos: int = int(
+            (bordes[-1] - bordes[0]).total_seconds() // 60
+        ) + 1
+        self.ubicador: Ubicador = Ubicador(
+            tz,
+            1 if minutos < 5 else 2,
+            {
+                YEARLY: 11,
+                MONTHLY: 12,
+                DAILY: 11,
+                HOURLY: 12,
+                MINUTELY: 11 if 11 <= minutos else minutos
+            }
+        )
+        self.formateador: Formateador = Formateador(
+            self.ubicador, tz, lenguaje
+        )
+
+    def color(self: Self, i: int) -> str:
+        return self.colores[i % len(self.colores)]
+
+    def contraste(self: Self, i: int) -> str:
+        hexa: str = self.color(i)
+        tri: list[float] = [
+            int(hexa[j:j+2], 16) / 255 for j in (1, 3, 5)
+        ]
+        return (
+            '#ffffff'
+            if (
+                tri[0]*0.299
+                + tri[1]*0.587
+                + tri[2]*0.114
+            ) < 0.5
+            else '#000000'
+        )
+
+    def contenido(self: Self, cuenta: int) -> str:
+        return f'{cuenta} solicitud{"es" if cuenta > 1 else ""}'
+
+    def parches(self: Self) -> dict[str, list[str]]:
+        return {
+            f'hist_{ic}': [
+                f'hist_{ic}_patch_{il}'
+                for il in range(len(serie.cuentas))
+            ]
+            for ic, serie in enumerate(self.series)
+        }
+
+    def botones(self: Self) -> ET.Element:
+        botones: ET.Element = ET.Element('div')
+        botones.set('id', 'etiquetas')
+        botones.set('class', 'btn-toolbar justify-content-start mx-1')
+        botones.set('role', 'toolbar')
+        botones.set('aria-label', 'Marcadores de etiquetas')
+        botones.set('hx-swap-oob', 'outerHTML')
+        for i, serie in enumerate(self.series):
+            boton: ET.Element = ET.SubElement(botones, 'button')
+            boton.set('id', str(i))
+            boton.set('class', 'btn btn-sm focus-ring me-2 mt-2')
+            boton.set('onclick', 'toggle_hist(this);')
+            boton.text = serie.acronimo
+            boton.set(
+                'style',
+                f'--bs-btn-bg: {self.color(i)};'
+                f' --bs-btn-color: {self.contraste(i)};'
+                f' --bs-focus-ring-color: {self.color(i)};'
+            )
+        return botones
+
+    def estilos(self: Self) -> ET.Element:
+        custom_popovers: ET.Element = ET.Element('style')
+        custom_popovers.set('id', 'custom-popovers')
+        custom_popovers.text = ''.join(
+            f'\n\t.{serie.clase}'
+            '{\n\t\t--bs-popover-border-color:'
+            f' {self.color(i)};\n'
+            f'\t\t--bs-popover-header-bg: {self.color(i)};\n'
+            f'\t\t--bs-popover-header-color: {self.contraste(i)};\n'
+            '\t}\n'
+            for i, serie in enumerate(self.series)
+        )
+        return custom_popovers
+
+    def texto(
+        self: Self,
+        padre: ET.Element,
+        x: float,
+        y: float,
+        contenido: str,
+        **atributos: str
+    ) -> ET.Element:
+        texto: ET.Element = ET.SubElement(padre, 'text')
+        texto.set('x', f'{x:.2f}')
+        texto.set('y', f'{y:.2f}')
+        for clave, valor in atributos.items():
+            texto.set(clave.replace('_', '-'), valor)
+        texto.text = contenido
+        return texto
+
+    def linea(
+        self: Self,
+        padre: ET.Element,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float
+    ) -> None:
+        linea: ET.Element = ET.SubElement(padre, 'line')
+        linea.set('x1', f'{x1:.2f}')
+        linea.set('y1', f'{y1:.2f}')
+        linea.set('x2', f'{x2:.2f}')
+        linea.set('y2', f'{y2:.2f}')
+
+    def svg(self: Self) -> ET.Element:
+        marcas: list[datetime] = self.ubicador.marcas(
+            self.bordes[0], self.bordes[-1]
+        )
+        textos: list[str] = [self.formateador(marca) for marca in marcas]
+        maximo: int = max(
+            max(serie.cuentas, default=0) for serie in self.series
+        )
+        paso: int = paso_cantidad(maximo)
+        tope: int = max(-(-maximo // paso), 1) * paso
+        izquierda: float = (
+            2.5 * self.fuente + 8 +
+            0.6 * self.fuente * max(
+                (len(texto) for texto in textos), default=0
+            )
+        )
+        derecha: float = self.ancho - 12
+        arriba: float = 16 + len(self.series) * self.alto_fila
+        abajo: float = arriba + self.alto_grafico
+        alto: float = abajo + 3 * self.fuente + 12
+        duracion: float = (self.bordes[-1] - self.bordes[0]).total_seconds()
+
+        def y(tiempo: datetime) -> float:
+            return abajo - self.alto_grafico * (
+                tiempo - self.bordes[0]
+            ).total_seconds() / duracion
+
+        def x(cuenta: int) -> float:
+            return izquierda + (derecha - izquierda) * cuenta / tope
+
+        arbol: ET.Element = ET.Element('svg')
+        arbol.set('xmlns', 'http://www.w3.org/2000/svg')
+        arbol.set('id', 'histograma')
+        arbol.set('class', 'mt-3 me-auto img-fluid')
+        arbol.set('width', str(self.ancho))
+        arbol.set('height', f'{alto:.0f}')
+        arbol.set('viewBox', f'0 0 {self.ancho} {alto:.0f}')
+        arbol.set('font-family', 'Open Sans Medium')
+        arbol.set('font-size', str(self.fuente))
+        titulo: ET.Element = ET.SubElement(arbol, 'title')
+        titulo.text = self.titulo
+        grilla: ET.Element = ET.SubElement(arbol, 'g')
+        grilla.set('stroke', self.grilla)
+        grilla.set('stroke-width', '0.8')
+        grilla.set('stroke-dasharray', '0.8,1.3')
+        marcas_cantidad: range = range(0, tope + 1, paso)
+        for cuenta in marcas_cantidad:
+            self.linea(grilla, x(cuenta), arriba, x(cuenta), abajo)
+        for marca in marcas:
+            self.linea(grilla, izquierda, y(marca), derecha, y(marca))
+        for ic, serie in enumerate(self.series):
+            for il, cuenta in enumerate(serie.cuentas):
+                banda: float = (
+                    y(self.bordes[il]) - y(self.bordes[il+1])
+                )
+                grosor: float = 0.8 * banda / len(self.series)
+                barra: ET.Element = ET.SubElement(arbol, 'g')
+                barra.set('id', f'hist_{ic}_patch_{il}')
+                if cuenta > 0:
+                    barra.set('tabindex', '-1')
+                    barra.set('data-bs-toggle', 'popover')
+                    barra.set('data-bs-custom-class', serie.clase)
+                    barra.set('data-bs-title', serie.acronimo)
+                    barra.set('data-bs-content', self.contenido(cuenta))
+                    barra.set('data-bs-trigger', 'click hover focus')
+                rectangulo: ET.Element = ET.SubElement(barra, 'rect')
+                rectangulo.set('x', f'{izquierda:.2f}')
+                rectangulo.set(
+                    'y',
+                    f'{y(self.bordes[il]) - 0.1*banda - (ic+1)*grosor:.2f}'
+                )
+                rectangulo.set('width', f'{x(cuenta) - izquierda:.2f}')
+                rectangulo.set('height', f'{grosor:.2f}')
+                rectangulo.set('fill', self.color(ic))
+                rectangulo.set('stroke', self.tinta)
+                rectangulo.set('stroke-width', '0.8')
+        marco: ET.Element = ET.SubElement(arbol, 'rect')
+        marco.set('x', f'{izquierda:.2f}')
+        marco.set('y', f'{arriba:.2f}')
+        marco.set('width', f'{derecha - izquierda:.2f}')
+        marco.set('height', str(self.alto_grafico))
+        marco.set('fill', 'none')
+        marco.set('stroke', self.tinta)
+        marco.set('stroke-width', '0.8')
+        etiquetas: ET.Element = ET.SubElement(arbol, 'g')
+        etiquetas.set('fill', self.tinta)
+        for cuenta in marcas_cantidad:
+            self.texto(
+                etiquetas, x(cuenta), abajo + self.fuente + 4, str(cuenta),
+                text_anchor='middle'
+            )
+        for marca, texto in zip(marcas, textos):
+            self.texto(
+                etiquetas, izquierda - 4, y(marca) + 0.35 * self.fuente,
+                texto, text_anchor='end'
+            )
+        self.texto(
+            etiquetas, (izquierda + derecha) / 2, alto - 4, 'Cantidad',
+            text_anchor='middle'
+        )
+        self.texto(
+            etiquetas, 0, 0, 'Tiempo',
+            text_anchor='middle',
+            transform=(
+                f'translate({self.fuente + 2}, {(arriba + abajo) / 2:.2f})'
+                ' rotate(-90)'
+            )
+        )
+        for i, serie in enumerate(self.series):
+            fila: float = 8 + i * self.alto_fila
+            parche: ET.Element = ET.SubElement(arbol, 'g')
+            parche.set('id', f'leg_patch_{i}')
+            rectangulo = ET.SubElement(parche, 'rect')
+            rectangulo.set('x', '8')
+            rectangulo.set('y', f'{fila + 4:.2f}')
+            rectangulo.set('width', '20')
+            rectangulo.set('height', '7')
+            rectangulo.set('fill', self.color(i))
+            rectangulo.set('stroke', self.tinta)
+            rectangulo.set('stroke-width', '0.8')
+            leyenda: ET.Element = ET.SubElement(arbol, 'g')
+            leyenda.set('id', f'leg_text_{i}')
+            self.texto(
+                leyenda, 34, fila + 11, serie.etiqueta, fill=self.tinta
+            )
+        return arbol
+
+    def tabla(self: Self, encabezado: str) -> ET.Element:
+        tabla: ET.Element = ET.Element('table')
+        tabla.set(
+            'class',
+            'table table-sm table-hover table-striped-columns'
+            ' table-bordered align-middle'
+        )
+        seccion: ET.Element = ET.SubElement(tabla, 'thead')
+        fila: ET.Element = ET.SubElement(seccion, 'tr')
+        fila.set('class', 'text-center')
+        celda: ET.Element = ET.SubElement(fila, 'th')
+        celda.set('scope', 'col')
+        celda.text = encabezado
+        for i in range(len(self.bordes) - 1):
+            celda = ET.SubElement(fila, 'td')
+            celda.text = format_datetime(
+                self.bordes[i], 'short', self.tz, self.lenguaje
+            ) + '\n-\n' + format_datetime(
+                self.bordes[i+1], 'short', self.tz, self.lenguaje
+            )
+        celda = ET.SubElement(fila, 'td')
+        celda.text = 'Total'
+        seccion = ET.SubElement(tabla, 'tbody')
+        seccion.set('class', 'table-group-divider')
+        for serie in self.series:
+            fila = ET.SubElement(seccion, 'tr')
+            celda = ET.SubElement(fila, 'th')
+            celda.set('scope', 'row')
+            celda.text = serie.etiqueta
+            for cuenta in serie.cuentas:
+                celda = ET.SubElement(fila, 'td')
+                celda.text = str(cuenta)
+            celda = ET.SubElement(fila, 'td')
+            celda.text = str(sum(serie.cuentas))
+        return tabla
+
+    def contexto(self: Self, encabezado: str) -> dict[str, Any]:
+        return {
+            'custom_popovers': ET.tostring(self.estilos()).decode(),
+            'hist_patches': self.parches(),
+            'svg': ET.tostring(self.svg()).decode(),
+            'tabla': ET.tostring(self.tabla(encabezado)).decode(),
+            'botones': ET.tostring(self.botones()).decode()
+        }
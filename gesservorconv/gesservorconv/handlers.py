@@ -16,23 +16,29 @@ from django.http import (
     HttpRequest,
     HttpResponse,
     HttpResponseBadRequest,
+    HttpResponseNotModified,
     HttpResponseServerError
 )
 from django.urls import set_script_prefix, set_urlconf, URLResolver
 from django.utils.asyncio import aclosing
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_etags
 from django.utils.log import log_response
 from django.utils.module_loading import import_string
 
 from asgiref.sync import ThreadSensitiveContext, sync_to_async
-from collections.abc import Callable, Iterable, Mapping
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextvars import Token
+from io import BufferedReader
 from logging import getLogger, Logger
+import os
 from sys import exc_info
 from tempfile import SpooledTemporaryFile
 from types import TracebackType
 from typing import Any, Optional, ParamSpecArgs, ParamSpecKwargs, Self
 
 from .exception import convert_exception_to_response
+from .metricas import Medicion, medicion_actual, medir_middleware
 
 
 class ManejadorBase(BaseHandler):
@@ -54,7 +60,10 @@ class ManejadorBase(BaseHandler):
         )
         handler: Callable[
             [HttpRequest], HttpResponse
-        ] = convert_exception_to_response(get_response)
+        ] = medir_middleware(
+            None,
+            convert_exception_to_response(get_response)
+        )
         handler_is_async: bool = is_async
         for middleware_path in reversed(settings.MIDDLEWARE):
             middleware: type[MiddlewareMixin] = import_string(middleware_path)
@@ -128,7 +137,10 @@ class ManejadorBase(BaseHandler):
                         False, mw_instance.process_exception
                     ),
                 )
-            handler = convert_exception_to_response(mw_instance)
+            handler = medir_middleware(
+                middleware_path,
+                convert_exception_to_response(mw_instance)
+            )
             handler_is_async = middleware_is_async
         handler = self.adapt_method_mode(is_async, handler, handler_is_async)
         self._middleware_chain: Callable[
@@ -140,7 +152,13 @@ class ManejadorBase(BaseHandler):
         request: HttpRequest
     ) -> HttpResponse:
         set_urlconf(settings.ROOT_URLCONF)
-        response: HttpResponse = self._middleware_chain(request)
+        medicion: Medicion = Medicion()
+        token: Token = medicion_actual.set(medicion)
+        try:
+            response: HttpResponse = self._middleware_chain(request)
+        finally:
+            medicion_actual.reset(token)
+        medicion.registrar(request, response)
         response._resource_closers.append(request.close)
         if response.status_code >= 400:
             log_response(
@@ -157,7 +175,13 @@ class ManejadorBase(BaseHandler):
         request: HttpRequest
     ) -> HttpResponse:
         set_urlconf(settings.ROOT_URLCONF)
-        response: HttpResponse = await self._middleware_chain(request)
+        medicion: Medicion = Medicion()
+        token: Token = medicion_actual.set(medicion)
+        try:
+            response: HttpResponse = await self._middleware_chain(request)
+        finally:
+            medicion_actual.reset(token)
+        medicion.registrar(request, response)
         response._resource_closers.append(request.close)
         if response.status_code >= 400:
             await sync_to_async(log_response, thread_sensitive=False)(
@@ -262,8 +286,134 @@ class ManejadorASGI(ManejadorBase):
         response._handler_class = self.__class__
         if isinstance(response, FileResponse):
             response.block_size = self.chunk_size
+            response = await self.preparar_archivo(
+                request,
+                response,
+                scope.get("extensions", {}).get("http.response.pathsend")
+            )
         await self.send_response(response, send)
 
+    async def preparar_archivo(
+        self: Self,
+        request: ASGIRequest,
+        response: FileResponse,
+        pathsend: Optional[dict[str, Any]]
+    ) -> HttpResponse:
+        archivo: Optional[BufferedReader] = response.file_to_stream
+        ruta: Optional[str] = getattr(archivo, "name", None)
+        if (
+            response.status_code != 200 or
+            not isinstance(ruta, str) or
+            not os.path.isfile(ruta)
+        ):
+            return response
+        estado: os.stat_result = os.fstat(archivo.fileno())
+        posicion: int = archivo.tell()
+        tamanio: int = estado.st_size - posicion
+        etag: str = '"%x-%x-%x"' % (
+            estado.st_mtime_ns,
+            estado.st_size,
+            posicion
+        )
+        response.headers.setdefault("ETag", etag)
+        response.headers["Accept-Ranges"] = "bytes"
+        etags: list[str] = parse_etags(
+            request.headers.get("If-None-Match", "")
+        )
+        actual: str = response.headers["ETag"].removeprefix("W/")
+        if request.method in ("GET", "HEAD") and (
+            "*" in etags or any(
+                valor.removeprefix("W/") == actual for valor in etags
+            )
+        ):
+            await sync_to_async(response.close, thread_sensitive=True)()
+            return self.no_modificado(response)
+        rango: Optional[tuple[int, int]] = self.obtener_rango(
+            request,
+            etag,
+            tamanio
+        )
+        if rango == (0, 0):
+            await sync_to_async(response.close, thread_sensitive=True)()
+            return HttpResponse(
+                status=416,
+                headers={"Content-Range": f"bytes */{tamanio}"}
+            )
+        if rango is None:
+            rango = (0, tamanio)
+        else:
+            response.status_code = 206
+            response.headers["Content-Range"] = "bytes %d-%d/%d" % (
+                rango[0],
+                rango[0] + rango[1] - 1,
+                tamanio
+            )
+        response.headers["Content-Length"] = str(rango[1])
+        response.rango = (posicion + rango[0], rango[1])
+        archivo.seek(response.rango[0])
+        if pathsend is not None and (
+            pathsend.get("ranges") or response.rango == (0, estado.st_size)
+        ):
+            response.pathsend = {
+                "type": "http.response.pathsend",
+                "path": ruta,
+            }
+            if response.rango != (0, estado.st_size):
+                response.pathsend["offset"] = response.rango[0]
+                response.pathsend["count"] = response.rango[1]
+        return response
+
+    @staticmethod
+    def no_modificado(response: HttpResponse) -> HttpResponseNotModified:
+        '''
+        Igual que django.middleware.http.ConditionalGetMiddleware: la
+        respuesta 304 conserva los encabezados de caché y las cookies
+        '''
+        no_modificado: HttpResponseNotModified = HttpResponseNotModified()
+        for encabezado in (
+            "Cache-Control",
+            "Content-Location",
+            "Date",
+            "ETag",
+            "Expires",
+            "Last-Modified",
+            "Vary",
+        ):
+            if encabezado in response.headers:
+                no_modificado.headers[encabezado] = \
+                    response.headers[encabezado]
+        no_modificado.cookies = response.cookies
+        return no_modificado
+
+    @staticmethod
+    def obtener_rango(
+        request: ASGIRequest,
+        etag: str,
+        tamanio: int
+    ) -> Optional[tuple[int, int]]:
+        encabezado: str = request.headers.get("Range", "")
+        if request.method not in ("GET", "HEAD") or not encabezado:
+            return None
+        if request.headers.get("If-Range", etag) != etag:
+            return None
+        unidad, _, especificacion = encabezado.partition("=")
+        if unidad.strip().lower() != "bytes" or "," in especificacion:
+            return None
+        inicio, _, fin = especificacion.strip().partition("-")
+        try:
+            if not inicio:
+                sufijo: int = int(fin)
+                if sufijo <= 0 or tamanio == 0:
+                    return 0, 0
+                return max(tamanio - sufijo, 0), min(sufijo, tamanio)
+            primero: int = int(inicio)
+            ultimo: int = min(int(fin), tamanio - 1) if fin else tamanio - 1
+        except ValueError:
+            return None
+        if primero < 0 or primero >= tamanio or ultimo < primero:
+            return 0, 0
+        return primero, ultimo - primero + 1
+
     async def read_body(
         self: Self,
         receive: Callable[(), dict[str, Any]]
@@ -336,7 +486,22 @@ class ManejadorASGI(ManejadorBase):
                 "headers": response_headers,
             }
         )
-        if response.streaming:
+        if getattr(response, "pathsend", None) is not None:
+            await send(response.pathsend)
+        elif getattr(response, "rango", None) is not None:
+            async for chunk in self.leer_archivo(
+                response.file_to_stream,
+                response.rango[1]
+            ):
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": True,
+                    }
+                )
+            await send({"type": "http.response.body"})
+        elif response.streaming:
             async with aclosing(response.__aiter__()) as content:
                 async for part in content:
                     for chunk, _ in self.chunk_bytes(part):
@@ -359,6 +524,22 @@ class ManejadorASGI(ManejadorBase):
                 )
         await sync_to_async(response.close, thread_sensitive=True)()
 
+    async def leer_archivo(
+        self: Self,
+        archivo: BufferedReader,
+        restante: int
+    ) -> AsyncIterator[bytes]:
+        leer: Callable[[int], bytes] = sync_to_async(
+            archivo.read,
+            thread_sensitive=False
+        )
+        while restante > 0:
+            chunk: bytes = await leer(min(self.chunk_size, restante))
+            if not chunk:
+                break
+            restante -= len(chunk)
+            yield chunk
+
     @classmethod
     def chunk_bytes(
         cls: type[Self],
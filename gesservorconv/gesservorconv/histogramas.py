@@ -0,0 +1,123 @@
+from django.db.models.query import RawQuerySet
+
+from datetime import datetime, timezone
+from typing import Any
+
+from solicitudes.models import Categoria, Facultad
+
+
+def cantidad_grupos(
+    tiempo_inicio: datetime,
+    tiempo_fin: datetime,
+    grupos: int
+) -> int:
+    minutos: int = int(
+        (tiempo_fin - tiempo_inicio).total_seconds() // 60
+    )
+    return max(min(grupos, minutos), 1)
+
+
+def consulta_histograma(
+    claves: str,
+    columnas: list[str],
+    orden: str,
+    consulta: str
+) -> str:
+    '''
+    La consulta debe devolver solicitud_servicio_id y tiempo_creacion,
+    y el resultado trae, por cada clave, la cantidad de solicitudes
+    de cada grupo (width_bucket sobre el intervalo pedido)
+    '''
+    agrupacion: str = ", ".join(f"k.{columna}" for columna in columnas)
+    return (
+        f"WITH ss AS ({consulta}),"
+        " cuentas AS (SELECT"
+        f" {claves},"
+        " LEAST(GREATEST(width_bucket("
+        "EXTRACT(EPOCH FROM ss.tiempo_creacion), %s, %s, %s"
+        "), 1), %s) AS grupo,"
+        " COUNT(DISTINCT ss.solicitud_servicio_id) AS cuenta"
+        " FROM ss"
+        " LEFT JOIN solicitudes_servicio_categorias_solicitud AS sscs"
+        " ON sscs.solicitudservicio_id = ss.solicitud_servicio_id"
+        " LEFT JOIN categorias AS c"
+        " ON sscs.categoria_id = c.id"
+        " LEFT JOIN facultades AS f"
+        " ON c.facultad_categoria_id = f.id"
+        " WHERE date_trunc('minute', ss.tiempo_creacion) >= %s"
+        " AND date_trunc('minute', ss.tiempo_creacion) < %s"
+        " GROUP BY 1, 2, 3, 4)"
+        f" SELECT {agrupacion},"
+        " ARRAY_AGG(COALESCE(cg.cuenta, 0) ORDER BY g) AS cuentas"
+        f" FROM (SELECT DISTINCT {', '.join(columnas)} FROM cuentas) AS k"
+        " CROSS JOIN generate_series(1, %s) AS g"
+        " LEFT JOIN cuentas AS cg"
+        " ON cg.id = k.id AND cg.grupo = g"
+        f" GROUP BY {agrupacion}"
+        f" ORDER BY {orden};"
+    )
+
+
+def parametros_histograma(
+    parametros: list[Any],
+    tiempo_inicio: datetime,
+    tiempo_fin: datetime,
+    grupos: int
+) -> list[Any]:
+    inicio: datetime = tiempo_inicio.replace(tzinfo=timezone.utc)
+    fin: datetime = tiempo_fin.replace(tzinfo=timezone.utc)
+    return parametros + [
+        inicio.timestamp(),
+        fin.timestamp(),
+        grupos,
+        grupos,
+        inicio,
+        fin,
+        grupos
+    ]
+
+
+def histograma_facultades(
+    consulta: str,
+    parametros: list[Any],
+    tiempo_inicio: datetime,
+    tiempo_fin: datetime,
+    grupos: int
+) -> RawQuerySet[Facultad]:
+    return Facultad.objects.raw(
+        consulta_histograma(
+            "COALESCE(f.id, 0) AS id,"
+            " COALESCE(f.nombre_facultad, 'ninguna facultad')"
+            " AS nombre_facultad,"
+            " COALESCE(f.acronimo_facultad, 'N/A') AS acronimo_facultad",
+            ["id", "nombre_facultad", "acronimo_facultad"],
+            "k.nombre_facultad",
+            consulta
+        ),
+        parametros_histograma(
+            parametros, tiempo_inicio, tiempo_fin, grupos
+        )
+    )
+
+
+def histograma_categorias(
+    consulta: str,
+    parametros: list[Any],
+    tiempo_inicio: datetime,
+    tiempo_fin: datetime,
+    grupos: int
+) -> RawQuerySet[Categoria]:
+    return Categoria.objects.raw(
+        consulta_histograma(
+            "COALESCE(c.id, 0) AS id,"
+            " COALESCE(c.nombre_categoria, '') AS nombre_categoria,"
+            " COALESCE(f.acronimo_facultad, 'ninguna')"
+            " AS acronimo_facultad",
+            ["id", "nombre_categoria", "acronimo_facultad"],
+            "k.acronimo_facultad, k.nombre_categoria",
+            consulta
+        ),
+        parametros_histograma(
+            parametros, tiempo_inicio, tiempo_fin, grupos
+        )
+    )
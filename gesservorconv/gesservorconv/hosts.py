@@ -6,10 +6,12 @@ from django_hosts import patterns, host
 puerto: Optional[str] = '8000' if settings.DEBUG else None
 urls_apis: str = 'gesservorconv.apis'
 urls_administrador: str = 'administrador.urls'
+urls_metricas: str = 'gesservorconv.metricas_urls'
 nombre_apis6: str = 'apis6'
 nombre_apis4: str = 'apis'
 nombre_administrador6: str = 'administrador6'
 nombre_administrador4: str = 'administrador'
+nombre_metricas: str = 'metricas'
 host_patterns: list[host] = patterns(
     '',
     host(
@@ -36,6 +38,12 @@ host_patterns: list[host] = patterns(
         name=nombre_administrador4,
         port=puerto
     ),
+    host(
+        r'metricas\.localhost',
+        urls_metricas,
+        name=nombre_metricas,
+        port=puerto
+    ),
     host(
         r'localhost',
         settings.ROOT_URLCONF,
@@ -10,7 +10,7 @@ from logging import (
     LogRecord
 )
 from logging.handlers import TimedRotatingFileHandler
-from typing import Dict, List, Self, Tuple
+from typing import Dict, List, Optional, Self, Tuple
 
 
 mapa_colores: Dict[Tuple[str, int], str] = {
@@ -238,3 +238,40 @@ class ManejadorArchivosTiempoRotativo(
         nombre: str = ".".join(partes[:-2])
         nombre = f"{nombre}_{partes[-1]}.{partes[-2]}"
         return nombre
+
+    def format(self: Self, record: LogRecord) -> str:
+        # Los registros que reenvían los trabajadores de dafne ya vienen
+        # formateados
+        formateado: Optional[str] = getattr(record, 'formateado', None)
+        return (
+            formateado if formateado is not None
+            else super().format(record)
+        )
+
+    def emitir_lote(self: Self, registros: List[LogRecord]) -> None:
+        if not registros:
+            return
+        self.acquire()
+        try:
+            for registro in registros:
+                if (
+                    registro.levelno < self.level or
+                    not self.filter(registro)
+                ):
+                    continue
+                try:
+                    if self.shouldRollover(registro):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(
+                        self.format(registro) + self.terminator
+                    )
+                except Exception:
+                    self.handleError(registro)
+            if self.stream is not None:
+                self.stream.flush()
+        except Exception:
+            self.handleError(registros[-1])
+        finally:
+            self.release()
@@ -0,0 +1,144 @@
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from collections.abc import Callable
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Optional, Self
+
+from prometheus_client import Histogram
+
+
+DURACION_PETICION: Histogram = Histogram(
+    'gesservorconv_request_duration_seconds',
+    'Tiempo de respuesta de la cadena de middlewares y la vista',
+    ['view', 'method', 'status']
+)
+DURACION_MIDDLEWARE: Histogram = Histogram(
+    'gesservorconv_middleware_duration_seconds',
+    'Tiempo propio de cada middleware, sin contar los internos',
+    ['middleware'],
+    buckets=(
+        0.0001, 0.0005, 0.001, 0.0025, 0.005,
+        0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+    )
+)
+CONSULTAS_PETICION: Histogram = Histogram(
+    'gesservorconv_db_queries_per_request',
+    'Cantidad de consultas a la base de datos por petición',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+DURACION_CONSULTAS: Histogram = Histogram(
+    'gesservorconv_db_query_duration_seconds_per_request',
+    'Tiempo total en consultas a la base de datos por petición',
+    ['view']
+)
+
+
+class Medicion:
+    __slots__ = ('inicio', 'consultas', 'tiempo_consultas', 'interno')
+
+    def __init__(self: Self) -> None:
+        self.inicio: float = perf_counter()
+        self.consultas: int = 0
+        self.tiempo_consultas: float = 0.0
+        self.interno: float = 0.0
+
+    def registrar(
+        self: Self,
+        request: HttpRequest,
+        response: HttpResponse
+    ) -> None:
+        duracion: float = perf_counter() - self.inicio
+        vista: str = (
+            request.resolver_match.view_name
+            if getattr(request, 'resolver_match', None) is not None
+            else 'sin_vista'
+        )
+        DURACION_PETICION.labels(
+            vista,
+            request.method,
+            response.status_code
+        ).observe(duracion)
+        CONSULTAS_PETICION.labels(vista).observe(self.consultas)
+        DURACION_CONSULTAS.labels(vista).observe(self.tiempo_consultas)
+
+
+medicion_actual: ContextVar[Optional[Medicion]] = ContextVar(
+    'medicion_actual',
+    default=None
+)
+
+
+def cerrar_medicion(
+    nombre: Optional[str],
+    medicion: Medicion,
+    total: float
+) -> None:
+    if nombre is not None:
+        DURACION_MIDDLEWARE.labels(nombre).observe(
+            max(total - medicion.interno, 0.0)
+        )
+    medicion.interno = total
+
+
+def medir_middleware(
+    nombre: Optional[str],
+    handler: Callable[[HttpRequest], HttpResponse]
+) -> Callable[[HttpRequest], HttpResponse]:
+    if iscoroutinefunction(handler):
+        async def medido_async(request: HttpRequest) -> HttpResponse:
+            medicion: Optional[Medicion] = medicion_actual.get()
+            if medicion is None:
+                return await handler(request)
+            medicion.interno = 0.0
+            inicio: float = perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                cerrar_medicion(nombre, medicion, perf_counter() - inicio)
+        return markcoroutinefunction(medido_async)
+
+    def medido(request: HttpRequest) -> HttpResponse:
+        medicion: Optional[Medicion] = medicion_actual.get()
+        if medicion is None:
+            return handler(request)
+        medicion.interno = 0.0
+        inicio: float = perf_counter()
+        try:
+            return handler(request)
+        finally:
+            cerrar_medicion(nombre, medicion, perf_counter() - inicio)
+    return medido
+
+
+def registrar_consulta(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any]
+) -> Any:
+    medicion: Optional[Medicion] = medicion_actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio: float = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.consultas += 1
+        medicion.tiempo_consultas += perf_counter() - inicio
+
+
+@receiver(connection_created)
+def instrumentar_conexion(
+    sender: type[BaseDatabaseWrapper],
+    connection: BaseDatabaseWrapper,
+    **kwargs: dict[str, Any]
+) -> None:
+    if registrar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, registrar_consulta)
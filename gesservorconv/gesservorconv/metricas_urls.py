@@ -0,0 +1,8 @@
+from django.urls import path, URLPattern, URLResolver
+
+from .views import VistaMetricas
+
+
+urlpatterns: list[URLPattern | URLResolver] = [
+    path('metrics', VistaMetricas.as_view(), name='metricas'),
+]
@@ -9,10 +9,13 @@ from django.core.exceptions import PermissionDenied
 from django.db.models.query import QuerySet
 from django.shortcuts import resolve_url
 from django.urls import reverse_lazy
+from django.views.generic.base import ContextMixin
 
-from typing import Optional, Self
+from typing import Any, Optional, Self
 from urllib.parse import urlparse
 
+from cuentas.roles import obtener_roles
+
 
 class MixinAccesoRequerido(LoginRequiredMixin):
     login_url: Optional[str] = reverse_lazy("cuentas:iniciar_sesion")
@@ -47,3 +50,21 @@ class MixinPermisoRequerido(PermissionRequiredMixin):
             f"{permiso.content_type.app_label}.{permiso.codename}"
             for permiso in permisos
         ).issubset(self.request.user.get_all_permissions())
+
+
+class MixinContextoRoles(ContextMixin):
+    def contexto_roles(self: Self) -> dict[str, Any]:
+        roles: dict[str, Optional[bool]] = obtener_roles(self.request)
+        return {
+            "usuario": self.request.user,
+            "comitente": roles["comitente"],
+            "responsable": roles["responsable"],
+            "secretario": roles["secretario"],
+            "staff": self.request.user.is_staff,
+            "admin": self.request.user.is_superuser
+        }
+
+    def get_context_data(self: Self, **kwargs: Any) -> dict[str, Any]:
+        contexto: dict[str, Any] = super().get_context_data(**kwargs)
+        contexto.update(self.contexto_roles())
+        return contexto
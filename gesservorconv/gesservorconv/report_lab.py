@@ -1,96 +1,419 @@
 from django.conf import settings
 from django.utils.translation import to_locale
 
+from reportlab import rl_config
+from reportlab.graphics.shapes import Drawing, Line, Rect, String
+from reportlab.lib.colors import black
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.pdfdoc import PDFPage
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus.flowables import Flowable
+from reportlab.platypus.tables import Table, TableStyle
 
 from babel.dates import format_datetime
+from collections.abc import Callable, Iterable
 from datetime import datetime
+from functools import cache
 from os.path import join
 from pathlib import Path
 from pytz import timezone
-from typing import Self
+from typing import Optional, Self
+
+FUENTES: dict[str, str] = {
+    'Tangerine': 'Tangerine.ttf',
+    'Basic': 'Basic.ttf',
+    'Open Sans Light': 'OpenSans_SemiCondensed-Light.ttf',
+    'Open Sans Medium': 'OpenSans-Medium.ttf',
+    'Open Sans Italic': 'OpenSans_SemiCondensed-ExtraBoldItalic.ttf',
+    'Open Sans Bold': 'OpenSans-Bold.ttf',
+    'Nimbus Sans L Regular': 'NimbusSanL-Regu.ttf',
+    'Nimbus Roman No9 L Regular': 'NimbusRomNo9L-Regu.ttf',
+    'Nimbus Roman No9 L Bold': 'NimbusRomNo9L-Medi.ttf',
+    'Nimbus Roman No9 L Italic': 'NimbusRomNo9L-ReguItal.ttf',
+    'Nimbus Roman No9 L Bold Italic': 'NimbusRomNo9L-MediItal.ttf'
+}
+
+
+@cache
+def registrar_fuentes() -> None:
+    '''
+    Registra las fuentes una sola vez por proceso; se llama desde
+    SolicitudesConfig.ready para no leer los TTF durante un pedido
+    '''
+    ruta: str = join(
+        Path(__file__).resolve().parent,
+        'static/ttf'
+    )
+    for nombre, archivo in FUENTES.items():
+        pdfmetrics.registerFont(TTFont(nombre, f'{ruta}/{archivo}'))
+    pdfmetrics.registerFontFamily(
+        'Nimbus Roman No9 L',
+        normal='Nimbus Roman No9 L Regular',
+        bold='Nimbus Roman No9 L Bold',
+        italic='Nimbus Roman No9 L Italic',
+        boldItalic='Nimbus Roman No9 L Bold Italic'
+    )
+    rl_config.warnOnMissingFontGlyphs = 0
+
+
+# Estilos compartidos entre pedidos: no deben modificarse
+ESTILO_IDENTIFICADOR: ParagraphStyle = ParagraphStyle(
+    name='identificador',
+    fontName='Open Sans Italic',
+    bulletFontName='Open Sans Italic',
+    alignment=TA_CENTER,
+    fontSize=12,
+    leading=14.25
+)
+ESTILO_ENCABEZADO: ParagraphStyle = ParagraphStyle(
+    name='encabezado',
+    fontName='Open Sans Bold',
+    bulletFontName='Open Sans Bold',
+    alignment=TA_CENTER,
+    fontSize=12,
+    leading=14.25
+)
+ESTILO_NUMERO: ParagraphStyle = ParagraphStyle(
+    name='numero',
+    fontName='Open Sans Medium',
+    bulletFontName='Open Sans Medium',
+    alignment=TA_RIGHT,
+    fontSize=12,
+    leading=14.25
+)
+ESTILO_CELDA: ParagraphStyle = ParagraphStyle(
+    name='estilo',
+    fontName='Open Sans Medium',
+    bulletFontName='Open Sans Medium',
+    alignment=TA_LEFT,
+    fontSize=12,
+    leading=14.25
+)
+ESTILO_SOLICITUD: ParagraphStyle = ParagraphStyle(
+    name='estilo',
+    fontName='Open Sans Medium',
+    bulletFontName='Open Sans Medium',
+    fontSize=12,
+    leading=14.25,
+    leftIndent=30*mm,
+    rightIndent=20*mm,
+    spaceBefore=20*mm,
+    spaceAfter=20*mm
+)
+ESTILO_NOMBRE_SOLICITUD: ParagraphStyle = ParagraphStyle(
+    name='estilo',
+    parent=ESTILO_SOLICITUD,
+    firstLineIndent=20*mm
+)
+ESTILO_DESCRIPCION_SOLICITUD: ParagraphStyle = ParagraphStyle(
+    name='estilo',
+    parent=ESTILO_SOLICITUD,
+    firstLineIndent=27*mm
+)
+ESTILO_TITULOS_ORDEN: ParagraphStyle = ParagraphStyle(
+    name='titulos',
+    fontName='Nimbus Roman No9 L Regular',
+    fontSize=12,
+    leading=14.25,
+    leftIndent=30*mm,
+    rightIndent=20*mm,
+    alignment=TA_JUSTIFY
+)
+ESTILO_DESCRIPCION_ORDEN: ParagraphStyle = ParagraphStyle(
+    name='descripcion',
+    fontName='Nimbus Roman No9 L Regular',
+    fontSize=12,
+    leading=14.25,
+    firstLineIndent=5*mm,
+    leftIndent=30*mm,
+    rightIndent=20*mm,
+    alignment=TA_JUSTIFY
+)
+ESTILO_LISTA_ORDEN: ParagraphStyle = ParagraphStyle(
+    name='lista',
+    fontName='Nimbus Roman No9 L Regular',
+    fontSize=12,
+    leading=14.25,
+    bulletFontName='Nimbus Roman No9 L Regular',
+    bulletFontSize=12,
+    bulletIndent=35*mm,
+    bulletType='bullet',
+    leftIndent=40*mm,
+    rightIndent=20*mm,
+    alignment=TA_JUSTIFY
+)
+ESTILO_NOTA_ORDEN: ParagraphStyle = ParagraphStyle(
+    name='estilo',
+    fontName='Nimbus Roman No9 L Regular',
+    fontSize=10,
+    leading=12,
+    leftIndent=30*mm,
+    rightIndent=20*mm,
+    alignment=TA_JUSTIFY
+)
+ESTILO_EPIGRAFE_ORDEN: ParagraphStyle = ParagraphStyle(
+    name='epigrafe',
+    fontName='Nimbus Roman No9 L Regular',
+    fontSize=10,
+    alignment=TA_CENTER
+)
+ESTILO_TABLA: TableStyle = TableStyle(
+    [
+        ('INNERGRID', (0, 0), (-1, -1), 0.5, black),
+        ('BOX', (0, 0), (-1, -1), 2, black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LINEBELOW', (0, 0), (-1, 0), 1.5, black),
+        ('LINEAFTER', (0, 0), (0, -1), 1, black),
+    ]
+)
+# Relleno por defecto de las celdas de reportlab: 6 por lado en
+# horizontal y 3 por lado en vertical
+RELLENO_HORIZONTAL: float = 12
+RELLENO_VERTICAL: float = 6
 
 
 class CanvasNumerado(Canvas):
-    def __init__(self, *args, **kwargs) -> None:
-        ruta: str = join(
-            Path(__file__).resolve().parent,
-            'static/ttf'
-        )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Open Sans Light',
-                f'{ruta}/OpenSans_SemiCondensed-Light.ttf'
-            )
-        )
+    '''
+    Numera las páginas a medida que se cierran. El total se dibuja en un
+    Form XObject compartido que se define recién al guardar, así que no
+    hace falta conservar el estado de cada página. Con impresion=False se
+    omite la fecha de impresión, para documentos que se sirven guardados
+    '''
+    fuente_pie: str = 'Open Sans Light'
+    tamano_pie: int = 10
+
+    def __init__(self, *args, impresion: bool = True, **kwargs) -> None:
+        registrar_fuentes()
         super().__init__(*args, **kwargs)
-        self.paginas: dict[PDFPage] = []
+        self.tiempo: Optional[str] = format_datetime(
+            datetime.now(timezone(settings.TIME_ZONE)), 'full',
+            timezone(settings.TIME_ZONE),
+            locale=to_locale(settings.LANGUAGE_CODE)
+        ) if impresion else None
 
     def showPage(self: Self) -> None:
-        self.paginas.append(dict(self.__dict__))
-        self._startPage()
+        self.dibujar_numero_pagina(self.tiempo)
+        super().showPage()
 
     def save(self: Self) -> None:
-        cantidad_paginas: int = len(self.paginas)
-        ahora: datetime = datetime.now(
-            timezone(settings.TIME_ZONE)
-        )
-        tiempo: str = format_datetime(
-            ahora, 'full',
-            timezone(settings.TIME_ZONE),
-            locale=to_locale(settings.LANGUAGE_CODE)
-        )
-        for pagina in self.paginas:
-            self.__dict__.update(pagina)
-            self.dibujar_numero_pagina(
-                cantidad_paginas,
-                tiempo
-            )
-            super().showPage()
+        if len(self._code):
+            self.showPage()
+        self.dibujar_cantidad_paginas(self._pageNumber - 1)
         super().save()
 
-    def dibujar_numero_pagina(
-        self: Self,
-        cantidad_pagina: int,
-        tiempo: str
-    ) -> None:
-        pagina: str = 'Página %s de %s' % (self._pageNumber, cantidad_pagina)
-        self.setFont('Open Sans Light', 10)
-        self.drawString(
-            30 * mm, 5 * mm,
-            f'Impreso el día {tiempo}'
+    def dibujar_numero_pagina(self: Self, tiempo: Optional[str]) -> None:
+        self.saveState()
+        self.setFont(self.fuente_pie, self.tamano_pie)
+        if tiempo is not None:
+            self.drawString(
+                30 * mm, 5 * mm,
+                f'Impreso el día {tiempo}'
+            )
+        # Se reserva el ancho del número de página; el total tiene la
+        # misma cantidad de cifras salvo en las primeras páginas
+        total: float = 190 * mm - self.stringWidth(
+            str(self._pageNumber), self.fuente_pie, self.tamano_pie
         )
-        self.drawRightString(190 * mm, 5 * mm, pagina)
+        self.drawRightString(total, 5 * mm, f'Página {self._pageNumber} de ')
+        self.translate(total, 5 * mm)
+        self.doForm('cantidad_paginas')
+        self.restoreState()
+
+    def dibujar_cantidad_paginas(self: Self, cantidad_paginas: int) -> None:
+        self.beginForm('cantidad_paginas')
+        self.setFont(self.fuente_pie, self.tamano_pie)
+        self.drawString(0, 0, str(cantidad_paginas))
+        self.endForm()
 
 
 class Documento(CanvasNumerado):
-    def __init__(self, *args, **kwargs) -> None:
-        ruta: str = join(
-            Path(__file__).resolve().parent,
-            'static/ttf'
+    fuente_pie: str = 'Nimbus Sans L Regular'
+    tamano_pie: int = 8
+
+
+def alto_fila(fila: list[Flowable], anchos: list[float]) -> float:
+    return max(
+        celda.wrap(ancho - RELLENO_HORIZONTAL, 0)[1]
+        for celda, ancho in zip(fila, anchos)
+    ) + RELLENO_VERTICAL
+
+
+def tabla_paginada(
+    canvas: Canvas,
+    encabezado: list[Flowable],
+    filas: Iterable[list[Flowable]],
+    anchos: list[float],
+    superior: float,
+    alto: float,
+    pie: Optional[Callable[[int], list[Flowable]]] = None,
+    superior_siguientes: float = 277*mm,
+    alto_siguientes: float = 257*mm
+) -> int:
+    '''
+    Dibuja la tabla a partir de 30 mm, midiendo cada fila una sola vez y
+    cerrando cada página en cuanto se llena, con el encabezado repetido.
+    Sólo se guardan las filas de la página actual, así que filas puede
+    ser el iterador de una consulta. pie recibe la cantidad de filas y
+    devuelve la última. Devuelve la cantidad de filas
+    '''
+    alto_encabezado: float = alto_fila(encabezado, anchos)
+    pagina: list[list[Flowable]] = [encabezado]
+    alturas: list[float] = [alto_encabezado]
+    ocupado: float = alto_encabezado
+    cantidad: int = 0
+
+    def cerrar_pagina() -> None:
+        tabla: Table = Table(pagina, colWidths=anchos, rowHeights=alturas)
+        tabla.setStyle(ESTILO_TABLA)
+        tabla.wrapOn(canvas, sum(anchos), alto)
+        tabla.drawOn(canvas, 30*mm, superior - ocupado)
+        canvas.showPage()
+
+    def agregar(fila: list[Flowable]) -> None:
+        nonlocal pagina, alturas, ocupado, superior, alto
+        altura: float = alto_fila(fila, anchos)
+        if ocupado + altura > alto and len(pagina) > 1:
+            cerrar_pagina()
+            pagina, alturas = [encabezado], [alto_encabezado]
+            ocupado = alto_encabezado
+            superior, alto = superior_siguientes, alto_siguientes
+        pagina.append(fila)
+        alturas.append(altura)
+        ocupado += altura
+
+    for fila in filas:
+        agregar(fila)
+        cantidad += 1
+    if pie is not None:
+        agregar(pie(cantidad))
+    cerrar_pagina()
+    return cantidad
+
+
+def bloque_firma() -> Drawing:
+    dibujo: Drawing = Drawing(
+        50*mm,
+        37.5*mm
+    )
+    dibujo.add(
+        Rect(
+            0,
+            12.5*mm,
+            50*mm,
+            37.5*mm,
+            strokeWidth=0.25,
+            strokeColor="grey",
+            fillColor=None
         )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Nimbus Sans L Regular',
-                f'{ruta}/NimbusSanL-Regu.ttf'
-            )
+    )
+    dibujo.add(
+        Rect(
+            0,
+            0,
+            50*mm,
+            12.5*mm,
+            strokeWidth=0.25,
+            strokeColor="grey",
+            fillColor=None
         )
-        super().__init__(*args, **kwargs)
-        self.paginas: dict[PDFPage] = []
-
-    def dibujar_numero_pagina(
-        self: Self,
-        cantidad_pagina: int,
-        tiempo: str
-    ) -> None:
-        pagina: str = 'Página %s de %s' % (self._pageNumber, cantidad_pagina)
-        self.setFont('Nimbus Sans L Regular', 8)
-        self.drawString(
-            30 * mm, 5 * mm,
-            f'Impreso el día {tiempo}'
+    )
+    dibujo.add(
+        String(
+            25*mm,
+            13.75*mm,
+            "Firma",
+            fontSize=10,
+            textAnchor='middle'
+        )
+    )
+    dibujo.add(
+        String(
+            25*mm,
+            1.25*mm,
+            "Fecha",
+            fontSize=10,
+            textAnchor='middle'
+        )
+    )
+    dibujo.add(
+        Line(
+            3*mm,
+            12.5*mm + 4.15*mm,
+            47*mm,
+            12.5*mm + 4.15*mm,
+            strokeWidth=0.25,
+            strokeColor="black"
+        )
+    )
+    dibujo.add(
+        Line(
+            3*mm,
+            4.15*mm,
+            47*mm,
+            4.15*mm,
+            strokeWidth=0.25,
+            strokeColor="black"
+        )
+    )
+    dibujo.add(
+        Line(
+            14*mm,
+            5*mm,
+            16*mm,
+            10*mm,
+            strokeWidth=0.25,
+            strokeColor="black"
+        )
+    )
+    dibujo.add(
+        Line(
+            27*mm,
+            5*mm,
+            29*mm,
+            10*mm,
+            strokeWidth=0.25,
+            strokeColor="black"
+        )
+    )
+    return dibujo
+
+
+def bloque_firma_digital() -> Drawing:
+    dibujo: Drawing = Drawing(
+        50*mm,
+        25*mm
+    )
+    dibujo.add(
+        Rect(
+            0,
+            0*mm,
+            50*mm,
+            37.5*mm,
+            strokeWidth=0.25,
+            strokeColor="grey",
+            fillColor=None
+        )
+    )
+    dibujo.add(
+        String(
+            25*mm,
+            1.5*mm,
+            "Firma",
+            fontSize=10,
+            textAnchor='middle'
+        )
+    )
+    dibujo.add(
+        Line(
+            3*mm,
+            4.15*mm,
+            47*mm,
+            4.15*mm,
+            strokeWidth=0.25,
+            strokeColor="black"
         )
-        self.drawRightString(190 * mm, 5 * mm, pagina)
+    )
+    return dibujo
@@ -175,6 +175,24 @@ CELERY_WORKER_LOG_COLOR = True
 
 CELERY_LOG_LEVEL = 'INFO'
 
+CELERY_TASK_ROUTES = {
+    'firmas.tasks.generar_orden': {
+        'queue': os.environ.get('CELERY_COLA_VERIFICACIONES', 'celery')
+    },
+    'firmas.tasks.verificar_orden': {
+        'queue': os.environ.get('CELERY_COLA_VERIFICACIONES', 'celery')
+    }
+}
+
+# Hilos de reconocimiento de texto por proceso de Celery
+OCR_HILOS = int(os.environ.get('OCR_HILOS', 2))
+
+# Resolución de trabajo de la rasterización de órdenes
+VERIFICACION_DPI = int(os.environ.get('VERIFICACION_DPI', 600))
+
+# Guarda las imágenes y textos intermedios de cada verificación
+VERIFICACION_DEPURACION = env.bool('VERIFICACION_DEPURACION', default=False)
+
 
 LOGGING = {
     'version': 1,
@@ -246,9 +264,6 @@ LOGGING = {
         'daphne': {
             'handlers': ['dafne', 'stdout', 'stderr'],
             'propagate': False,
-        },
-        'matplotlib.font_manager': {
-            'handlers': ['stderr']
         }
     }
 }
@@ -7,3 +7,4 @@ from .vista_select2_css import VistaSelect2CSS
 from .vista_select2_js import VistaSelect2JS
 from .vista_select2_js_es import VistaSelect2JSes
 from .vista_archivos import VistaArchivos
+from .vista_metricas import VistaMetricas
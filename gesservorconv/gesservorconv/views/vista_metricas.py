@@ -0,0 +1,46 @@
+from ipaddress import ip_address
+import os
+
+from django.core.exceptions import PermissionDenied
+from django.http import (
+    HttpRequest,
+    HttpResponse
+)
+from django.views.generic import View
+
+from prometheus_client import (
+    CollectorRegistry,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+    multiprocess,
+    REGISTRY
+)
+
+
+class VistaMetricas(View):
+    def get(
+        self,
+        request: HttpRequest
+    ) -> HttpResponse:
+        try:
+            local: bool = ip_address(
+                request.META.get('REMOTE_ADDR', '')
+            ).is_loopback
+        except ValueError:
+            local = False
+        # Detrás de un proxy inverso en el mismo equipo, REMOTE_ADDR es
+        # siempre el del proxy: la petición sólo es local si no se reenvió
+        reenviada: bool = any(
+            encabezado in request.headers
+            for encabezado in ('X-Forwarded-For', 'X-Real-IP', 'Forwarded')
+        )
+        if not local or reenviada:
+            raise PermissionDenied('Las métricas solo se sirven localmente')
+        registro: CollectorRegistry = REGISTRY
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            registro = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registro)
+        return HttpResponse(
+            generate_latest(registro),
+            content_type=CONTENT_TYPE_LATEST
+        )
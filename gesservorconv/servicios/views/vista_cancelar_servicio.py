@@ -15,14 +15,19 @@ from ..models import Servicio
 
 from solicitudes.models import ComitenteSolicitud, SolicitudServicio
 
-from cuentas.models import Comitente, ResponsableTecnico, Secretario
+from cuentas.roles import obtener_roles
 
-from gesservorconv.mixins import MixinAccesoRequerido, MixinPermisoRequerido
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinPermisoRequerido,
+    MixinContextoRoles
+)
 
 
 class VistaCancelarServicio(
     MixinAccesoRequerido,
     MixinPermisoRequerido,
+    MixinContextoRoles,
     TemplateView
 ):
     template_name: str = "servicios/cancelar_servicio.html"
@@ -31,10 +36,7 @@ class VistaCancelarServicio(
     )
 
     def test_func(self: Self) -> bool:
-        return Secretario.objects.filter(
-            usuario_secretario=self.request.user,
-            habilitado_secretario=True
-        ).exists()
+        return obtener_roles(self.request)["secretario"] is True
 
     def handle_no_permission(self) -> HttpResponse:
         messages.error(
@@ -90,41 +92,7 @@ class VistaCancelarServicio(
             return HttpResponseRedirect(
                 reverse_lazy("servicios:lista_servicios_secretario")
             )
-        contexto: Dict[str, Any] = {}
-        contexto["usuario"] = request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = request.user.is_staff
-        contexto["admin"] = request.user.is_superuser
+        contexto: Dict[str, Any] = self.contexto_roles()
         contexto["servicio"] = Servicio.objects.get(
             Q(id_servicio=servicio)
         )
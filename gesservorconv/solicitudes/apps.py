@@ -7,3 +7,5 @@ class SolicitudesConfig(AppConfig):
 
     def ready(self):
         from . import signals
+        from gesservorconv.report_lab import registrar_fuentes
+        registrar_fuentes()
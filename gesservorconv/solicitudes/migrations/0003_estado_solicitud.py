@@ -0,0 +1,388 @@
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = False
+
+    dependencies = [
+        ('solicitudes', '0002_crons'),
+        ('firmas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadoSolicitud',
+            fields=[
+                ('solicitud_servicio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estado_solicitud', serialize=False, to='solicitudes.solicitudservicio', verbose_name='Solicitud de Servicio')),
+                ('estado', models.CharField(max_length=16, verbose_name='Estado de Solicitud')),
+                ('tiempo_creacion', models.DateTimeField(null=True, verbose_name='Tiempo de Creación de Solicitud')),
+                ('ultima_accion', models.DateTimeField(verbose_name='Tiempo de Última Acción en Solicitud')),
+                ('debe_responsables', models.BooleanField(verbose_name='Si faltan Responsables Técnicos por asignar')),
+                ('debe_decidir_responsable', models.BooleanField(verbose_name='Si hay Responsables Técnicos por aprobar')),
+                ('responsables_asignados', models.BooleanField(verbose_name='Si hay Responsables Técnicos asociados')),
+                ('responsables_vigentes', models.BooleanField(verbose_name='Si hay Responsables Técnicos no rechazados')),
+                ('responsables_indecisos', models.BooleanField(verbose_name='Si hay Responsables Técnicos sin decisión')),
+                ('propuesta_valida', models.BooleanField(verbose_name='Si hay Propuesta de Compromisos válida')),
+                ('usuarios_comitentes', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Comitentes en Solicitud')),
+                ('usuarios_comitentes_aceptantes', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Comitentes que aceptaron la Solicitud')),
+                ('usuarios_comitentes_indecisos', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Comitentes que no decidieron sobre la Solicitud')),
+                ('usuarios_comitentes_propuesta', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Comitentes que deben revisar la Propuesta')),
+                ('usuarios_responsables', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Responsables Técnicos en Solicitud')),
+                ('usuarios_responsables_habilitados', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Responsables Técnicos no rechazados por Comitentes')),
+                ('usuarios_responsables_aceptantes', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Responsables Técnicos aceptados y aceptantes')),
+                ('usuarios_responsables_indecisos', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Responsables Técnicos que no decidieron')),
+                ('usuarios_responsables_por_aprobar', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Responsables Técnicos que esperan aprobación')),
+                ('usuarios_responsables_propuesta', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None, verbose_name='Responsables Técnicos que deben revisar Propuesta')),
+            ],
+            options={
+                'verbose_name': 'estado de solicitud',
+                'verbose_name_plural': 'estados de solicitudes',
+                'db_table': 'estado_solicitud',
+                'indexes': [
+                    models.Index(fields=['estado', '-ultima_accion'], name='estado_solicitud_estado_idx'),
+                    models.Index(fields=['tiempo_creacion'], name='estado_solicitud_creacion_idx'),
+                    django.contrib.postgres.indexes.GinIndex(fields=['usuarios_comitentes'], name='estado_solicitud_comitent_idx'),
+                    django.contrib.postgres.indexes.GinIndex(fields=['usuarios_responsables'], name='estado_solicitud_respons_idx'),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=[
+                (
+                    'CREATE OR REPLACE FUNCTION'
+                    ' refrescar_estado_solicitud(id_refrescada INTEGER)'
+                    ' RETURNS VOID AS $refrescar_estado_solicitud$ BEGIN'
+                    ' IF id_refrescada IS NULL THEN RETURN; END IF;'
+                    ' IF NOT EXISTS (SELECT 1 FROM solicitudes_servicio'
+                    ' WHERE id_solicitud = id_refrescada) THEN'
+                    ' DELETE FROM estado_solicitud'
+                    ' WHERE solicitud_servicio_id = id_refrescada;'
+                    ' RETURN; END IF;'
+                    ' INSERT INTO estado_solicitud(solicitud_servicio_id,'
+                    ' estado, tiempo_creacion, ultima_accion,'
+                    ' debe_responsables, debe_decidir_responsable,'
+                    ' responsables_asignados, responsables_vigentes,'
+                    ' responsables_indecisos, propuesta_valida,'
+                    ' usuarios_comitentes, usuarios_comitentes_aceptantes,'
+                    ' usuarios_comitentes_indecisos,'
+                    ' usuarios_comitentes_propuesta, usuarios_responsables,'
+                    ' usuarios_responsables_habilitados,'
+                    ' usuarios_responsables_aceptantes,'
+                    ' usuarios_responsables_indecisos,'
+                    ' usuarios_responsables_por_aprobar,'
+                    ' usuarios_responsables_propuesta)'
+                    ' SELECT ss.id_solicitud,'
+                    ' CASE WHEN EXISTS (SELECT 1 FROM ordenes_servicio AS os'
+                    ' WHERE os.solicitud_servicio_id = ss.id_solicitud)'
+                    ' OR EXISTS (SELECT 1 FROM convenios AS cv'
+                    ' WHERE cv.solicitud_servicio_id = ss.id_solicitud)'
+                    ' THEN \'completo\''
+                    ' WHEN ss.cancelacion_solicitud IS NOT NULL'
+                    ' THEN \'cancelado\''
+                    ' WHEN ss.solicitud_suspendida IS TRUE'
+                    ' THEN \'suspendido\''
+                    ' ELSE \'curso\' END,'
+                    ' cs.tiempo_creacion, ss.ultima_accion_solicitud,'
+                    ' NOT cs.rechazo AND NOT rs.asignados'
+                    ' AND ss.responsables_autoadjudicados IS FALSE'
+                    ' AND ss.autoadjudicacion_abierta IS FALSE'
+                    ' AND ss.solicitud_suspendida IS FALSE,'
+                    ' rs.por_aprobar, rs.asignados, rs.vigentes,'
+                    ' rs.indecisos,'
+                    ' EXISTS (SELECT 1 FROM propuestas_compromisos AS pc'
+                    ' WHERE pc.solicitud_servicio_propuesta_id ='
+                    ' ss.id_solicitud AND pc.es_valida_propuesta),'
+                    ' cs.usuarios, cs.aceptantes, cs.indecisos,'
+                    ' ARRAY(SELECT c.comitente_id'
+                    ' FROM decisiones_comitentes_propuesta AS dc'
+                    ' INNER JOIN propuestas_compromisos AS pc'
+                    ' ON dc.propuesta_compromisos_id ='
+                    ' pc.id_propuesta_compromiso'
+                    ' INNER JOIN comitentes_solicitud AS c'
+                    ' ON dc.comitente_solicitud_id = c.id_comitente_solicitud'
+                    ' WHERE pc.solicitud_servicio_propuesta_id ='
+                    ' ss.id_solicitud AND pc.es_valida_propuesta'
+                    ' AND dc.tiempo_decision_propuesta IS NULL),'
+                    ' rs.usuarios, rs.habilitados, rs.aceptantes,'
+                    ' rs.usuarios_indecisos, rs.usuarios_por_aprobar,'
+                    ' ARRAY(SELECT r.responsable_tecnico_id'
+                    ' FROM decisiones_responsables_tecnicos_propuesta AS dr'
+                    ' INNER JOIN propuestas_compromisos AS pc'
+                    ' ON dr.propuesta_compromisos_id ='
+                    ' pc.id_propuesta_compromiso'
+                    ' INNER JOIN responsables_solicitud AS r'
+                    ' ON dr.responsable_solicitud_id ='
+                    ' r.id_responsable_solicitud'
+                    ' WHERE pc.solicitud_servicio_propuesta_id ='
+                    ' ss.id_solicitud AND pc.es_valida_propuesta'
+                    ' AND dr.tiempo_decision_propuesta IS NULL)'
+                    ' FROM solicitudes_servicio AS ss'
+                    ' CROSS JOIN LATERAL (SELECT'
+                    ' MIN(tiempo_decision) AS tiempo_creacion,'
+                    ' COALESCE(BOOL_OR(NOT aceptacion), FALSE) AS rechazo,'
+                    ' COALESCE(ARRAY_AGG(comitente_id), \'{}\')'
+                    ' AS usuarios,'
+                    ' COALESCE(ARRAY_AGG(comitente_id)'
+                    ' FILTER (WHERE aceptacion), \'{}\') AS aceptantes,'
+                    ' COALESCE(ARRAY_AGG(comitente_id)'
+                    ' FILTER (WHERE tiempo_decision IS NULL), \'{}\')'
+                    ' AS indecisos'
+                    ' FROM comitentes_solicitud'
+                    ' WHERE solicitud_servicio_id = ss.id_solicitud) AS cs'
+                    ' CROSS JOIN LATERAL (SELECT'
+                    ' COUNT(*) > 0 AS asignados,'
+                    ' COALESCE(BOOL_OR(aceptacion_responsable'
+                    ' AND tiempo_decision_comitente IS NULL), FALSE)'
+                    ' AS por_aprobar,'
+                    ' COALESCE(BOOL_OR((aceptacion_responsable'
+                    ' AND (tiempo_decision_comitente IS NULL'
+                    ' OR aceptacion_comitente))'
+                    ' OR (aceptacion_comitente'
+                    ' AND (tiempo_decision_responsable IS NULL'
+                    ' OR aceptacion_responsable))), FALSE) AS vigentes,'
+                    ' COALESCE(BOOL_OR((tiempo_decision_responsable IS NULL'
+                    ' AND (tiempo_decision_comitente IS NULL'
+                    ' OR aceptacion_comitente))'
+                    ' OR (tiempo_decision_comitente IS NULL'
+                    ' AND (tiempo_decision_responsable IS NULL'
+                    ' OR aceptacion_responsable))), FALSE) AS indecisos,'
+                    ' COALESCE(ARRAY_AGG(responsable_tecnico_id), \'{}\')'
+                    ' AS usuarios,'
+                    ' COALESCE(ARRAY_AGG(responsable_tecnico_id)'
+                    ' FILTER (WHERE tiempo_decision_comitente IS NULL'
+                    ' OR aceptacion_comitente), \'{}\') AS habilitados,'
+                    ' COALESCE(ARRAY_AGG(responsable_tecnico_id)'
+                    ' FILTER (WHERE aceptacion_comitente'
+                    ' AND aceptacion_responsable), \'{}\') AS aceptantes,'
+                    ' COALESCE(ARRAY_AGG(responsable_tecnico_id)'
+                    ' FILTER (WHERE tiempo_decision_responsable IS NULL),'
+                    ' \'{}\') AS usuarios_indecisos,'
+                    ' COALESCE(ARRAY_AGG(responsable_tecnico_id)'
+                    ' FILTER (WHERE aceptacion_responsable'
+                    ' AND tiempo_decision_comitente IS NULL), \'{}\')'
+                    ' AS usuarios_por_aprobar'
+                    ' FROM responsables_solicitud'
+                    ' WHERE solicitud_servicio_id = ss.id_solicitud) AS rs'
+                    ' WHERE ss.id_solicitud = id_refrescada'
+                    ' ON CONFLICT (solicitud_servicio_id) DO UPDATE SET'
+                    ' estado = EXCLUDED.estado,'
+                    ' tiempo_creacion = EXCLUDED.tiempo_creacion,'
+                    ' ultima_accion = EXCLUDED.ultima_accion,'
+                    ' debe_responsables = EXCLUDED.debe_responsables,'
+                    ' debe_decidir_responsable ='
+                    ' EXCLUDED.debe_decidir_responsable,'
+                    ' responsables_asignados ='
+                    ' EXCLUDED.responsables_asignados,'
+                    ' responsables_vigentes = EXCLUDED.responsables_vigentes,'
+                    ' responsables_indecisos ='
+                    ' EXCLUDED.responsables_indecisos,'
+                    ' propuesta_valida = EXCLUDED.propuesta_valida,'
+                    ' usuarios_comitentes = EXCLUDED.usuarios_comitentes,'
+                    ' usuarios_comitentes_aceptantes ='
+                    ' EXCLUDED.usuarios_comitentes_aceptantes,'
+                    ' usuarios_comitentes_indecisos ='
+                    ' EXCLUDED.usuarios_comitentes_indecisos,'
+                    ' usuarios_comitentes_propuesta ='
+                    ' EXCLUDED.usuarios_comitentes_propuesta,'
+                    ' usuarios_responsables = EXCLUDED.usuarios_responsables,'
+                    ' usuarios_responsables_habilitados ='
+                    ' EXCLUDED.usuarios_responsables_habilitados,'
+                    ' usuarios_responsables_aceptantes ='
+                    ' EXCLUDED.usuarios_responsables_aceptantes,'
+                    ' usuarios_responsables_indecisos ='
+                    ' EXCLUDED.usuarios_responsables_indecisos,'
+                    ' usuarios_responsables_por_aprobar ='
+                    ' EXCLUDED.usuarios_responsables_por_aprobar,'
+                    ' usuarios_responsables_propuesta ='
+                    ' EXCLUDED.usuarios_responsables_propuesta;'
+                    ' END; $refrescar_estado_solicitud$ LANGUAGE PLpgSQL;',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE FUNCTION'
+                    ' actualizar_estado_solicitud() RETURNS TRIGGER'
+                    ' AS $actualizar_estado_solicitud$ BEGIN'
+                    ' IF (TG_OP = \'UPDATE\' OR TG_OP = \'DELETE\') THEN'
+                    ' PERFORM refrescar_estado_solicitud('
+                    '(to_jsonb(OLD) ->> TG_ARGV[0])::INTEGER);'
+                    ' END IF;'
+                    ' IF (TG_OP = \'INSERT\' OR (TG_OP = \'UPDATE\' AND'
+                    ' (to_jsonb(NEW) ->> TG_ARGV[0]) IS DISTINCT FROM'
+                    ' (to_jsonb(OLD) ->> TG_ARGV[0]))) THEN'
+                    ' PERFORM refrescar_estado_solicitud('
+                    '(to_jsonb(NEW) ->> TG_ARGV[0])::INTEGER);'
+                    ' END IF; RETURN NULL;'
+                    ' END; $actualizar_estado_solicitud$ LANGUAGE PLpgSQL;',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE FUNCTION'
+                    ' actualizar_estado_solicitud_propuesta() RETURNS TRIGGER'
+                    ' AS $actualizar_estado_solicitud_propuesta$ BEGIN'
+                    ' IF (TG_OP = \'UPDATE\' OR TG_OP = \'DELETE\') THEN'
+                    ' PERFORM refrescar_estado_solicitud('
+                    'pc.solicitud_servicio_propuesta_id)'
+                    ' FROM propuestas_compromisos AS pc'
+                    ' WHERE pc.id_propuesta_compromiso ='
+                    ' OLD.propuesta_compromisos_id;'
+                    ' END IF;'
+                    ' IF (TG_OP = \'INSERT\' OR (TG_OP = \'UPDATE\' AND'
+                    ' NEW.propuesta_compromisos_id IS DISTINCT FROM'
+                    ' OLD.propuesta_compromisos_id)) THEN'
+                    ' PERFORM refrescar_estado_solicitud('
+                    'pc.solicitud_servicio_propuesta_id)'
+                    ' FROM propuestas_compromisos AS pc'
+                    ' WHERE pc.id_propuesta_compromiso ='
+                    ' NEW.propuesta_compromisos_id;'
+                    ' END IF; RETURN NULL;'
+                    ' END; $actualizar_estado_solicitud_propuesta$'
+                    ' LANGUAGE PLpgSQL;',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_solicitudes_servicio'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON solicitudes_servicio FOR EACH ROW'
+                    ' EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud(\'id_solicitud\');',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_comitentes_solicitud'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON comitentes_solicitud FOR EACH ROW'
+                    ' EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud(\'solicitud_servicio_id\');',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_responsables_solicitud'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON responsables_solicitud FOR EACH ROW'
+                    ' EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud(\'solicitud_servicio_id\');',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_propuestas_compromisos'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON propuestas_compromisos FOR EACH ROW'
+                    ' EXECUTE FUNCTION actualizar_estado_solicitud('
+                    '\'solicitud_servicio_propuesta_id\');',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_decisiones_comitentes_propuesta'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON decisiones_comitentes_propuesta FOR EACH ROW'
+                    ' EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud_propuesta();',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_decisiones_responsables_tecnicos_propuesta'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON decisiones_responsables_tecnicos_propuesta'
+                    ' FOR EACH ROW EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud_propuesta();',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_ordenes_servicio'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON ordenes_servicio FOR EACH ROW'
+                    ' EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud(\'solicitud_servicio_id\');',
+                    None
+                ),
+                (
+                    'CREATE OR REPLACE TRIGGER'
+                    ' estado_convenios'
+                    ' AFTER INSERT OR UPDATE OR DELETE'
+                    ' ON convenios FOR EACH ROW'
+                    ' EXECUTE FUNCTION'
+                    ' actualizar_estado_solicitud(\'solicitud_servicio_id\');',
+                    None
+                ),
+                (
+                    'SELECT refrescar_estado_solicitud(id_solicitud)'
+                    ' FROM solicitudes_servicio;',
+                    None
+                ),
+            ],
+            reverse_sql=[
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_convenios ON convenios;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_ordenes_servicio ON ordenes_servicio;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_decisiones_responsables_tecnicos_propuesta ON'
+                    ' decisiones_responsables_tecnicos_propuesta;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_decisiones_comitentes_propuesta ON'
+                    ' decisiones_comitentes_propuesta;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_propuestas_compromisos ON'
+                    ' propuestas_compromisos;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_responsables_solicitud ON'
+                    ' responsables_solicitud;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_comitentes_solicitud ON'
+                    ' comitentes_solicitud;',
+                    None
+                ),
+                (
+                    'DROP TRIGGER IF EXISTS'
+                    ' estado_solicitudes_servicio ON'
+                    ' solicitudes_servicio;',
+                    None
+                ),
+                (
+                    'DROP FUNCTION IF EXISTS'
+                    ' actualizar_estado_solicitud_propuesta();',
+                    None
+                ),
+                (
+                    'DROP FUNCTION IF EXISTS'
+                    ' actualizar_estado_solicitud();',
+                    None
+                ),
+                (
+                    'DROP FUNCTION IF EXISTS'
+                    ' refrescar_estado_solicitud(INTEGER);',
+                    None
+                ),
+            ]
+        ),
+    ]
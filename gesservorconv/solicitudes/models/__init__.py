@@ -10,3 +10,4 @@ from .decision_responsable_tecnico_propuesta import (
 from .decision_comitente_propuesta import (
     DecisionComitentePropuesta
 )
+from .estado_solicitud import EstadoSolicitud
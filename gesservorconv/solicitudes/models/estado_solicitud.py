@@ -0,0 +1,142 @@
+from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+
+
+class EstadoSolicitud(models.Model):
+    estados: dict[str, str] = {
+        'completo': 'Completo',
+        'curso': 'En curso',
+        'suspendido': 'Suspendido',
+        'cancelado': 'Cancelado'
+    }
+
+    solicitud_servicio: models.OneToOneField = \
+        models.OneToOneField(
+            verbose_name='Solicitud de Servicio',
+            to='SolicitudServicio',
+            on_delete=models.CASCADE,
+            related_name='estado_solicitud',
+            primary_key=True
+        )
+    estado: models.CharField = \
+        models.CharField(
+            verbose_name='Estado de Solicitud',
+            max_length=16
+        )
+    tiempo_creacion: models.DateTimeField = \
+        models.DateTimeField(
+            verbose_name='Tiempo de Creación de Solicitud',
+            null=True
+        )
+    ultima_accion: models.DateTimeField = \
+        models.DateTimeField(
+            verbose_name='Tiempo de Última Acción en Solicitud'
+        )
+    debe_responsables: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si faltan Responsables Técnicos por asignar'
+        )
+    debe_decidir_responsable: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si hay Responsables Técnicos por aprobar'
+        )
+    responsables_asignados: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si hay Responsables Técnicos asociados'
+        )
+    responsables_vigentes: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si hay Responsables Técnicos no rechazados'
+        )
+    responsables_indecisos: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si hay Responsables Técnicos sin decisión'
+        )
+    propuesta_valida: models.BooleanField = \
+        models.BooleanField(
+            verbose_name='Si hay Propuesta de Compromisos válida'
+        )
+    usuarios_comitentes: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Comitentes en Solicitud'
+        )
+    usuarios_comitentes_aceptantes: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Comitentes que aceptaron la Solicitud'
+        )
+    usuarios_comitentes_indecisos: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Comitentes que no decidieron sobre la Solicitud'
+        )
+    usuarios_comitentes_propuesta: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Comitentes que deben revisar la Propuesta'
+        )
+    usuarios_responsables: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Responsables Técnicos en Solicitud'
+        )
+    usuarios_responsables_habilitados: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Responsables Técnicos no rechazados por Comitentes'
+        )
+    usuarios_responsables_aceptantes: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Responsables Técnicos aceptados y aceptantes'
+        )
+    usuarios_responsables_indecisos: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Responsables Técnicos que no decidieron'
+        )
+    usuarios_responsables_por_aprobar: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Responsables Técnicos que esperan aprobación'
+        )
+    usuarios_responsables_propuesta: ArrayField = \
+        ArrayField(
+            models.IntegerField(),
+            verbose_name='Responsables Técnicos que deben revisar Propuesta'
+        )
+
+    class Meta:
+        db_table: str = 'estado_solicitud'
+        verbose_name: str = 'estado de solicitud'
+        verbose_name_plural: str = 'estados de solicitudes'
+        indexes: list[models.Index] = \
+            [
+                models.Index(
+                    fields=[
+                        'estado',
+                        '-ultima_accion'
+                    ],
+                    name='estado_solicitud_estado_idx'
+                ),
+                models.Index(
+                    fields=[
+                        'tiempo_creacion'
+                    ],
+                    name='estado_solicitud_creacion_idx'
+                ),
+                GinIndex(
+                    fields=[
+                        'usuarios_comitentes'
+                    ],
+                    name='estado_solicitud_comitent_idx'
+                ),
+                GinIndex(
+                    fields=[
+                        'usuarios_responsables'
+                    ],
+                    name='estado_solicitud_respons_idx'
+                ),
+            ]
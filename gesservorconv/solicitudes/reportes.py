@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.models import User
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.cache import cache
+from django.db.models import F, Func, IntegerField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect
+)
+from django.urls import reverse_lazy
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, url_has_allowed_host_and_scheme
+from django.views.generic import View
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+from .models import EstadoSolicitud
+from .tasks import clave_generacion, generar_reporte, ruta_reporte
+
+
+def version_datos(
+    estados: QuerySet[EstadoSolicitud],
+    usuario: int
+) -> str:
+    '''
+    Sello de los datos de las solicitudes. Los disparadores reescriben la
+    fila de estado_solicitud ante cualquier cambio de la solicitud, sus
+    comitentes, responsables, propuestas, órdenes o convenios, y cada
+    reescritura cambia el xmin de la fila. Los nombres de los usuarios no
+    pasan por estado_solicitud, así que también se sella el xmin de
+    auth_user de los comitentes, los responsables y quien pide el reporte
+    '''
+    solicitudes: str = estados.aggregate(
+        version=StringAgg(
+            RawSQL('estado_solicitud.xmin::text', ()),
+            ',',
+            ordering='solicitud_servicio_id',
+            default=Value('')
+        )
+    )['version']
+    usuarios: str = User.objects.filter(
+        Q(pk=usuario) |
+        Q(
+            pk__in=estados.annotate(
+                usuario=Func(
+                    F('usuarios_comitentes'),
+                    function='unnest',
+                    output_field=IntegerField()
+                )
+            ).values('usuario')
+        ) |
+        Q(
+            pk__in=estados.annotate(
+                usuario=Func(
+                    F('usuarios_responsables'),
+                    function='unnest',
+                    output_field=IntegerField()
+                )
+            ).values('usuario')
+        )
+    ).aggregate(
+        version=StringAgg(
+            RawSQL('auth_user.xmin::text', ()),
+            ',',
+            ordering='id',
+            default=Value('')
+        )
+    )['version']
+    return f"{solicitudes};{usuarios}"
+
+
+def grupo_reporte(
+    vista: str,
+    usuario: int,
+    parametros: dict[str, Optional[str]]
+) -> str:
+    '''
+    Identifica el reporte sin importar la versión de los datos: al
+    guardar una versión nueva se borran las anteriores del mismo grupo
+    '''
+    return hashlib.sha256(
+        json.dumps([vista, usuario, parametros], sort_keys=True).encode()
+    ).hexdigest()
+
+
+def clave_reporte(grupo: str, version: str) -> str:
+    return f"{grupo}-" + hashlib.sha256(version.encode()).hexdigest()
+
+
+def servir_reporte(
+    request: HttpRequest,
+    vista: type[View],
+    parametros: dict[str, Optional[str]],
+    estados: QuerySet[EstadoSolicitud],
+    titulo: str,
+    nombre: str
+) -> HttpResponse:
+    '''
+    Sirve el reporte si ya se generó con los mismos parámetros y datos;
+    si no, encarga su generación a Celery y se notifica al usuario cuando
+    esté listo. vista debe tener generar(usuario, parametros)
+    '''
+    ruta_vista: str = f"{vista.__module__}.{vista.__qualname__}"
+    clave: str = clave_reporte(
+        grupo_reporte(ruta_vista, request.user.pk, parametros),
+        version_datos(estados, request.user.pk)
+    )
+    ruta: str = ruta_reporte(clave)
+    respuesta: HttpResponse
+    if os.path.isfile(ruta):
+        etiqueta: str = f'"{clave}"'
+        if etiqueta in parse_etags(request.headers.get('If-None-Match', '')):
+            respuesta = HttpResponseNotModified()
+        else:
+            respuesta = FileResponse(open(ruta, 'rb'), filename=nombre)
+        respuesta.headers['ETag'] = etiqueta
+        patch_cache_control(respuesta, private=True, no_cache=True)
+        return respuesta
+    if cache.add(
+        clave_generacion(clave),
+        request.user.pk,
+        settings.CELERY_TASK_TIME_LIMIT
+    ):
+        generar_reporte.delay(
+            ruta_vista,
+            request.user.pk,
+            parametros,
+            clave,
+            titulo,
+            request.build_absolute_uri()
+        )
+    if request.htmx:
+        respuesta = HttpResponse(status=202)
+    else:
+        messages.info(
+            request,
+            f'Se está generando el reporte "{titulo}". Se le notificará'
+            ' cuando esté listo.'
+        )
+        anterior: Optional[str] = request.headers.get('Referer')
+        respuesta = HttpResponseRedirect(
+            anterior
+            if anterior and url_has_allowed_host_and_scheme(
+                anterior,
+                allowed_hosts={request.get_host()},
+                require_https=request.is_secure()
+            )
+            else reverse_lazy('cuentas:perfil')
+        )
+    patch_cache_control(respuesta, private=True, no_store=True)
+    return respuesta
@@ -1,11 +1,26 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db.models import Q
 from django.db.models.query import QuerySet
+from django.utils.module_loading import import_string
 
+from asgiref.sync import async_to_sync
+from channels import DEFAULT_CHANNEL_LAYER
+from channels.layers import (
+    InMemoryChannelLayer,
+    ChannelLayerManager
+)
 from datetime import datetime, timedelta, timezone
+from io import BytesIO
+import os
+import tempfile
+from typing import Any, Optional, Self
 
 from .models import SolicitudServicio
 
 from administrador.models import Configuracion
+from cuentas.models import Notificacion
 
 from firmas.models import Convenio, OrdenServicio
 
@@ -48,3 +63,78 @@ def suspender_solicitudes(self):
     return solicitudes_a_suspender.update(
         solicitud_suspendida=True
     )
+
+
+def ruta_reporte(clave: str) -> str:
+    # La clave empieza con el grupo del reporte; cada grupo tiene su carpeta
+    return os.path.join(
+        settings.MEDIA_ROOT,
+        'reportes',
+        clave.partition('-')[0],
+        f"{clave}.pdf"
+    )
+
+
+def clave_generacion(clave: str) -> str:
+    return f"reporte_{clave}"
+
+
+def guardar_reporte(clave: str, buffer: BytesIO) -> None:
+    destino: str = ruta_reporte(clave)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(destino))
+    try:
+        with os.fdopen(descriptor, 'wb') as salida:
+            salida.write(buffer.getbuffer())
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    # Las versiones anteriores del mismo reporte ya no se sirven
+    for nombre in os.listdir(os.path.dirname(destino)):
+        if nombre.endswith('.pdf') and nombre != os.path.basename(destino):
+            try:
+                os.remove(os.path.join(os.path.dirname(destino), nombre))
+            except FileNotFoundError:
+                pass
+
+
+def notificar_reporte(usuario: User, titulo: str, enlace: str) -> None:
+    mensaje: str = f'El reporte "{titulo}" está listo'
+    notificacion: Notificacion = Notificacion(
+        usuario_notificacion=usuario,
+        titulo_notificacion='Reporte generado',
+        contenido_notificacion=mensaje,
+        enlace_notificacion=enlace
+    )
+    notificacion.save()
+    channel_layer: InMemoryChannelLayer = \
+        ChannelLayerManager()[DEFAULT_CHANNEL_LAYER]
+    evento: dict[str, Any] = {
+        'id': notificacion.id_notificacion,
+        'type': 'reporte_generado',
+        'mensaje': mensaje,
+        'text': enlace
+    }
+    async_to_sync(channel_layer.group_send)(usuario.username, evento)
+
+
+@app.task(bind=True, ignore_result=True)
+def generar_reporte(
+    self: Self,
+    vista: str,
+    usuario: int,
+    parametros: dict[str, Optional[str]],
+    clave: str,
+    titulo: str,
+    enlace: str
+) -> None:
+    usuario_reporte: User = User.objects.get(pk=usuario)
+    try:
+        guardar_reporte(
+            clave,
+            import_string(vista).generar(usuario_reporte, parametros)
+        )
+    finally:
+        cache.delete(clave_generacion(clave))
+    notificar_reporte(usuario_reporte, titulo, enlace)
@@ -22,3 +22,6 @@ class TestMigraciones(TestCase):
 
     def test_migracion_0002_applicada(self: Self) -> None:
         self.migracion_aplicada("0002_crons")
+
+    def test_migracion_0003_applicada(self: Self) -> None:
+        self.migracion_aplicada("0003_estado_solicitud")
@@ -14,13 +14,16 @@ from ..models import (
     ResponsableSolicitud
 )
 
-from cuentas.models import Comitente, ResponsableTecnico, Secretario
 
-from gesservorconv.mixins import MixinAccesoRequerido
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinContextoRoles
+)
 
 
 class VistaAceptarSolicitudResponsable(
     MixinAccesoRequerido,
+    MixinContextoRoles,
     TemplateView
 ):
     template_name: str = "solicitudes/aceptar_solicitud_responsable.html"
@@ -103,41 +106,7 @@ class VistaAceptarSolicitudResponsable(
             return HttpResponseRedirect(
                 reverse_lazy("solicitudes:lista_solicitudes_comitente")
             )
-        contexto: Dict[str, Any] = {}
-        contexto["usuario"] = request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = request.user.is_staff
-        contexto["admin"] = request.user.is_superuser
+        contexto: Dict[str, Any] = self.contexto_roles()
         contexto["responsable_solicitud"] = ResponsableSolicitud.objects.get(
             Q(responsable_tecnico__usuario_responsable=request.user) &
             Q(solicitud_servicio__id_solicitud=solicitud)
@@ -2,29 +2,26 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.auth.models import Permission
-from django.db.models import Case, CharField, Min, Q, QuerySet, Value, When
+from django.db.models import Q, QuerySet
 from django.http import (
-    FileResponse,
     HttpRequest,
     HttpResponse,
-    HttpResponseRedirect
+    HttpResponseRedirect,
+    StreamingHttpResponse
 )
 from django.urls import reverse_lazy
 from django.views.generic import View
 
-import csv
-from io import StringIO
 from typing import Self
 
 from ..models import (
     SolicitudServicio,
-    ResponsableSolicitud
+    EstadoSolicitud
 )
 
-from firmas.models import Convenio, OrdenServicio
-
 from cuentas.models import ResponsableTecnico
 
+from gesservorconv.exportacion import respuesta_csv
 from gesservorconv.mixins import (
     MixinAccesoRequerido,
     MixinPermisoRequerido
@@ -97,131 +94,29 @@ class VistaCsvSolicitudesResponsable(
     def get(
         self,
         request: HttpRequest
-    ) -> FileResponse:
+    ) -> StreamingHttpResponse:
         solicitudes_servicio: QuerySet[SolicitudServicio] = \
             SolicitudServicio.objects.filter(
-                pk__in=ResponsableSolicitud.objects.filter(
-                    responsable_tecnico__usuario_responsable=self.request.user,
-                    aceptacion_comitente=True,
-                    aceptacion_responsable=True
-                ).values_list(
-                    "solicitud_servicio", flat=True
-                )
-            ).annotate(
-                tiempo_creacion=Min(
-                    "comitentesolicitud__tiempo_decision",
-                    filter=Q(
-                        comitentesolicitud__tiempo_decision__isnull=False
-                    )
-                )
-            ).annotate(
-                estado=Case(
-                    When(
-                        Q(
-                            pk__in=OrdenServicio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) |
-                        Q(
-                            pk__in=Convenio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ),
-                        then=Value("Completo")
-                    ),
-                    When(
-                        ~Q(
-                            pk__in=OrdenServicio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) &
-                        ~Q(
-                            pk__in=Convenio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) &
-                        Q(
-                            cancelacion_solicitud__isnull=True
-                        ) & (
-                            Q(
-                                solicitud_suspendida__isnull=True
-                            ) |
-                            Q(
-                                solicitud_suspendida=False
-                            )
-                        ),
-                        then=Value("En curso")
-                    ),
-                    When(
-                        ~Q(
-                            pk__in=OrdenServicio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) &
-                        ~Q(
-                            pk__in=Convenio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) &
-                        Q(
-                            cancelacion_solicitud__isnull=True
-                        ) &
-                        Q(
-                            solicitud_suspendida__isnull=False
-                        ) &
-                        Q(
-                            solicitud_suspendida=True
-                        ),
-                        then=Value("Suspendido")
-                    ),
-                    When(
-                        ~Q(
-                            pk__in=OrdenServicio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) &
-                        ~Q(
-                            pk__in=Convenio.objects.values_list(
-                                "solicitud_servicio__id_solicitud", flat=True
-                            )
-                        ) &
-                        Q(
-                            cancelacion_solicitud__isnull=False
-                        ),
-                        then=Value("Cancelado")
-                    ),
-                    output_field=CharField()
-                )
+                estado_solicitud__usuarios_responsables_aceptantes__contains=[
+                    self.request.user.pk
+                ]
+            ).values_list(
+                "id_solicitud",
+                "nombre_solicitud",
+                "descripcion_solicitud",
+                "estado_solicitud__tiempo_creacion",
+                "estado_solicitud__estado"
             )
-        buffer: StringIO = StringIO()
-        archivo: csv.DictWriter = csv.DictWriter(
-            buffer,
-            fieldnames=[
+        return respuesta_csv(
+            request,
+            [
                 "id_solicitud",
                 "nombre_solicitud",
                 "descripcion_solicitud",
                 "tiempo_creacion",
                 "estado"
             ],
-            dialect="unix"  # El servidor será Linux, es adecuado
-        )
-        archivo.writeheader()
-        archivo.writerows(
-            {
-                "id_solicitud": solicitud.id_solicitud,
-                "nombre_solicitud": solicitud.nombre_solicitud,
-                "descripcion_solicitud": solicitud.descripcion_solicitud,
-                "tiempo_creacion": solicitud.tiempo_creacion,
-                "estado": solicitud.estado
-            }
-            for solicitud in solicitudes_servicio
-        )
-        return FileResponse(
-            buffer.getvalue(),
-            as_attachment=True,
-            filename="solicitudesServicio.csv",
-            content_type="text/csv",
-            headers={
-                "Content-Disposition": 'attachment; filename="solicitudesServicio.csv"'
-            }
+            solicitudes_servicio,
+            "solicitudesServicio.csv",
+            lambda fila: (*fila[:4], EstadoSolicitud.estados[fila[4]])
         )
@@ -6,7 +6,7 @@ from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.functions import TransactionNow
 from django.core.paginator import Page, Paginator
 from django.db.models import (
-    BooleanField, Case, CharField, F, Min, Q, Value, When
+    BooleanField, Case, CharField, ExpressionWrapper, F, Q, Value, When
 )
 from django.db.models.functions import Cast, Concat
 from django.db.models.query import QuerySet
@@ -20,24 +20,16 @@ from unidecode import unidecode
 
 from ..models import (
     SolicitudServicio,
-    ComitenteSolicitud,
-    ResponsableSolicitud,
-    PropuestaCompromisos,
-    DecisionComitentePropuesta
+    PropuestaCompromisos
 )
 
-from firmas.models import Convenio, OrdenServicio
-
-from cuentas.models import (
-    Notificacion,
-    Comitente,
-    ResponsableTecnico,
-    Secretario
-)
+from cuentas.models import Notificacion
+from cuentas.roles import obtener_roles
 
 from gesservorconv.mixins import (
     MixinAccesoRequerido,
-    MixinPermisoRequerido
+    MixinPermisoRequerido,
+    MixinContextoRoles
 )
 from gesservorconv.views import HtmxHttpRequest
 
@@ -46,6 +38,7 @@ class VistaListaSolicitudesComitente(
     MixinAccesoRequerido,
     MixinPermisoRequerido,
     UserPassesTestMixin,
+    MixinContextoRoles,
     TemplateView
 ):
     paginate_by: int = 10
@@ -55,9 +48,7 @@ class VistaListaSolicitudesComitente(
     )
 
     def test_func(self: Self) -> bool:
-        return Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user)
-        ).exists()
+        return obtener_roles(self.request)["es_comitente"]
 
     def handle_no_permission(self: Self) -> HttpResponse:
         if self.request.user.is_anonymous:
@@ -113,109 +104,33 @@ class VistaListaSolicitudesComitente(
         y se filtra los que pertenezcan al comitente
         '''
         solicitudes_servicio: QuerySet[SolicitudServicio] = \
-            SolicitudServicio.objects.exclude(
-                Q(
-                    pk__in=OrdenServicio.objects.values_list(
-                        "solicitud_servicio__id_solicitud", flat=True
-                    )
-                ) |
-                Q(
-                    pk__in=Convenio.objects.values_list(
-                        "solicitud_servicio__id_solicitud", flat=True
-                    )
-                )
-            ).filter(
-                pk__in=ComitenteSolicitud.objects.filter(
-                    comitente__usuario_comitente=self.request.user
-                ).values_list(
-                    "solicitud_servicio__id_solicitud", flat=True
-                )
-            ).annotate(
-                tiempo_creacion=Min(
-                    "comitentesolicitud__tiempo_decision",
-                    filter=Q(
-                        comitentesolicitud__tiempo_decision__isnull=False
-                    )
-                )
-            ).annotate(
-                debe_decidir_comitente=Case(
-                    When(
-                        Q(
-                            pk__in=ComitenteSolicitud.objects.filter(
-                                Q(
-                                    comitente__usuario_comitente=self.request.user
-                                ) &
-                                Q(
-                                    tiempo_decision__isnull=True
-                                )
-                            ).values_list(
-                                "solicitud_servicio", flat=True
-                            )
-                        ),
-                        then=Value(True)
-                    ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
+            SolicitudServicio.objects.filter(
+                estado_solicitud__usuarios_comitentes__contains=[
+                    self.request.user.pk
+                ]
+            ).exclude(
+                estado_solicitud__estado='completo'
             ).annotate(
-                debe_responsables=Case(
-                    When(
-                        ~Q(
-                            pk__in=ComitenteSolicitud.objects.filter(
-                                aceptacion=False
-                            ).values_list(
-                                "solicitud_servicio", flat=True
-                            )
-                        ) &
-                        ~Q(
-                            pk__in=ResponsableSolicitud.objects.values_list(
-                                "solicitud_servicio", flat=True
-                            )
-                        ) &
-                        Q(responsables_autoadjudicados=False) &
-                        Q(autoadjudicacion_abierta__isnull=False) &
-                        Q(autoadjudicacion_abierta=False) &
-                        Q(solicitud_suspendida__isnull=False) &
-                        Q(solicitud_suspendida=False),
-                        then=Value(True)
-                    ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            ).annotate(
-                debe_decidir_responsable=Case(
-                    When(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            Q(
-                                aceptacion_responsable=True
-                            ) &
-                            Q(
-                                tiempo_decision_comitente__isnull=True
-                            )
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        ),
-                        then=Value(True)
+                tiempo_creacion=F("estado_solicitud__tiempo_creacion"),
+                debe_decidir_comitente=ExpressionWrapper(
+                    Q(
+                        estado_solicitud__usuarios_comitentes_indecisos__contains=[
+                            self.request.user.pk
+                        ]
                     ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            ).annotate(
-                debe_revisar_propuesta=Case(
-                    When(
-                        Q(
-                            pk__in=DecisionComitentePropuesta.objects.filter(
-                                propuesta_compromisos__es_valida_propuesta=True,
-                                comitente_solicitud__comitente__usuario_comitente=self.request.user,
-                                tiempo_decision_propuesta__isnull=True
-                            ).values_list(
-                                "propuesta_compromisos__solicitud_servicio_propuesta", flat=True
-                            )
-                        ),
-                        then=Value(True)
+                    output_field=BooleanField()
+                ),
+                debe_responsables=F("estado_solicitud__debe_responsables"),
+                debe_decidir_responsable=F(
+                    "estado_solicitud__debe_decidir_responsable"
+                ),
+                debe_revisar_propuesta=ExpressionWrapper(
+                    Q(
+                        estado_solicitud__usuarios_comitentes_propuesta__contains=[
+                            self.request.user.pk
+                        ]
                     ),
-                    default=Value(False),
-                    output_field=BooleanField(),
+                    output_field=BooleanField()
                 )
             ).annotate(
                 comitentes_en_solicitud=ArrayAgg(
@@ -228,9 +143,7 @@ class VistaListaSolicitudesComitente(
                                     responsables_autoadjudicados=True
                                 ) |
                                 Q(
-                                    pk__in=ResponsableSolicitud.objects.values_list(
-                                        "solicitud_servicio", flat=True
-                                    )
+                                    estado_solicitud__responsables_asignados=True
                                 )
                             ),
                             then=Concat(
@@ -253,9 +166,7 @@ class VistaListaSolicitudesComitente(
                                     responsables_autoadjudicados=True
                                 ) |
                                 Q(
-                                    pk__in=ResponsableSolicitud.objects.values_list(
-                                        "solicitud_servicio", flat=True
-                                    )
+                                    estado_solicitud__responsables_asignados=True
                                 )
                             ),
                             then=Concat(
@@ -408,73 +319,15 @@ class VistaListaSolicitudesComitente(
                 responsables_en_solicitud=Case(
                     When(
                         Q(
-                            pk__in=ResponsableSolicitud.objects.filter(
-                                (
-                                    Q(
-                                        aceptacion_responsable=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_comitente__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_comitente=True
-                                        )
-                                    )
-                                ) |
-                                (
-                                    Q(
-                                        aceptacion_comitente=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_responsable__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_responsable=True
-                                        )
-                                    )
-                                )
-                            ).values_list(
-                                "solicitud_servicio", flat=True
-                            )
+                            estado_solicitud__responsables_vigentes=True
                         ),
                         then=ArrayAgg(
                             Case(
                                 When(
                                     Q(autoadjudicacion_abierta__isnull=False) &
                                     Q(autoadjudicacion_abierta=False) &
-                                    ~Q(
-                                        pk__in=ResponsableSolicitud.objects.filter(
-                                            (
-                                                Q(
-                                                    tiempo_decision_responsable__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_comitente__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_comitente=True
-                                                    )
-                                                )
-                                            ) |
-                                            (
-                                                Q(
-                                                    tiempo_decision_comitente__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_responsable__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_responsable=True
-                                                    )
-                                                )
-                                            )
-                                        ).values_list(
-                                            "solicitud_servicio", flat=True
-                                        )
+                                    Q(
+                                        estado_solicitud__responsables_indecisos=False
                                     ),
                                     then=Concat(
                                         F("responsablesolicitud__responsable_tecnico__usuario_responsable__last_name"),
@@ -491,37 +344,8 @@ class VistaListaSolicitudesComitente(
                                 When(
                                     Q(autoadjudicacion_abierta__isnull=False) &
                                     Q(autoadjudicacion_abierta=False) &
-                                    ~Q(
-                                        pk__in=ResponsableSolicitud.objects.filter(
-                                            (
-                                                Q(
-                                                    tiempo_decision_responsable__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_comitente__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_comitente=True
-                                                    )
-                                                )
-                                            ) |
-                                            (
-                                                Q(
-                                                    tiempo_decision_comitente__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_responsable__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_responsable=True
-                                                    )
-                                                )
-                                            )
-                                        ).values_list(
-                                            "solicitud_servicio", flat=True
-                                        )
+                                    Q(
+                                        estado_solicitud__responsables_indecisos=False
                                     ),
                                     then=Concat(
                                         F("responsablesolicitud__responsable_tecnico__usuario_responsable__last_name"),
@@ -691,52 +515,11 @@ class VistaListaSolicitudesComitente(
         **kwargs: Dict[str, Any]
     ) -> Dict[str, Any]:
         contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
         solicitudes: QuerySet[SolicitudServicio] = self.get_queryset()
         paginador_curso: Paginator = Paginator(
             solicitudes.filter(
                 Q(
-                    cancelacion_solicitud__isnull=True
-                ) & (
-                    Q(
-                        solicitud_suspendida__isnull=True
-                    ) |
-                    Q(
-                        solicitud_suspendida=False
-                    )
+                    estado_solicitud__estado='curso'
                 )
             ),
             self.paginate_by
@@ -746,13 +529,7 @@ class VistaListaSolicitudesComitente(
         paginador_suspendido: Paginator = Paginator(
             solicitudes.filter(
                 Q(
-                    cancelacion_solicitud__isnull=True
-                ) &
-                Q(
-                    solicitud_suspendida__isnull=False
-                ) &
-                Q(
-                    solicitud_suspendida=True
+                    estado_solicitud__estado='suspendido'
                 )
             ),
             self.paginate_by
@@ -762,7 +539,7 @@ class VistaListaSolicitudesComitente(
         paginador_cancelado: Paginator = Paginator(
             solicitudes.filter(
                 Q(
-                    cancelacion_solicitud__isnull=False
+                    estado_solicitud__estado='cancelado'
                 )
             ),
             self.paginate_by
@@ -813,14 +590,7 @@ class VistaListaSolicitudesComitente(
             if not tipo or tipo == "curso":
                 solicitudes_curso: QuerySet[SolicitudServicio] = solicitudes.filter(
                     Q(
-                        cancelacion_solicitud__isnull=True
-                    ) & (
-                        Q(
-                            solicitud_suspendida__isnull=True
-                        ) |
-                        Q(
-                            solicitud_suspendida=False
-                        )
+                        estado_solicitud__estado='curso'
                     )
                 )
                 paginador_curso: Paginator = Paginator(
@@ -843,13 +613,7 @@ class VistaListaSolicitudesComitente(
             if not tipo or tipo == "suspendido":
                 solicitudes_suspendido: QuerySet[SolicitudServicio] = solicitudes.filter(
                     Q(
-                        cancelacion_solicitud__isnull=True
-                    ) &
-                    Q(
-                        solicitud_suspendida__isnull=False
-                    ) &
-                    Q(
-                        solicitud_suspendida=True
+                        estado_solicitud__estado='suspendido'
                     )
                 )
                 paginador_suspendido: Paginator = Paginator(
@@ -872,7 +636,7 @@ class VistaListaSolicitudesComitente(
             if not tipo or tipo == "cancelado":
                 solicitudes_cancelado: QuerySet[SolicitudServicio] = solicitudes.filter(
                     Q(
-                        cancelacion_solicitud__isnull=False
+                        estado_solicitud__estado='cancelado'
                     )
                 )
                 paginador_cancelado: Paginator = Paginator(
@@ -5,7 +5,7 @@ from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.paginator import Page, Paginator
 from django.db.models import (
-    BooleanField, Case, CharField, F, Min, Q, Value, When
+    BooleanField, Case, CharField, ExpressionWrapper, F, Q, Value, When
 )
 from django.db.models.functions import Cast, Concat
 from django.db.models.query import QuerySet
@@ -16,34 +16,28 @@ from django.views.generic import TemplateView
 
 from unidecode import unidecode
 
-from ..models import (
-    SolicitudServicio,
-    ComitenteSolicitud,
-    ResponsableSolicitud,
-    PropuestaCompromisos,
-    DecisionResponsableTecnicoPropuesta
-)
-
-from firmas.models import Convenio, OrdenServicio
+from ..models import SolicitudServicio
 
-from cuentas.models import Comitente, ResponsableTecnico, Secretario
+from cuentas.roles import obtener_roles
 
-from gesservorconv.mixins import MixinAccesoRequerido
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinContextoRoles
+)
 from gesservorconv.views import HtmxHttpRequest
 
 
 class VistaListaSolicitudesResponsable(
     MixinAccesoRequerido,
     UserPassesTestMixin,
+    MixinContextoRoles,
     TemplateView
 ):
     paginate_by: int = 10
     template_name: str = "solicitudes/listar_solicitudes_responsable.html"
 
     def test_func(self: Self) -> bool:
-        return ResponsableTecnico.objects.filter(
-            usuario_responsable=self.request.user
-        ).exists()
+        return obtener_roles(self.request)["es_responsable"]
 
     def handle_no_permission(self: Self) -> HttpResponse:
         if self.request.user.is_anonymous:
@@ -90,38 +84,18 @@ class VistaListaSolicitudesResponsable(
         solicitudes_servicio: QuerySet[SolicitudServicio] = \
             SolicitudServicio.objects.exclude(
                 Q(
-                    pk__in=OrdenServicio.objects.values_list(
-                        "solicitud_servicio__id_solicitud", flat=True
-                    )
-                ) |
-                Q(
-                    pk__in=Convenio.objects.values_list(
-                        "solicitud_servicio__id_solicitud", flat=True
-                    )
+                    estado_solicitud__estado='completo'
                 ) |
                 Q(
-                    pk__in=ComitenteSolicitud.objects.filter(
-                        comitente__usuario_comitente=self.request.user
-                    ).values_list(
-                        "solicitud_servicio__id_solicitud", flat=True
-                    )
+                    estado_solicitud__usuarios_comitentes__contains=[
+                        self.request.user.pk
+                    ]
                 )
             ).filter(
                 Q(
-                    pk__in=ResponsableSolicitud.objects.filter(
-                        Q(
-                            responsable_tecnico__usuario_responsable=self.request.user
-                        ) & (
-                            Q(
-                                tiempo_decision_comitente__isnull=True
-                            ) |
-                            Q(
-                                aceptacion_comitente=True
-                            )
-                        )
-                    ).values_list(
-                        "solicitud_servicio", flat=True
-                    )
+                    estado_solicitud__usuarios_responsables_habilitados__contains=[
+                        self.request.user.pk
+                    ]
                 ) | (
                     Q(responsables_autoadjudicados=True) &
                     Q(autoadjudicacion_abierta__isnull=False) &
@@ -130,158 +104,46 @@ class VistaListaSolicitudesResponsable(
                     Q(solicitud_suspendida__isnull=False) &
                     Q(solicitud_suspendida=False) &
                     ~Q(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            responsable_tecnico__usuario_responsable=self.request.user
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        )
+                        estado_solicitud__usuarios_responsables__contains=[
+                            self.request.user.pk
+                        ]
                     )
                 )
             ).annotate(
-                tiempo_creacion=Min(
-                    "comitentesolicitud__tiempo_decision",
-                    filter=Q(
-                        comitentesolicitud__tiempo_decision__isnull=False
-                    )
-                )
-            ).annotate(
-                debe_decidir_responsable=Case(
-                    When(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            Q(
-                                responsable_tecnico__usuario_responsable=self.request.user
-                            ) &
-                            Q(
-                                tiempo_decision_responsable__isnull=True
-                            )
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        ),
-                        then=Value(True)
-                    ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            ).annotate(
-                debe_decidir_comitente=Case(
-                    When(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            Q(
-                                responsable_tecnico__usuario_responsable=self.request.user
-                            ) &
-                            Q(
-                                aceptacion_responsable=True
-                            ) &
-                            Q(
-                                tiempo_decision_comitente__isnull=True
-                            )
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        ),
-                        then=Value(True)
+                tiempo_creacion=F("estado_solicitud__tiempo_creacion"),
+                debe_decidir_responsable=ExpressionWrapper(
+                    Q(
+                        estado_solicitud__usuarios_responsables_indecisos__contains=[
+                            self.request.user.pk
+                        ]
                     ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            ).annotate(
-                debe_proponer=Case(
-                    When(
-                        Q(autoadjudicacion_abierta__isnull=False) &
-                        Q(autoadjudicacion_abierta=False) &
-                        ~Q(
-                            pk__in=ResponsableSolicitud.objects.filter(
-                                (
-                                    Q(
-                                        tiempo_decision_responsable__isnull=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_comitente__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_comitente=True
-                                        )
-                                    )
-                                ) |
-                                (
-                                    Q(
-                                        tiempo_decision_comitente__isnull=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_responsable__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_responsable=True
-                                        )
-                                    )
-                                )
-                            ).values_list(
-                                "solicitud_servicio", flat=True
-                            )
-                        ) &
-                        ~Q(
-                            pk__in=PropuestaCompromisos.objects.filter(
-                                es_valida_propuesta=True
-                            ).values_list(
-                                "solicitud_servicio_propuesta", flat=True
-                            )
-                        ),
-                        then=Value(True)
+                    output_field=BooleanField()
+                ),
+                debe_decidir_comitente=ExpressionWrapper(
+                    Q(
+                        estado_solicitud__usuarios_responsables_por_aprobar__contains=[
+                            self.request.user.pk
+                        ]
                     ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            ).annotate(
-                debe_revisar_propuesta=Case(
-                    When(
-                        Q(autoadjudicacion_abierta__isnull=False) &
-                        Q(autoadjudicacion_abierta=False) &
-                        ~Q(
-                            pk__in=ResponsableSolicitud.objects.filter(
-                                (
-                                    Q(
-                                        tiempo_decision_responsable__isnull=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_comitente__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_comitente=True
-                                        )
-                                    )
-                                ) |
-                                (
-                                    Q(
-                                        tiempo_decision_comitente__isnull=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_responsable__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_responsable=True
-                                        )
-                                    )
-                                )
-                            ).values_list(
-                                "solicitud_servicio", flat=True
-                            )
-                        ) &
-                        Q(
-                            pk__in=DecisionResponsableTecnicoPropuesta.objects.filter(
-                                propuesta_compromisos__es_valida_propuesta=True,
-                                responsable_solicitud__responsable_tecnico__usuario_responsable=self.request.user,
-                                tiempo_decision_propuesta__isnull=True
-                            ).values_list(
-                                "propuesta_compromisos__solicitud_servicio_propuesta", flat=True
-                            )
-                        ),
-                        then=Value(True)
+                    output_field=BooleanField()
+                ),
+                debe_proponer=ExpressionWrapper(
+                    Q(autoadjudicacion_abierta__isnull=False) &
+                    Q(autoadjudicacion_abierta=False) &
+                    Q(estado_solicitud__responsables_indecisos=False) &
+                    Q(estado_solicitud__propuesta_valida=False),
+                    output_field=BooleanField()
+                ),
+                debe_revisar_propuesta=ExpressionWrapper(
+                    Q(autoadjudicacion_abierta__isnull=False) &
+                    Q(autoadjudicacion_abierta=False) &
+                    Q(estado_solicitud__responsables_indecisos=False) &
+                    Q(
+                        estado_solicitud__usuarios_responsables_propuesta__contains=[
+                            self.request.user.pk
+                        ]
                     ),
-                    default=Value(False),
-                    output_field=BooleanField(),
+                    output_field=BooleanField()
                 )
             ).annotate(
                 comitentes_en_solicitud=ArrayAgg(
@@ -325,73 +187,15 @@ class VistaListaSolicitudesResponsable(
                 responsables_en_solicitud=Case(
                     When(
                         Q(
-                            pk__in=ResponsableSolicitud.objects.filter(
-                                (
-                                    Q(
-                                        aceptacion_responsable=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_comitente__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_comitente=True
-                                        )
-                                    )
-                                ) |
-                                (
-                                    Q(
-                                        aceptacion_comitente=True
-                                    ) &
-                                    (
-                                        Q(
-                                            tiempo_decision_responsable__isnull=True
-                                        ) |
-                                        Q(
-                                            aceptacion_responsable=True
-                                        )
-                                    )
-                                )
-                            ).values_list(
-                                "solicitud_servicio", flat=True
-                            )
+                            estado_solicitud__responsables_vigentes=True
                         ),
                         then=ArrayAgg(
                             Case(
                                 When(
                                     Q(autoadjudicacion_abierta__isnull=False) &
                                     Q(autoadjudicacion_abierta=False) &
-                                    ~Q(
-                                        pk__in=ResponsableSolicitud.objects.filter(
-                                            (
-                                                Q(
-                                                    tiempo_decision_responsable__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_comitente__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_comitente=True
-                                                    )
-                                                )
-                                            ) |
-                                            (
-                                                Q(
-                                                    tiempo_decision_comitente__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_responsable__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_responsable=True
-                                                    )
-                                                )
-                                            )
-                                        ).values_list(
-                                            "solicitud_servicio", flat=True
-                                        )
+                                    Q(
+                                        estado_solicitud__responsables_indecisos=False
                                     ),
                                     then=Concat(
                                         F("responsablesolicitud__responsable_tecnico__usuario_responsable__last_name"),
@@ -408,37 +212,8 @@ class VistaListaSolicitudesResponsable(
                                 When(
                                     Q(autoadjudicacion_abierta__isnull=False) &
                                     Q(autoadjudicacion_abierta=False) &
-                                    ~Q(
-                                        pk__in=ResponsableSolicitud.objects.filter(
-                                            (
-                                                Q(
-                                                    tiempo_decision_responsable__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_comitente__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_comitente=True
-                                                    )
-                                                )
-                                            ) |
-                                            (
-                                                Q(
-                                                    tiempo_decision_comitente__isnull=True
-                                                ) &
-                                                (
-                                                    Q(
-                                                        tiempo_decision_responsable__isnull=True
-                                                    ) |
-                                                    Q(
-                                                        aceptacion_responsable=True
-                                                    )
-                                                )
-                                            )
-                                        ).values_list(
-                                            "solicitud_servicio", flat=True
-                                        )
+                                    Q(
+                                        estado_solicitud__responsables_indecisos=False
                                     ),
                                     then=Concat(
                                         F("responsablesolicitud__responsable_tecnico__usuario_responsable__last_name"),
@@ -608,68 +383,16 @@ class VistaListaSolicitudesResponsable(
         **kwargs: Dict[str, Any]
     ) -> Dict[str, Any]:
         contexto: Dict[str, Any] = super().get_context_data(**kwargs)
-        contexto["usuario"] = self.request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=self.request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=self.request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=self.request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = self.request.user.is_staff
-        contexto["admin"] = self.request.user.is_superuser
         solicitudes: QuerySet[SolicitudServicio] = self.get_queryset()
         paginador_curso: Paginator = Paginator(
             solicitudes.filter(
                 Q(
-                    pk__in=ResponsableSolicitud.objects.filter(
-                        Q(
-                            responsable_tecnico__usuario_responsable=self.request.user
-                        ) & (
-                            Q(
-                                tiempo_decision_comitente__isnull=True
-                            ) |
-                            Q(
-                                aceptacion_comitente=True
-                            )
-                        )
-                    ).values_list(
-                        "solicitud_servicio", flat=True
-                    )
+                    estado_solicitud__usuarios_responsables_habilitados__contains=[
+                        self.request.user.pk
+                    ]
                 ) &
                 Q(
-                    cancelacion_solicitud__isnull=True
-                ) & (
-                    Q(
-                        solicitud_suspendida__isnull=True
-                    ) |
-                    Q(
-                        solicitud_suspendida=False
-                    )
+                    estado_solicitud__estado='curso'
                 )
             ),
             self.paginate_by
@@ -685,11 +408,9 @@ class VistaListaSolicitudesResponsable(
                 Q(solicitud_suspendida__isnull=False) &
                 Q(solicitud_suspendida=False) &
                 ~Q(
-                    pk__in=ResponsableSolicitud.objects.filter(
-                        responsable_tecnico__usuario_responsable=self.request.user
-                    ).values_list(
-                        "solicitud_servicio", flat=True
-                    )
+                    estado_solicitud__usuarios_responsables__contains=[
+                        self.request.user.pk
+                    ]
                 )
             ),
             self.paginate_by
@@ -700,29 +421,12 @@ class VistaListaSolicitudesResponsable(
         paginador_suspendido: Paginator = Paginator(
             solicitudes.filter(
                 Q(
-                    pk__in=ResponsableSolicitud.objects.filter(
-                        Q(
-                            responsable_tecnico__usuario_responsable=self.request.user
-                        ) & (
-                            Q(
-                                tiempo_decision_comitente__isnull=True
-                            ) |
-                            Q(
-                                aceptacion_comitente=True
-                            )
-                        )
-                    ).values_list(
-                        "solicitud_servicio", flat=True
-                    )
-                ) &
-                Q(
-                    cancelacion_solicitud__isnull=True
+                    estado_solicitud__usuarios_responsables_habilitados__contains=[
+                        self.request.user.pk
+                    ]
                 ) &
                 Q(
-                    solicitud_suspendida__isnull=False
-                ) &
-                Q(
-                    solicitud_suspendida=True
+                    estado_solicitud__estado='suspendido'
                 )
             ),
             self.paginate_by
@@ -732,23 +436,12 @@ class VistaListaSolicitudesResponsable(
         paginador_cancelado: Paginator = Paginator(
             solicitudes.filter(
                 Q(
-                    pk__in=ResponsableSolicitud.objects.filter(
-                        Q(
-                            responsable_tecnico__usuario_responsable=self.request.user
-                        ) & (
-                            Q(
-                                tiempo_decision_comitente__isnull=True
-                            ) |
-                            Q(
-                                aceptacion_comitente=True
-                            )
-                        )
-                    ).values_list(
-                        "solicitud_servicio", flat=True
-                    )
+                    estado_solicitud__usuarios_responsables_habilitados__contains=[
+                        self.request.user.pk
+                    ]
                 ) &
                 Q(
-                    cancelacion_solicitud__isnull=False
+                    estado_solicitud__estado='cancelado'
                 )
             ),
             self.paginate_by
@@ -801,30 +494,12 @@ class VistaListaSolicitudesResponsable(
             if not tipo or tipo == "curso":
                 solicitudes_curso: QuerySet[SolicitudServicio] = solicitudes.filter(
                     Q(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            Q(
-                                responsable_tecnico__usuario_responsable=request.user
-                            ) & (
-                                Q(
-                                    tiempo_decision_comitente__isnull=True
-                                ) |
-                                Q(
-                                    aceptacion_comitente=True
-                                )
-                            )
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        )
+                        estado_solicitud__usuarios_responsables_habilitados__contains=[
+                            request.user.pk
+                        ]
                     ) &
                     Q(
-                        cancelacion_solicitud__isnull=True
-                    ) & (
-                        Q(
-                            solicitud_suspendida__isnull=True
-                        ) |
-                        Q(
-                            solicitud_suspendida=False
-                        )
+                        estado_solicitud__estado='curso'
                     )
                 )
                 paginador_curso: Paginator = Paginator(
@@ -853,9 +528,9 @@ class VistaListaSolicitudesResponsable(
                     Q(solicitud_suspendida__isnull=False) &
                     Q(solicitud_suspendida=False) &
                     ~Q(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            responsable_tecnico__usuario_responsable=request.user
-                        )
+                        estado_solicitud__usuarios_responsables__contains=[
+                            request.user.pk
+                        ]
                     )
                 )
                 paginador_autoadjudicable: Paginator = Paginator(
@@ -878,29 +553,12 @@ class VistaListaSolicitudesResponsable(
             if not tipo or tipo == "suspendido":
                 solicitudes_suspendido: QuerySet[SolicitudServicio] = solicitudes.filter(
                     Q(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            Q(
-                                responsable_tecnico__usuario_responsable=request.user
-                            ) & (
-                                Q(
-                                    tiempo_decision_comitente__isnull=True
-                                ) |
-                                Q(
-                                    aceptacion_comitente=True
-                                )
-                            )
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        )
+                        estado_solicitud__usuarios_responsables_habilitados__contains=[
+                            request.user.pk
+                        ]
                     ) &
                     Q(
-                        cancelacion_solicitud__isnull=True
-                    ) &
-                    Q(
-                        solicitud_suspendida__isnull=False
-                    ) &
-                    Q(
-                        solicitud_suspendida=True
+                        estado_solicitud__estado='suspendido'
                     )
                 )
                 paginador_suspendido: Paginator = Paginator(
@@ -923,23 +581,12 @@ class VistaListaSolicitudesResponsable(
             if not tipo or tipo == "cancelado":
                 solicitudes_cancelado: QuerySet[SolicitudServicio] = solicitudes.filter(
                     Q(
-                        pk__in=ResponsableSolicitud.objects.filter(
-                            Q(
-                                responsable_tecnico__usuario_responsable=request.user
-                            ) & (
-                                Q(
-                                    tiempo_decision_comitente__isnull=True
-                                ) |
-                                Q(
-                                    aceptacion_comitente=True
-                                )
-                            )
-                        ).values_list(
-                            "solicitud_servicio", flat=True
-                        )
+                        estado_solicitud__usuarios_responsables_habilitados__contains=[
+                            request.user.pk
+                        ]
                     ) &
                     Q(
-                        cancelacion_solicitud__isnull=False
+                        estado_solicitud__estado='cancelado'
                     )
                 )
                 paginador_cancelado: Paginator = Paginator(
@@ -1,11 +1,10 @@
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.contrib.auth.models import Permission
+from django.contrib.auth.models import Permission, User
 from django.conf import settings
 from django.db.models import Q, QuerySet
 from django.http import (
-    FileResponse,
     HttpRequest,
     HttpResponse,
     HttpResponseRedirect,
@@ -14,25 +13,22 @@ from django.http import (
 from django.urls import reverse_lazy
 from django.views.generic import View
 
-from reportlab import rl_config
 from reportlab.lib.colors import black
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus.paragraph import Paragraph
 
 from io import BytesIO
-from os.path import join
-from pathlib import Path
-from typing import Self
+from typing import Optional, Self
 
 from ..models import (
     SolicitudServicio,
+    EstadoSolicitud,
     ComitenteSolicitud,
     ResponsableSolicitud
 )
+from ..reportes import servir_reporte
 
 from firmas.models import Convenio, OrdenServicio
 from cuentas.models import Comitente
@@ -41,7 +37,12 @@ from gesservorconv.mixins import (
     MixinAccesoRequerido,
     MixinPermisoRequerido
 )
-from gesservorconv.report_lab import CanvasNumerado
+from gesservorconv.report_lab import (
+    CanvasNumerado,
+    ESTILO_DESCRIPCION_SOLICITUD,
+    ESTILO_NOMBRE_SOLICITUD,
+    ESTILO_SOLICITUD
+)
 
 
 class VistaReporteSolicitudComitente(
@@ -111,7 +112,7 @@ class VistaReporteSolicitudComitente(
         self,
         request: HttpRequest,
         solicitud: int
-    ) -> FileResponse:
+    ) -> HttpResponse:
         if not SolicitudServicio.objects.filter(
             Q(id_solicitud=solicitud)
         ).exists():
@@ -171,43 +172,26 @@ class VistaReporteSolicitudComitente(
                     "Content-Language": "es-AR"
                 }
             )
-        ruta: str = join(
-            Path(__file__).resolve().parent.parent.parent,
-            'gesservorconv/static/ttf'
-        )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Tangerine',
-                f'{ruta}/Tangerine.ttf'
-            )
-        )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Basic',
-                f'{ruta}/Basic.ttf'
-            )
-        )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Open Sans Medium',
-                f'{ruta}/OpenSans-Medium.ttf'
-            )
-        )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Open Sans Italic',
-                f'{ruta}/OpenSans_SemiCondensed-ExtraBoldItalic.ttf'
-            )
-        )
-        pdfmetrics.registerFont(
-            TTFont(
-                'Open Sans Bold',
-                f'{ruta}/OpenSans-Bold.ttf'
-            )
+        return servir_reporte(
+            request,
+            type(self),
+            {
+                "solicitud": str(solicitud)
+            },
+            EstadoSolicitud.objects.filter(
+                solicitud_servicio__id_solicitud=solicitud
+            ),
+            f'Solicitud de Servicio {solicitud}',
+            f'solicitudServicio{solicitud}.pdf'
         )
-        rl_config.warnOnMissingFontGlyphs = 0
+
+    @staticmethod
+    def generar(
+        usuario: User,
+        parametros: dict[str, Optional[str]]
+    ) -> BytesIO:
         solicitud_servicio: SolicitudServicio = SolicitudServicio.objects.get(
-            id_solicitud=solicitud
+            id_solicitud=int(parametros["solicitud"])
         )
         buffer: BytesIO = BytesIO()
         canvas: CanvasNumerado = CanvasNumerado(
@@ -218,7 +202,8 @@ class VistaReporteSolicitudComitente(
             pdfVersion=(2, 0),
             initialFontName='Open Sans Medium',
             initialFontSize=12,
-            lang=settings.LANGUAGE_CODE
+            lang=settings.LANGUAGE_CODE,
+            impresion=False
         )
         parrafo: Paragraph
         fragmentos: list[Paragraph]
@@ -258,18 +243,7 @@ class VistaReporteSolicitudComitente(
             'Nombre:'
         )
         canvas.setFont('Open Sans Medium', 12)
-        estilo_parrafo = ParagraphStyle(
-            name='estilo',
-            fontName='Open Sans Medium',
-            bulletFontName='Open Sans Medium',
-            fontSize=12,
-            leading=14.25,
-            firstLineIndent=20*mm,
-            leftIndent=30*mm,
-            rightIndent=20*mm,
-            spaceBefore=20*mm,
-            spaceAfter=20*mm
-        )
+        estilo_parrafo = ESTILO_NOMBRE_SOLICITUD
         parrafo = Paragraph(
             solicitud_servicio.nombre_solicitud,
             style=estilo_parrafo
@@ -308,18 +282,7 @@ class VistaReporteSolicitudComitente(
             'Descripción:'
         )
         canvas.setFont('Open Sans Medium', 12)
-        estilo_parrafo = ParagraphStyle(
-            name='estilo',
-            fontName='Open Sans Medium',
-            bulletFontName='Open Sans Medium',
-            fontSize=12,
-            leading=14.25,
-            firstLineIndent=27*mm,
-            leftIndent=30*mm,
-            rightIndent=20*mm,
-            spaceBefore=20*mm,
-            spaceAfter=20*mm
-        )
+        estilo_parrafo = ESTILO_DESCRIPCION_SOLICITUD
         parrafo = Paragraph(
             solicitud_servicio.descripcion_solicitud,
             style=estilo_parrafo
@@ -365,17 +328,7 @@ class VistaReporteSolicitudComitente(
             y -= 6
             canvas.setFont('Open Sans Medium', 12)
             for comitente in comitentes:
-                estilo_parrafo = ParagraphStyle(
-                    name='estilo',
-                    fontName='Open Sans Medium',
-                    bulletFontName='Open Sans Medium',
-                    fontSize=12,
-                    leading=14.25,
-                    leftIndent=30*mm,
-                    rightIndent=20*mm,
-                    spaceBefore=20*mm,
-                    spaceAfter=20*mm
-                )
+                estilo_parrafo = ESTILO_SOLICITUD
                 parrafo = Paragraph(
                     f"{comitente.comitente.usuario_comitente.last_name},"
                     f" {comitente.comitente.usuario_comitente.first_name}."
@@ -419,17 +372,7 @@ class VistaReporteSolicitudComitente(
             y -= 6
             canvas.setFont('Open Sans Medium', 12)
             for comitente in comitentes:
-                estilo_parrafo = ParagraphStyle(
-                    name='estilo',
-                    fontName='Open Sans Medium',
-                    bulletFontName='Open Sans Medium',
-                    fontSize=12,
-                    leading=14.25,
-                    leftIndent=30*mm,
-                    rightIndent=20*mm,
-                    spaceBefore=20*mm,
-                    spaceAfter=20*mm
-                )
+                estilo_parrafo = ESTILO_SOLICITUD
                 parrafo = Paragraph(
                     f"{comitente.comitente.usuario_comitente.last_name},"
                     f" {comitente.comitente.usuario_comitente.first_name}."
@@ -473,17 +416,7 @@ class VistaReporteSolicitudComitente(
             y -= 6
             canvas.setFont('Open Sans Medium', 12)
             for comitente in comitentes:
-                estilo_parrafo = ParagraphStyle(
-                    name='estilo',
-                    fontName='Open Sans Medium',
-                    bulletFontName='Open Sans Medium',
-                    fontSize=12,
-                    leading=14.25,
-                    leftIndent=30*mm,
-                    rightIndent=20*mm,
-                    spaceBefore=20*mm,
-                    spaceAfter=20*mm
-                )
+                estilo_parrafo = ESTILO_SOLICITUD
                 parrafo = Paragraph(
                     f"{comitente.comitente.usuario_comitente.last_name},"
                     f" {comitente.comitente.usuario_comitente.first_name}."
@@ -529,17 +462,7 @@ class VistaReporteSolicitudComitente(
             y -= 6
             canvas.setFont('Open Sans Medium', 12)
             for responsable in responsables:
-                estilo_parrafo = ParagraphStyle(
-                    name='estilo',
-                    fontName='Open Sans Medium',
-                    bulletFontName='Open Sans Medium',
-                    fontSize=12,
-                    leading=14.25,
-                    leftIndent=30*mm,
-                    rightIndent=20*mm,
-                    spaceBefore=20*mm,
-                    spaceAfter=20*mm
-                )
+                estilo_parrafo = ESTILO_SOLICITUD
                 parrafo = Paragraph(
                     f"{responsable.responsable_tecnico.usuario_responsable.last_name},"
                     f" {responsable.responsable_tecnico.usuario_responsable.first_name}."
@@ -584,17 +507,7 @@ class VistaReporteSolicitudComitente(
             y -= 6
             canvas.setFont('Open Sans Medium', 12)
             for responsable in responsables:
-                estilo_parrafo = ParagraphStyle(
-                    name='estilo',
-                    fontName='Open Sans Medium',
-                    bulletFontName='Open Sans Medium',
-                    fontSize=12,
-                    leading=14.25,
-                    leftIndent=30*mm,
-                    rightIndent=20*mm,
-                    spaceBefore=20*mm,
-                    spaceAfter=20*mm
-                )
+                estilo_parrafo = ESTILO_SOLICITUD
                 parrafo = Paragraph(
                     f"{responsable.responsable_tecnico.usuario_responsable.last_name},"
                     f" {responsable.responsable_tecnico.usuario_responsable.first_name}."
@@ -639,17 +552,7 @@ class VistaReporteSolicitudComitente(
             y -= 6
             canvas.setFont('Open Sans Medium', 12)
             for responsable in responsables:
-                estilo_parrafo = ParagraphStyle(
-                    name='estilo',
-                    fontName='Open Sans Medium',
-                    bulletFontName='Open Sans Medium',
-                    fontSize=12,
-                    leading=14.25,
-                    leftIndent=30*mm,
-                    rightIndent=20*mm,
-                    spaceBefore=20*mm,
-                    spaceAfter=20*mm
-                )
+                estilo_parrafo = ESTILO_SOLICITUD
                 parrafo = Paragraph(
                     f"{responsable.responsable_tecnico.usuario_responsable.last_name},"
                     f" {responsable.responsable_tecnico.usuario_responsable.first_name}."
@@ -684,7 +587,4 @@ class VistaReporteSolicitudComitente(
         canvas.showPage()
         canvas.save()
         buffer.seek(0)
-        return FileResponse(
-            buffer,
-            filename=f'solicitudServicio{solicitud}.pdf'
-        )
+        return buffer
@@ -17,14 +17,19 @@ from ..models import (
 )
 
 from firmas.models import Convenio, OrdenServicio
+from firmas.tasks import generar_orden
 
-from cuentas.models import Comitente, ResponsableTecnico, Secretario
+from cuentas.models import Secretario
 
-from gesservorconv.mixins import MixinAccesoRequerido
+from gesservorconv.mixins import (
+    MixinAccesoRequerido,
+    MixinContextoRoles
+)
 
 
 class VistaRevisarPropuestaComitente(
     MixinAccesoRequerido,
+    MixinContextoRoles,
     TemplateView
 ):
     template_name: str = "solicitudes/revisar_propuesta_comitente.html"
@@ -44,41 +49,7 @@ class VistaRevisarPropuestaComitente(
         return HttpResponseRedirect(direccion)
 
     def get(self: Self, request: HttpRequest, solicitud: int) -> HttpResponse:
-        contexto: Dict[str, Any] = {}
-        contexto["usuario"] = request.user
-        contexto["comitente"] = Comitente.objects.filter(
-            Q(usuario_comitente=request.user) &
-            (
-                Q(habilitado_comitente=True) |
-                Q(habilitado_organizaciones_comitente__contains=[
-                    True
-                ])
-            )
-        ).exists() if Comitente.objects.filter(
-            Q(usuario_comitente=request.user) &
-            Q(usuario_comitente__is_active=True)
-        ).exists() else None
-        contexto["responsable"] = ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=request.user) &
-            (
-                Q(habilitado_responsable=True) |
-                Q(habilitado_organizaciones_responsable__contains=[
-                    True
-                ])
-            )
-        ).exists() if ResponsableTecnico.objects.filter(
-            Q(usuario_responsable=request.user) &
-            Q(usuario_responsable__is_active=True)
-        ).exists() else None
-        contexto["secretario"] = Secretario.objects.filter(
-            Q(usuario_secretario=request.user) &
-            Q(habilitado_secretario=True)
-        ).exists() if Secretario.objects.filter(
-            Q(usuario_secretario=request.user) &
-            Q(usuario_secretario__is_active=True)
-        ).exists() else None
-        contexto["staff"] = request.user.is_staff
-        contexto["admin"] = request.user.is_superuser
+        contexto: Dict[str, Any] = self.contexto_roles()
         contexto["propuesta_compromisos"] = PropuestaCompromisos.objects.get(
             Q(es_valida_propuesta=True) &
             Q(solicitud_servicio_propuesta__id_solicitud=solicitud)
@@ -194,6 +165,9 @@ class VistaRevisarPropuestaComitente(
                             orden_suspendida=False
                         )
                         orden_servicio.save()
+                        transaction.on_commit(
+                            lambda: generar_orden.delay(solicitud)
+                        )
             with transaction.atomic():
                 decision_comitente_propuesta.save()
                 propuesta_compromisos.save()